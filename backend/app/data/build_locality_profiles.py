@@ -0,0 +1,243 @@
+"""
+Build per-locality spatial profiles and boundaries from the dataset
+
+For every locality with enough geocoded listings this computes:
+- a robust centroid and covariance of listing positions (km, local east/north plane)
+- percentiles of listing distances from that centroid, both in km and
+  in Mahalanobis units (distance scaled by the covariance, so elongated
+  localities get longer limits along their long axis)
+- a boundary polygon: the convex hull of the listings left after dropping
+  Mahalanobis outliers, with its bounding box
+
+The result is used by the location fraud module to judge distances
+against each locality's own footprint instead of fixed thresholds.
+
+The service builds it automatically into every new shared reference
+snapshot, i.e. whenever the dataset file changes (see
+app.utils.data_loader.load_shared_dataset). The packaged
+locality_profiles.json is only read when SHARED_DATASET_ENABLED=false or
+the snapshot could not be built; re-run this script after regenerating
+the dataset to refresh it:
+
+    cd backend
+    python -m app.data.build_locality_profiles
+"""
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+from app.services.offline_geocoder import extract_listing_points
+from app.utils.data_loader import load_dataset
+
+try:
+    from sklearn.covariance import MinCovDet
+    HAS_MCD = True
+except ImportError:
+    HAS_MCD = False
+
+EARTH_RADIUS_KM = 6371.0
+
+# Localities with fewer listings than this keep the fixed thresholds
+MIN_PROFILE_POINTS = 20
+
+# Share of points the robust covariance is fitted on (the rest are treated as outliers)
+SUPPORT_FRACTION = 0.9
+
+# Added to each variance so tiny or collinear clusters still get a usable ellipse
+MIN_SPREAD_KM = 0.25
+
+DISTANCE_PERCENTILES = (50, 90, 95, 99)
+
+# Listings beyond this Mahalanobis percentile are left out of the boundary polygon
+BOUNDARY_PERCENTILE = 99
+
+PROFILE_VERSION = 2
+
+OUTPUT_FILE = os.path.join(os.path.dirname(__file__), 'locality_profiles.json')
+
+
+def to_local_km(latitudes, longitudes, origin_lat, origin_lon):
+    """
+    Project coordinates onto a local east/north plane (km) around an origin
+
+    Accurate to well under 1% within a few tens of kilometers.
+    """
+    east = np.radians(np.asarray(longitudes) - origin_lon) * EARTH_RADIUS_KM * math.cos(math.radians(origin_lat))
+    north = np.radians(np.asarray(latitudes) - origin_lat) * EARTH_RADIUS_KM
+    return np.column_stack([east, north])
+
+
+def robust_location_covariance(points_km):
+    """
+    Robust centre and covariance of 2-D points
+
+    Uses the Minimum Covariance Determinant estimator when scikit-learn is
+    available; otherwise the coordinate-wise median and the covariance of
+    the points closest to it.
+
+    Returns:
+        tuple: (centre (2,), covariance (2, 2)) in km / km²
+    """
+    if HAS_MCD:
+        mcd = MinCovDet(support_fraction=SUPPORT_FRACTION, random_state=0).fit(points_km)
+        return mcd.location_, mcd.covariance_
+
+    centre = np.median(points_km, axis=0)
+    distances = np.linalg.norm(points_km - centre, axis=1)
+    inliers = points_km[distances <= np.quantile(distances, SUPPORT_FRACTION)]
+    return centre, np.cov(inliers, rowvar=False)
+
+
+def convex_hull(points):
+    """
+    Convex hull of 2-D points (Andrew's monotone chain)
+
+    Args:
+        points: Sequence of (x, y) tuples
+
+    Returns:
+        list: Hull vertices in counter-clockwise order (not closed)
+    """
+    points = sorted(set(points))
+    if len(points) <= 2:
+        return points
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower = []
+    for p in points:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+
+    upper = []
+    for p in reversed(points):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+
+    return lower[:-1] + upper[:-1]
+
+
+def build_boundary(latitudes, longitudes, mahalanobis):
+    """
+    Boundary polygon of a locality's listings, outliers excluded
+
+    Returns:
+        dict: 'bbox' [min_lat, min_lon, max_lat, max_lon] and 'polygon' [[lat, lon], ...],
+              or None if fewer than three hull vertices remain
+    """
+    keep = mahalanobis <= np.percentile(mahalanobis, BOUNDARY_PERCENTILE)
+    hull = convex_hull(zip(np.asarray(latitudes)[keep].tolist(), np.asarray(longitudes)[keep].tolist()))
+    if len(hull) < 3:
+        return None
+
+    lats = [p[0] for p in hull]
+    lons = [p[1] for p in hull]
+    return {
+        'bbox': [round(min(lats), 6), round(min(lons), 6), round(max(lats), 6), round(max(lons), 6)],
+        'polygon': [[round(lat, 6), round(lon, 6)] for lat, lon in hull]
+    }
+
+
+def build_profile(city, locality, latitudes, longitudes):
+    """
+    Build one locality profile
+
+    Returns:
+        dict: Profile entry for the JSON table
+    """
+    origin_lat = float(np.median(latitudes))
+    origin_lon = float(np.median(longitudes))
+    points_km = to_local_km(latitudes, longitudes, origin_lat, origin_lon)
+
+    centre_km, cov = robust_location_covariance(points_km)
+    cov = cov + np.eye(2) * MIN_SPREAD_KM ** 2
+
+    # Back from the local plane to degrees
+    centre_lat = origin_lat + math.degrees(centre_km[1] / EARTH_RADIUS_KM)
+    centre_lon = origin_lon + math.degrees(
+        centre_km[0] / (EARTH_RADIUS_KM * math.cos(math.radians(origin_lat)))
+    )
+
+    offsets = points_km - centre_km
+    distances = np.linalg.norm(offsets, axis=1)
+    percentiles = np.percentile(distances, DISTANCE_PERCENTILES)
+
+    inv_cov = np.linalg.inv(cov)
+    mahalanobis = np.sqrt(np.einsum('ij,jk,ik->i', offsets, inv_cov, offsets))
+    m_percentiles = np.percentile(mahalanobis, DISTANCE_PERCENTILES)
+
+    return {
+        'city': city,
+        'locality': locality,
+        'n': int(len(points_km)),
+        'centroid': [round(centre_lat, 6), round(centre_lon, 6)],
+        # Covariance in km² (MIN_SPREAD_KM included): [var_east, cov_east_north, var_north]
+        'cov_km2': [round(float(cov[0, 0]), 5), round(float(cov[0, 1]), 5), round(float(cov[1, 1]), 5)],
+        'distance_km': {
+            **{f"p{p}": round(float(v), 3) for p, v in zip(DISTANCE_PERCENTILES, percentiles)},
+            'max': round(float(distances.max()), 3)
+        },
+        'mahalanobis': {
+            **{f"p{p}": round(float(v), 3) for p, v in zip(DISTANCE_PERCENTILES, m_percentiles)},
+            'max': round(float(mahalanobis.max()), 3)
+        },
+        'boundary': build_boundary(latitudes, longitudes, mahalanobis)
+    }
+
+
+def build_locality_profiles(df):
+    """
+    Build profiles for every locality with enough geocoded listings
+
+    Args:
+        df: Real estate dataset (pandas DataFrame)
+
+    Returns:
+        dict: Profile table with build metadata
+    """
+    grouped = {}
+    for point in extract_listing_points(df):
+        grouped.setdefault((point['city'], point['locality']), []).append(
+            (point['latitude'], point['longitude'])
+        )
+
+    profiles = {}
+    for (city, locality), coords in sorted(grouped.items()):
+        if len(coords) < MIN_PROFILE_POINTS:
+            continue
+        coords = np.asarray(coords, dtype=float)
+        profiles[f"{city}|{locality}"] = build_profile(city, locality, coords[:, 0], coords[:, 1])
+
+    return {
+        'version': PROFILE_VERSION,
+        'built_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'dataset_rows': int(len(df)),
+        'estimator': 'mcd' if HAS_MCD else 'trimmed',
+        'profiles': profiles
+    }
+
+
+def write_locality_profiles(table, output_file=OUTPUT_FILE):
+    """Write the profile table as compact JSON"""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(table, f, separators=(',', ':'))
+    boundaries = sum(1 for profile in table['profiles'].values() if profile.get('boundary'))
+    print(f"💾 Saved {len(table['profiles'])} locality profiles ({boundaries} boundaries) to: {output_file}")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("  LOCALITY PROFILE BUILDER")
+    print("=" * 60)
+    print()
+
+    table = build_locality_profiles(load_dataset())
+    for key, profile in table['profiles'].items():
+        print(f"   {key}: n={profile['n']}, p95={profile['distance_km']['p95']:.2f} km")
+    write_locality_profiles(table)
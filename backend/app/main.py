@@ -2,9 +2,17 @@
 Truth in Listings - FastAPI Backend
 Main application entry point with improved error handling and configuration
 """
-from fastapi import FastAPI
+import time
+
+_import_started = time.perf_counter()
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 
 from app.config import AppConstants, settings, get_app_info
@@ -15,16 +23,52 @@ from app.exceptions import (
     validation_exception_handler,
     general_exception_handler
 )
-from app.routers import analyze, ml_analyze, image_upload, image_fraud_analysis, history, websocket
-from app.database import engine
-from app import models
+from app.routers import analyze, ml_analyze, image_upload, image_fraud_analysis, history, websocket, jobs
+from app.services.locality_registry import install_reload_signal_handler
+from app.services.warmup import get_warmup_state
+from app.utils.admission_control import AdmissionControlMiddleware
+from app.utils.lazy_imports import record_import_time
+from app.utils.metrics import PROMETHEUS_CONTENT_TYPE, get_metrics_registry
+
+# Startup import cost (heavy libraries are deferred, see app.utils.lazy_imports)
+record_import_time("app.main", time.perf_counter() - _import_started)
 
 # ============================================================
-# DATABASE INITIALIZATION
+# APPLICATION LIFESPAN
 # ============================================================
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application startup and shutdown
+    
+    Startup only installs signal handlers and schedules the warmup
+    (database tables, dataset, locality indexes, caches) in the
+    background, so the process is live immediately and /ready reports
+    when it can take traffic.
+    """
+    # Allow `kill -HUP` to reload the locality registry
+    install_reload_signal_handler()
+    warmup = asyncio.create_task(get_warmup_state().run())
+    
+    print("=" * 80)
+    print(f"  {AppConstants.APP_NAME} - Backend API")
+    print(f"  Version: {AppConstants.APP_VERSION}")
+    print("=" * 80)
+    print(f"✅ Application started successfully (warming up in the background)")
+    print(f"📚 API Documentation: {AppConstants.DOCS_URL}")
+    print(f"🔍 ReDoc Documentation: {AppConstants.REDOC_URL}")
+    print("=" * 80)
+    
+    yield
+    
+    warmup.cancel()
+    print("=" * 80)
+    print(f"  {AppConstants.APP_NAME} - Shutting down")
+    print("=" * 80)
+    print("✅ Application shut down successfully")
+    print("=" * 80)
+
 
 # ============================================================
 # APPLICATION INITIALIZATION
@@ -35,13 +79,18 @@ app = FastAPI(
     description=AppConstants.APP_DESCRIPTION,
     version=AppConstants.APP_VERSION,
     docs_url=AppConstants.DOCS_URL,
-    redoc_url=AppConstants.REDOC_URL
+    redoc_url=AppConstants.REDOC_URL,
+    lifespan=lifespan
 )
 
 # ============================================================
 # MIDDLEWARE CONFIGURATION
 # ============================================================
 
+# Admission control: bounded concurrency per route class, 429/503 when saturated.
+# Added first so CORS wraps it and rejections still carry the CORS headers.
+app.add_middleware(AdmissionControlMiddleware)
+
 # CORS Middleware
 # Allow specific origins for production and development
 app.add_middleware(
@@ -99,6 +148,12 @@ app.include_router(
     tags=["Analysis History"]
 )
 
+app.include_router(
+    jobs.router,
+    prefix=AppConstants.API_PREFIX,
+    tags=["Background Jobs"]
+)
+
 # WebSocket router for real-time features
 app.include_router(
     websocket.router,
@@ -183,39 +238,45 @@ async def detailed_health_check() -> DetailedHealthCheckResponse:
             "redoc": AppConstants.REDOC_URL,
             "analyze": f"{AppConstants.API_PREFIX}/analyze",
             "upload": f"{AppConstants.API_PREFIX}/upload",
-            "history": f"{AppConstants.API_PREFIX}/history"
+            "history": f"{AppConstants.API_PREFIX}/history",
+            "ready": "/ready",
+            "jobs": f"{AppConstants.API_PREFIX}/jobs",
+            "metrics": "/metrics"
         }
     )
 
 
-# ============================================================
-# STARTUP/SHUTDOWN EVENTS
-# ============================================================
-
-@app.on_event("startup")
-async def startup_event():
+@app.get(
+    "/ready",
+    tags=["Health Check"],
+    summary="Readiness probe",
+    description="200 once the dataset, indexes and caches are warm; 503 with per-component status until then"
+)
+async def readiness_check() -> JSONResponse:
     """
-    Application startup event
-    Perform initialization tasks
+    Readiness probe for the orchestrator
+    
+    /health only says the process is alive; this endpoint says whether it
+    should receive traffic.
+    
+    Returns:
+        JSONResponse: Per-component readiness (200 when ready, 503 otherwise)
     """
-    print("=" * 80)
-    print(f"  {AppConstants.APP_NAME} - Backend API")
-    print(f"  Version: {AppConstants.APP_VERSION}")
-    print("=" * 80)
-    print(f"✅ Application started successfully")
-    print(f"📚 API Documentation: {AppConstants.DOCS_URL}")
-    print(f"🔍 ReDoc Documentation: {AppConstants.REDOC_URL}")
-    print("=" * 80)
+    report = get_warmup_state().report()
+    return JSONResponse(content=report, status_code=200 if report['ready'] else 503)
 
 
-@app.on_event("shutdown")
-async def shutdown_event():
+@app.get(
+    "/metrics",
+    tags=["Health Check"],
+    summary="Prometheus metrics",
+    description="Latency histograms (modules, outbound calls, cache lookups, writes) in the Prometheus text format"
+)
+async def metrics() -> Response:
     """
-    Application shutdown event
-    Perform cleanup tasks
+    Prometheus scrape endpoint
+    
+    Returns:
+        Response: Text exposition of every registered histogram
     """
-    print("=" * 80)
-    print(f"  {AppConstants.APP_NAME} - Shutting down")
-    print("=" * 80)
-    print("✅ Application shut down successfully")
-    print("=" * 80)
+    return Response(content=get_metrics_registry().render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -15,28 +15,40 @@ This schema is used by all fraud modules, database, frontend forms, and evaluati
   "longitude": 0.0
 }
 """
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
-from typing import Optional
-
-# Import fraud detection services
-from app.services.price_fraud import detect_price_fraud
-from app.services.text_fraud import detect_text_fraud
-from app.services.location_fraud import detect_location_fraud
-from app.services.external_location_verification import verify_location_with_external_apis
-from app.services.amenity_verification import verify_amenity_claims
-from app.services.fusion import fuse_fraud_signals
-from app.utils.data_loader import load_dataset
+import asyncio
+import json
+import os
+import time
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from pydantic import BaseModel, Field, ValidationError
+from starlette.requests import ClientDisconnect
+from typing import List, Optional, Tuple
+
+# Import fraud detection pipeline
+from app.services.analysis_pipeline import run_analysis, run_analysis_within, run_batch_analysis
+from app.services.job_manager import JobQueueFull, get_job_manager
+from app.services.result_cache import (
+    ANALYSIS_CACHE_ENABLED,
+    CACHE_BYPASS,
+    CACHE_HIT,
+    CACHE_MISS,
+    get_result_cache
+)
+from app.utils.admission_control import get_admission_controller, is_local_only
+from app.utils.data_loader import get_loaded_dataset
+from app.utils.metrics import ANALYSIS_REQUEST_SECONDS, Timings
+from app.utils.ndjson import NDJSON_MEDIA_TYPE, DuplexStreamingResponse, iter_ndjson_lines
+from app.utils.reference_snapshot import ReferenceDataset
 
 router = APIRouter()
 
-# Load dataset once at startup
-try:
-    dataset = load_dataset()
-    print(f"✅ Dataset loaded: {len(dataset)} properties")
-except Exception as e:
-    print(f"⚠️ Warning: Could not load dataset: {e}")
-    dataset = None
+# Maximum listings per /analyze/batch request
+ANALYZE_BATCH_MAX_SIZE = int(os.getenv("ANALYZE_BATCH_MAX_SIZE", "1000"))
+
+# /analyze/stream: listings analyzed concurrently per stream, and longest accepted input line
+ANALYZE_STREAM_MAX_IN_FLIGHT = int(os.getenv("ANALYZE_STREAM_MAX_IN_FLIGHT", "32"))
+ANALYZE_STREAM_MAX_LINE_BYTES = int(os.getenv("ANALYZE_STREAM_MAX_LINE_BYTES", str(64 * 1024)))
 
 
 
@@ -118,6 +130,34 @@ class FraudReport(BaseModel):
         default_factory=dict,
         description="Individual fraud scores for each module (for visualization)"
     )
+    location_details: Optional[dict] = Field(
+        default=None,
+        description="Location check details, including the nearest actual localities to the coordinates"
+    )
+    skipped_modules: list[str] = Field(
+        default_factory=list,
+        description="Network-bound modules skipped because they could not change the risk level (or, when degraded, to shed load)"
+    )
+    degraded: bool = Field(
+        default=False,
+        description="True if the service was overloaded and only the local modules were run"
+    )
+    fallback_modules: list[str] = Field(
+        default_factory=list,
+        description="Network-bound modules that fell back to a placeholder score because their provider was unavailable (cached only briefly)"
+    )
+    pending_modules: list[str] = Field(
+        default_factory=list,
+        description="Modules still running when the deadline_ms budget ran out (left out of the fusion)"
+    )
+    followup: Optional[dict] = Field(
+        default=None,
+        description="Where the complete report is delivered when modules are pending (job_id, progress_url, result_url)"
+    )
+    timings: Optional[dict] = Field(
+        default=None,
+        description="Per-module durations in milliseconds (only with ?timings=true)"
+    )
     
     class Config:
         json_schema_extra = {
@@ -132,34 +172,61 @@ class FraudReport(BaseModel):
         }
 
 
-@router.post("/analyze", response_model=FraudReport)
-async def analyze_listing(request: AnalyzeRequest):
+class BatchAnalyzeRequest(BaseModel):
+    """Request model for batch analysis endpoint"""
+    listings: list[ListingData] = Field(..., description="Listings to analyze, in order")
+
+
+class BatchItemResult(BaseModel):
+    """Result for one listing of a batch (report, or error if validation failed)"""
+    index: int = Field(..., description="Position of the listing in the request")
+    report: Optional[FraudReport] = None
+    error: Optional[str] = None
+
+
+class BatchAnalyzeResponse(BaseModel):
+    """Response model for batch analysis endpoint"""
+    total: int
+    analyzed: int
+    failed: int
+    results: list[BatchItemResult] = Field(
+        default_factory=list,
+        description="One entry per submitted listing, in input order"
+    )
+
+
+def require_dataset():
     """
-    Analyze a listing for potential fraud (DUMMY LOGIC)
-    
-    This endpoint accepts listing data and returns a fraud analysis report.
-    Currently returns dummy data with correct structure.
+    Get the reference dataset for an analysis
     
-    This will become the single entry point for all fraud detection modules.
+    The dataset is loaded by the application lifespan (see
+    app.services.warmup), not on the request path.
     
-    Args:
-        request: AnalyzeRequest containing listing information
-        
     Returns:
-        FraudReport with fraud probability, types, and explanations
+        Real estate dataset (see app.utils.data_loader.get_dataset)
         
     Raises:
-        HTTPException: If validation fails
+        HTTPException: 503 while the dataset is not loaded
     """
-    # VALIDATION 1: Check if listing_data is provided
-    if not request.listing_data:
+    dataset = get_loaded_dataset()
+    if dataset is None:
         raise HTTPException(
-            status_code=400,
-            detail="listing_data is required for analysis"
+            status_code=503,
+            detail="Fraud detection service unavailable. Dataset not loaded."
         )
+    return dataset
+
+
+def validate_listing(listing: ListingData):
+    """
+    Validate listing fields beyond the schema constraints
     
-    listing = request.listing_data
-    
+    Args:
+        listing: ListingData to validate
+        
+    Raises:
+        HTTPException: 400 with a description of the first failed check
+    """
     # VALIDATION 2: Check required string fields are not empty
     if not listing.title or not listing.title.strip():
         raise HTTPException(
@@ -248,125 +315,441 @@ async def analyze_listing(request: AnalyzeRequest):
             status_code=400,
             detail="Description is too long (maximum 5000 characters)"
         )
+
+
+def submit_followup(analysis: asyncio.Task, cache_key: Optional[str]) -> Optional[dict]:
+    """
+    Track the rest of a deadline-limited analysis as a background job
     
-    # All validations passed!
+    The job completes with the full FraudReport (also stored in the result
+    cache) and its progress room announces completion, so clients can pick
+    up the pending modules over the WebSocket or from the jobs endpoint.
     
-    # Check if dataset is available
-    if dataset is None:
-        raise HTTPException(
-            status_code=503,
-            detail="Fraud detection service unavailable. Dataset not loaded."
-        )
+    Args:
+        analysis: Task resolving to the complete run_analysis result
+        cache_key: Result cache key for the complete report (None to skip caching)
+        
+    Returns:
+        dict: job_id, progress_url and result_url (None if the job queue is full)
+    """
+    async def run(context):
+        report = FraudReport(**await analysis)
+        if cache_key is not None:
+            get_result_cache().set(
+                cache_key, report.model_dump_json(exclude={'timings'}), fallback=bool(report.fallback_modules)
+            )
+        return report.model_dump()
+    
+    try:
+        job = get_job_manager().submit("pending_modules", run, limited=False)
+    except JobQueueFull as e:
+        print(f"Pending modules not tracked: {e}")
+        analysis.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return None
+    
+    return {
+        "job_id": job.id,
+        "progress_url": f"/api/ws/analysis/{job.id}",
+        "result_url": f"/api/jobs/{job.id}"
+    }
+
+
+async def analyze_with_cache(
+    listing: ListingData,
+    explain: bool,
+    stopwatch: Timings,
+    deadline_ms: Optional[int] = None,
+    local_only: bool = False
+) -> Tuple[str, str]:
+    """
+    Analyze a validated listing, serving repeat listings from the result cache
     
+    Args:
+        listing: Validated ListingData
+        explain: Render explanations
+        stopwatch: Request stopwatch (module timings are recorded on it)
+        deadline_ms: Latency budget. Modules unfinished by then are left out
+                     of the fusion and delivered later (see submit_followup);
+                     partial reports are not cached.
+        local_only: Skip the network-bound modules (load shedding). A
+                    cached complete report is still served; degraded
+                    reports are not cached. Reports with fallback_modules
+                    are cached with a short TTL.
+        
+    Returns:
+        tuple: (FraudReport JSON without timings, X-Cache status)
+    """
     # ============================================================
-    # FRAUD DETECTION MODULE 1: PRICE ANALYSIS
+    # RESULT CACHE (content-addressed, served as stored JSON)
     # ============================================================
-    price_score, price_explanation = detect_price_fraud(
-        listing_price=listing.price,
-        locality=listing.locality,
-        city=listing.city,
-        df=dataset
-    )
+    cache_key = None
+    if ANALYSIS_CACHE_ENABLED:
+        cache = get_result_cache()
+        with stopwatch.measure('cache_lookup', observe=False):
+            cache_key = cache.make_key(listing.model_dump(), explain)
+            cached = cache.get(cache_key)
+        if cached is not None:
+            return cached, CACHE_HIT
     
     # ============================================================
-    # FRAUD DETECTION MODULE 2: TEXT ANALYSIS
+    # FRAUD DETECTION PIPELINE
     # ============================================================
-    text_score, text_explanations = detect_text_fraud(
-        title=listing.title,
-        description=listing.description,
-        save_to_corpus=True
+    # Local modules (price, text, location) run concurrently; the
+    # network-bound verifiers follow unless they cannot change the
+    # risk level, then fusion combines all signals (see analysis_pipeline)
+    if local_only:
+        # Local modules only take milliseconds, so no deadline is needed
+        result = await run_analysis(listing, require_dataset(), explain=explain, timings=stopwatch, local_only=True)
+        return FraudReport(**result).model_dump_json(exclude={'timings'}), CACHE_BYPASS
+    elif deadline_ms is None:
+        result = await run_analysis(listing, require_dataset(), explain=explain, timings=stopwatch)
+    else:
+        budget = max(0.0, deadline_ms / 1000 - (time.perf_counter() - stopwatch.started))
+        result, remaining = await run_analysis_within(
+            listing, require_dataset(), budget, explain=explain, timings=stopwatch
+        )
+        if remaining is not None:
+            result['followup'] = submit_followup(remaining, cache_key)
+            report_json = FraudReport(**result).model_dump_json(exclude={'timings'})
+            return report_json, CACHE_MISS if cache_key is not None else CACHE_BYPASS
+    report_json = FraudReport(**result).model_dump_json(exclude={'timings'})
+    
+    if cache_key is None:
+        return report_json, CACHE_BYPASS
+    
+    # Reports built on a provider fallback are kept briefly (see ANALYSIS_CACHE_FALLBACK_TTL_SECONDS)
+    with stopwatch.measure('cache_store', observe=False):
+        cache.set(cache_key, report_json, fallback=bool(result['fallback_modules']))
+    return report_json, CACHE_MISS
+
+
+@router.post("/analyze", response_model=FraudReport)
+async def analyze_listing(
+    request: AnalyzeRequest,
+    http_request: Request,
+    explain: bool = True,
+    timings: bool = False,
+    deadline_ms: Optional[int] = None
+):
+    """
+    Analyze a listing for potential fraud (DUMMY LOGIC)
+    
+    This endpoint accepts listing data and returns a fraud analysis report.
+    Currently returns dummy data with correct structure.
+    
+    This will become the single entry point for all fraud detection modules.
+    
+    Args:
+        request: AnalyzeRequest containing listing information
+        explain: Query parameter. When false, only scores and fraud types are
+                 computed and explanations are left empty. Location details
+                 (including the nearest actual localities) are complete.
+        timings: Query parameter. When true, the report includes a timings
+                 block with per-module durations (ms).
+        deadline_ms: Query parameter. Latency budget for the analysis: modules
+                 still running when it expires are listed in pending_modules,
+                 the finished ones are fused with renormalized weights, and
+                 followup points to the background job that delivers the
+                 complete report.
+        
+    Returns:
+        FraudReport with fraud probability, types, and explanations.
+        When the admission controller sheds load to local-only analysis
+        (see app.utils.admission_control), degraded is true and the
+        network-bound modules are listed in skipped_modules.
+        Repeat analyses of an identical listing are served from the result
+        cache (X-Cache: HIT) until the TTL expires or the dataset, lexicon
+        or weights version changes.
+        
+    Raises:
+        HTTPException: If validation fails
+    """
+    # VALIDATION 1: Check if listing_data is provided
+    if not request.listing_data:
+        raise HTTPException(
+            status_code=400,
+            detail="listing_data is required for analysis"
+        )
+    
+    listing = request.listing_data
+    
+    # VALIDATION 2-6: Field contents
+    validate_listing(listing)
+    
+    if deadline_ms is not None and deadline_ms <= 0:
+        raise HTTPException(
+            status_code=400,
+            detail="deadline_ms must be a positive number of milliseconds"
+        )
+    
+    # All validations passed!
+    
+    # Check if dataset is available
+    require_dataset()
+    
+    stopwatch = Timings()
+    report_json, cache_status = await analyze_with_cache(
+        listing, explain, stopwatch, deadline_ms, local_only=is_local_only(http_request)
     )
     
-    # ============================================================
-    # FRAUD DETECTION MODULE 3: LOCATION ANALYSIS
-    # ============================================================
-    # Note: City is required for accurate location verification
-    location_score, location_explanation = detect_location_fraud(
-        locality=listing.locality,
-        latitude=listing.latitude,
-        longitude=listing.longitude,
-        city=listing.city,
-        price=listing.price  # For price-location sanity check
+    if timings:
+        report_json = json.dumps({**json.loads(report_json), 'timings': stopwatch.as_dict()})
+    ANALYSIS_REQUEST_SECONDS.observe(time.perf_counter() - stopwatch.started, endpoint="analyze")
+    
+    # Return fraud report (serialized once; cache hits are returned as stored)
+    return Response(content=report_json, media_type="application/json", headers={"X-Cache": cache_status})
+
+
+async def analyze_listings(
+    listings: List[ListingData],
+    explain: bool,
+    stopwatch: Timings,
+    offset: int = 0
+) -> Tuple[List[BatchItemResult], int]:
+    """
+    Validate and analyze listings through the batch pipeline, using the result cache
+    
+    Args:
+        listings: Listings in input order
+        explain: Render explanations
+        stopwatch: Timings collecting the batch stage durations
+        offset: Index of the first listing (for results of a chunk of a larger input)
+        
+    Returns:
+        tuple: (one BatchItemResult per listing, number served from the cache)
+    """
+    results = [BatchItemResult(index=offset + i) for i in range(len(listings))]
+    valid_indices = []
+    for i, listing in enumerate(listings):
+        try:
+            validate_listing(listing)
+            valid_indices.append(i)
+        except HTTPException as e:
+            results[i].error = e.detail
+    
+    # Serve cached reports; only the remaining listings are analyzed
+    pending = valid_indices
+    cache_keys = {}
+    if ANALYSIS_CACHE_ENABLED:
+        cache = get_result_cache()
+        pending = []
+        for i in valid_indices:
+            with stopwatch.measure('cache_lookup', observe=False):
+                cache_keys[i] = cache.make_key(listings[i].model_dump(), explain)
+                cached = cache.get(cache_keys[i])
+            if cached is not None:
+                results[i].report = FraudReport.model_validate_json(cached)
+            else:
+                pending.append(i)
+    
+    reports = await run_batch_analysis(
+        [listings[i] for i in pending], require_dataset(), explain=explain, timings=stopwatch
     )
+    for i, report in zip(pending, reports):
+        results[i].report = FraudReport(**report)
+        if i in cache_keys:
+            with stopwatch.measure('cache_store', observe=False):
+                cache.set(
+                    cache_keys[i], results[i].report.model_dump_json(), fallback=bool(report['fallback_modules'])
+                )
+    
+    return results, len(valid_indices) - len(pending)
+
+
+@router.post("/analyze/batch", response_model=BatchAnalyzeResponse)
+async def analyze_batch(request: BatchAnalyzeRequest, response: Response, explain: bool = True):
+    """
+    Analyze many listings through the full fraud pipeline
     
-    # ============================================================
-    # FRAUD DETECTION MODULE 4: EXTERNAL LOCATION VERIFICATION (NEW)
-    # ============================================================
-    # Verify location using external APIs (Nominatim, BigDataCloud, etc.)
-    try:
-        external_location_score, external_location_explanation, _ = verify_location_with_external_apis(
-            latitude=listing.latitude,
-            longitude=listing.longitude,
-            claimed_city=listing.city,
-            claimed_locality=listing.locality
+    Listings that fail validation are reported individually and do not
+    fail the batch. Each report matches what /analyze returns for that
+    listing when the listings are submitted one by one in input order.
+    
+    Args:
+        request: BatchAnalyzeRequest with up to ANALYZE_BATCH_MAX_SIZE listings
+        response: Outgoing response (carries the X-Cache-Hits header)
+        explain: Query parameter, as for /analyze
+        
+    Returns:
+        BatchAnalyzeResponse with one result per listing, in input order.
+        Listings found in the result cache are not re-analyzed; the
+        X-Cache-Hits header reports how many were served from it.
+        
+    Raises:
+        HTTPException: If the batch is empty or too large, or the dataset is unavailable
+    """
+    if not request.listings:
+        raise HTTPException(
+            status_code=400,
+            detail="listings must contain at least one listing"
         )
-    except Exception as e:
-        print(f"External location verification failed: {e}")
-        external_location_score = 0.0
-        external_location_explanation = "External location verification unavailable."
     
-    # ============================================================
-    # FRAUD DETECTION MODULE 5: AMENITY VERIFICATION (NEW)
-    # ============================================================
-    # Verify amenity claims using Overpass API
-    try:
-        amenity_score, amenity_explanation, _ = verify_amenity_claims(
-            title=listing.title,
-            description=listing.description,
-            latitude=listing.latitude,
-            longitude=listing.longitude
+    if len(request.listings) > ANALYZE_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many listings ({len(request.listings)}); the maximum per batch is {ANALYZE_BATCH_MAX_SIZE}"
         )
-    except Exception as e:
-        print(f"Amenity verification failed: {e}")
-        amenity_score = 0.0
-        amenity_explanation = "Amenity verification unavailable."
     
-    # ============================================================
-    # FRAUD DETECTION MODULE 6: IMAGE ANALYSIS (Placeholder)
-    # ============================================================
-    # TODO: Integrate image fraud detection when images are provided
-    # For now, set to 0.0 (no image fraud detected)
-    image_score = 0.0
-    image_explanation = "Image fraud detection not yet integrated."
+    require_dataset()
     
-    # ============================================================
-    # FUSION ENGINE: Combine all fraud signals
-    # ============================================================
-    # Use weighted fusion engine for explainable, deterministic combination
-    # Weights: Price (25%), Image (20%), Text (20%), Location (15%), 
-    #          External Location (15%), Amenity (5%)
-    
-    final_fraud_probability, fraud_types, explanations = fuse_fraud_signals(
-        price_score=price_score,
-        price_explanation=price_explanation,
-        image_score=image_score,
-        image_explanation=image_explanation,
-        text_score=text_score,
-        text_explanations=text_explanations,
-        location_score=location_score,
-        location_explanation=location_explanation,
-        external_location_score=external_location_score,
-        external_location_explanation=external_location_explanation,
-        amenity_score=amenity_score,
-        amenity_explanation=amenity_explanation
-    )
+    stopwatch = Timings()
+    results, cache_hits = await analyze_listings(request.listings, explain, stopwatch)
+    analyzed = sum(1 for result in results if result.report is not None)
     
-    # Return fraud report
-    return FraudReport(
-        fraud_probability=final_fraud_probability,
-        fraud_types=fraud_types,
-        explanations=explanations,
-        module_scores={
-            "Price": price_score,
-            "Image": image_score,
-            "Text": text_score,
-            "Location": location_score,
-            "External Location": external_location_score,
-            "Amenity": amenity_score
-        }
+    response.headers["X-Cache-Hits"] = str(cache_hits) if ANALYSIS_CACHE_ENABLED else CACHE_BYPASS
+    ANALYSIS_REQUEST_SECONDS.observe(time.perf_counter() - stopwatch.started, endpoint="analyze_batch")
+    
+    return BatchAnalyzeResponse(
+        total=len(results),
+        analyzed=analyzed,
+        failed=len(results) - analyzed,
+        results=results
+    )
+
+
+def _validation_message(error: ValidationError) -> str:
+    """One-line summary of a pydantic validation error"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'listing'}: {e['msg']}" for e in error.errors()
     )
 
 
+async def _analyze_stream_line(index: int, line: Optional[bytes], explain: bool) -> str:
+    """
+    Analyze one NDJSON input line
+    
+    Args:
+        index: Zero-based line number (blank lines not counted)
+        line: Raw JSON listing (or {"listing_data": {...}}), None if oversized
+        explain: Render explanations
+        
+    Returns:
+        str: Output line {"index", "report"} or {"index", "error"}, newline-terminated
+    """
+    if line is None:
+        return json.dumps({'index': index, 'error': f"Line exceeds {ANALYZE_STREAM_MAX_LINE_BYTES} bytes"}) + "\n"
+    
+    stopwatch = Timings()
+    try:
+        data = json.loads(line)
+        if isinstance(data, dict) and isinstance(data.get('listing_data'), dict):
+            data = data['listing_data']
+        listing = ListingData.model_validate(data)
+        validate_listing(listing)
+        report_json, _ = await analyze_with_cache(listing, explain, stopwatch)
+    except HTTPException as e:
+        return json.dumps({'index': index, 'error': e.detail}) + "\n"
+    except ValidationError as e:
+        return json.dumps({'index': index, 'error': _validation_message(e)}) + "\n"
+    except ValueError as e:
+        return json.dumps({'index': index, 'error': f"Invalid JSON: {e}"}) + "\n"
+    except Exception as e:
+        print(f"Stream analysis error (line {index}): {e}")
+        return json.dumps({'index': index, 'error': "Analysis failed"}) + "\n"
+    finally:
+        ANALYSIS_REQUEST_SECONDS.observe(time.perf_counter() - stopwatch.started, endpoint="analyze_stream")
+    
+    return f'{{"index":{index},"report":{report_json}}}\n'
+
+
+async def stream_reports(request: Request, explain: bool):
+    """
+    Analyze an NDJSON request body, yielding one output line per listing as it finishes
+    
+    Flow control: at most ANALYZE_STREAM_MAX_IN_FLIGHT listings are being
+    analyzed or waiting to be sent. When the client reads slowly, finished
+    lines queue up, no slot is freed, and the reader stops pulling the
+    request body, so the upload is throttled too. Memory stays constant
+    whatever the feed size.
+    
+    Args:
+        request: Incoming request (body is read incrementally)
+        explain: Render explanations
+        
+    Yields:
+        str: NDJSON output lines, in completion order
+    """
+    done = object()
+    finished: asyncio.Queue = asyncio.Queue(maxsize=ANALYZE_STREAM_MAX_IN_FLIGHT)
+    slots = asyncio.Semaphore(ANALYZE_STREAM_MAX_IN_FLIGHT)
+    in_flight = set()
+    
+    async def analyze(index, line):
+        try:
+            await finished.put(await _analyze_stream_line(index, line, explain))
+        finally:
+            slots.release()
+    
+    async def read_body():
+        index = 0
+        try:
+            async for line in iter_ndjson_lines(request.stream(), ANALYZE_STREAM_MAX_LINE_BYTES):
+                await slots.acquire()
+                task = asyncio.create_task(analyze(index, line))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+                index += 1
+            await asyncio.gather(*list(in_flight))
+        except ClientDisconnect:
+            print(f"Analysis stream: client disconnected after {index} listings")
+        except Exception as e:
+            # Hand the failure to the response loop, which would otherwise wait forever
+            print(f"Analysis stream: reading failed after {index} listings: {e}")
+            await finished.put(e)
+            return
+        await finished.put(done)
+    
+    reader = asyncio.create_task(read_body())
+    try:
+        while True:
+            line = await finished.get()
+            if line is done:
+                break
+            if isinstance(line, Exception):
+                yield json.dumps({'error': f"Stream aborted after a read error: {line}"}) + "\n"
+                break
+            yield line
+    finally:
+        # Client gone or stream finished: stop reading and drop unfinished work
+        reader.cancel()
+        for task in list(in_flight):
+            task.cancel()
+
+
+@router.post("/analyze/stream")
+async def analyze_stream(request: Request, explain: bool = True):
+    """
+    Analyze a newline-delimited JSON stream of listings
+    
+    The request body holds one listing per line (ListingData fields, or
+    {"listing_data": {...}}). The response streams one line per listing
+    as soon as it is analyzed:
+    
+        {"index": 0, "report": {FraudReport}}
+        {"index": 3, "error": "Price cannot be zero"}
+    
+    If the body cannot be read (e.g. invalid encoding), a last line
+    {"error": "..."} without an index ends the stream.
+    
+    Lines arrive in completion order; index is the input line number
+    (blank lines skipped). Neither the input nor the output is buffered,
+    so feeds of any size run in constant memory (see stream_reports).
+    
+    Args:
+        request: Incoming request with an NDJSON body
+        explain: Query parameter, as for /analyze
+        
+    Returns:
+        Streaming application/x-ndjson response
+        
+    Raises:
+        HTTPException: If the dataset is unavailable
+    """
+    require_dataset()
+    
+    return DuplexStreamingResponse(stream_reports(request, explain), media_type=NDJSON_MEDIA_TYPE)
+
+
 @router.get("/analyze/status")
 async def get_analysis_status():
     """
@@ -375,10 +758,14 @@ async def get_analysis_status():
     Returns:
         Service status information
     """
+    dataset = get_loaded_dataset()
     dataset_status = "loaded" if dataset is not None else "not_loaded"
     return {
         "status": "operational" if dataset is not None else "degraded",
         "service": "Analysis Service",
         "message": f"Ready ({dataset_status})",
-        "dataset_size": len(dataset) if dataset is not None else 0
+        "dataset_size": len(dataset) if dataset is not None else 0,
+        "shared_dataset": dataset.get_stats() if isinstance(dataset, ReferenceDataset) else {"enabled": False},
+        "result_cache": get_result_cache().get_stats() if ANALYSIS_CACHE_ENABLED else {"enabled": False},
+        "admission": get_admission_controller().get_stats()
     }
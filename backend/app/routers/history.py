@@ -4,6 +4,7 @@ from typing import List
 from ..database import get_db
 from ..models import ListingHistory
 from .analyze import ListingData, FraudReport
+from ..utils.metrics import STORE_WRITE_SECONDS
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -64,9 +65,10 @@ async def save_history(data: HistoryCreate, db: Session = Depends(get_db)):
         explanations=data.analysis_results.explanations,
         module_scores=data.analysis_results.module_scores
     )
-    db.add(db_history)
-    db.commit()
-    db.refresh(db_history)
+    with STORE_WRITE_SECONDS.time(store="listing_history"):
+        db.add(db_history)
+        db.commit()
+        db.refresh(db_history)
     return db_history
 
 @router.get("/history", response_model=List[HistoryResponse])
@@ -0,0 +1,296 @@
+"""
+Jobs Router
+Background analysis jobs for work that would outlast an HTTP request
+
+Submitting returns a job id immediately (202). Progress is pushed to
+ws://.../api/ws/analysis/{job_id} and the result is fetched from
+GET /api/jobs/{job_id} once the job has completed.
+"""
+import os
+import time
+
+from fastapi import APIRouter, File, HTTPException, UploadFile
+from pydantic import BaseModel
+
+from app.routers.analyze import (
+    AnalyzeRequest,
+    BatchAnalyzeRequest,
+    BatchAnalyzeResponse,
+    FraudReport,
+    analyze_listings,
+    require_dataset,
+    validate_listing
+)
+from app.routers.image_fraud_analysis import ImageFraudRequest, ImageFraudResponse
+from app.routers.ml_analyze import build_bulk_response, read_csv_upload
+from app.services.analysis_pipeline import PROGRESS_STEPS, get_cpu_executor, run_analysis, run_in_executor
+from app.services.image_fraud import detect_image_fraud
+from app.services.job_manager import FINISHED_STATES, JobContext, JobError, JobQueueFull, get_job_manager
+from app.utils.lazy_imports import lazy_module
+from app.utils.metrics import Timings
+from app.utils.ml_code import classify_processed, preprocess_data
+
+router = APIRouter()
+
+# Imported on first use (see app.utils.lazy_imports)
+pd = lazy_module("pandas")
+
+# Listings per batch-job chunk (one progress update per chunk)
+JOB_CHUNK_SIZE = int(os.getenv("JOB_CHUNK_SIZE", "50"))
+
+# CSV rows per bulk-job chunk
+JOB_CSV_CHUNK_ROWS = int(os.getenv("JOB_CSV_CHUNK_ROWS", "1000"))
+
+# Largest listing batch accepted as a job
+JOB_BATCH_MAX_SIZE = int(os.getenv("JOB_BATCH_MAX_SIZE", "100000"))
+
+
+class JobSubmitted(BaseModel):
+    """Response returned when a job is queued"""
+    job_id: str
+    kind: str
+    status: str
+    progress_url: str
+    result_url: str
+
+
+def _submit(kind: str, runner, total: int = 0) -> JobSubmitted:
+    """
+    Queue a job and describe where to follow it
+
+    Raises:
+        HTTPException: 429 if the job queue is full
+    """
+    try:
+        job = get_job_manager().submit(kind, runner, total=total)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=f"Too many jobs: {e}. Retry later.")
+
+    return JobSubmitted(
+        job_id=job.id,
+        kind=job.kind,
+        status=job.status,
+        progress_url=f"/api/ws/analysis/{job.id}",
+        result_url=f"/api/jobs/{job.id}"
+    )
+
+
+# ============================================================
+# SUBMISSION ENDPOINTS
+# ============================================================
+
+@router.post("/jobs/analyze", status_code=202, response_model=JobSubmitted)
+async def submit_listing_job(request: AnalyzeRequest, explain: bool = True):
+    """
+    Analyze one listing in the background, reporting each module as it finishes
+
+    Useful when the external checks are slow. The result is the same
+    FraudReport /analyze returns.
+
+    Args:
+        request: AnalyzeRequest with listing_data
+        explain: Query parameter, as for /analyze
+
+    Returns:
+        JobSubmitted with the job id and progress/result locations
+    """
+    if not request.listing_data:
+        raise HTTPException(
+            status_code=400,
+            detail="listing_data is required for analysis"
+        )
+    listing = request.listing_data
+    validate_listing(listing)
+    dataset = require_dataset()
+
+    async def run(context: JobContext):
+        async def module_done(module: str):
+            await context.advance(stage=f"{module} done")
+
+        result = await run_analysis(listing, dataset, explain=explain, on_module_done=module_done)
+        return FraudReport(**result).model_dump()
+
+    return _submit("listing", run, total=len(PROGRESS_STEPS))
+
+
+@router.post("/jobs/analyze/batch", status_code=202, response_model=JobSubmitted)
+async def submit_batch_job(request: BatchAnalyzeRequest, explain: bool = True):
+    """
+    Analyze a listing batch in the background, in chunks of JOB_CHUNK_SIZE
+
+    The result has the same shape as /analyze/batch; progress is reported
+    after every chunk.
+
+    Args:
+        request: BatchAnalyzeRequest with up to JOB_BATCH_MAX_SIZE listings
+        explain: Query parameter, as for /analyze
+
+    Returns:
+        JobSubmitted with the job id and progress/result locations
+    """
+    listings = request.listings
+    if not listings:
+        raise HTTPException(
+            status_code=400,
+            detail="listings must contain at least one listing"
+        )
+    if len(listings) > JOB_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many listings ({len(listings)}); the maximum per job is {JOB_BATCH_MAX_SIZE}"
+        )
+    require_dataset()
+
+    async def run(context: JobContext):
+        stopwatch = Timings()
+        results = []
+        for offset in range(0, len(listings), JOB_CHUNK_SIZE):
+            chunk = listings[offset:offset + JOB_CHUNK_SIZE]
+            chunk_results, _ = await analyze_listings(chunk, explain, stopwatch, offset=offset)
+            results.extend(chunk_results)
+            await context.update(
+                completed=offset + len(chunk),
+                stage=f"listings {offset + 1}-{offset + len(chunk)} analyzed"
+            )
+
+        analyzed = sum(1 for result in results if result.report is not None)
+        return BatchAnalyzeResponse(
+            total=len(results),
+            analyzed=analyzed,
+            failed=len(results) - analyzed,
+            results=results
+        ).model_dump()
+
+    return _submit("batch", run, total=len(listings))
+
+
+@router.post("/jobs/analyze/bulk", status_code=202, response_model=JobSubmitted)
+async def submit_bulk_job(file: UploadFile = File(...)):
+    """
+    Classify a CSV upload with the ML model in the background
+
+    Rows are preprocessed together (column means over the whole file, as
+    /analyze/bulk does) and classified in chunks of JOB_CSV_CHUNK_ROWS.
+    The result has the same shape as /analyze/bulk.
+
+    Args:
+        file: CSV upload
+
+    Returns:
+        JobSubmitted with the job id and progress/result locations
+    """
+    if not file.filename.endswith('.csv'):
+        raise HTTPException(status_code=400, detail="Only CSV files are allowed")
+    contents = await file.read()
+
+    async def run(context: JobContext):
+        start = time.perf_counter()
+        cpu = get_cpu_executor()
+        try:
+            df = await run_in_executor(cpu, read_csv_upload, contents)
+        except HTTPException as e:
+            raise JobError(e.detail)
+
+        processed = await run_in_executor(cpu, preprocess_data, df)
+        await context.update(completed=0, total=len(processed), stage="preprocessed")
+
+        chunks = []
+        for offset in range(0, len(processed), JOB_CSV_CHUNK_ROWS):
+            chunk = processed.iloc[offset:offset + JOB_CSV_CHUNK_ROWS].copy()
+            chunks.append(await run_in_executor(cpu, classify_processed, chunk))
+            await context.update(
+                completed=offset + len(chunk),
+                stage=f"rows {offset + 1}-{offset + len(chunk)} classified"
+            )
+
+        results_df = pd.concat(chunks)
+        return await run_in_executor(cpu, build_bulk_response, results_df, time.perf_counter() - start)
+
+    return _submit("bulk_csv", run)
+
+
+@router.post("/jobs/image-fraud", status_code=202, response_model=JobSubmitted)
+async def submit_image_job(request: ImageFraudRequest):
+    """
+    Check a batch of images for reuse in the background, reporting each image
+
+    Args:
+        request: ImageFraudRequest with image paths
+
+    Returns:
+        JobSubmitted with the job id and progress/result locations
+    """
+    if not request.image_paths:
+        raise HTTPException(
+            status_code=400,
+            detail="No image paths provided"
+        )
+    image_paths = list(request.image_paths)
+
+    async def run(context: JobContext):
+        def image_done(path: str):
+            context.advance_threadsafe(stage=f"{os.path.basename(path)} hashed")
+
+        fraud_score, duplicate_count, explanation = await run_in_executor(
+            get_cpu_executor(), detect_image_fraud,
+            image_paths=image_paths,
+            save_hashes=True,
+            on_image_done=image_done
+        )
+        return ImageFraudResponse(
+            image_fraud_score=fraud_score,
+            duplicate_images=duplicate_count,
+            explanation=explanation
+        ).model_dump()
+
+    return _submit("images", run, total=len(image_paths))
+
+
+# ============================================================
+# STATUS ENDPOINTS
+# ============================================================
+
+@router.get("/jobs")
+async def list_jobs():
+    """
+    List retained jobs (newest first, without results)
+
+    Returns:
+        Job statuses and queue statistics
+    """
+    manager = get_job_manager()
+    return {
+        "jobs": manager.list_jobs(),
+        "stats": manager.get_stats()
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Get a job's status, with its result once completed
+
+    Raises:
+        HTTPException: 404 if the job is unknown or has expired
+    """
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict()
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """
+    Cancel a queued or running job
+
+    Raises:
+        HTTPException: 404 if the job is unknown, 409 if it has already finished
+    """
+    manager = get_job_manager()
+    job = manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if job.status in FINISHED_STATES or not manager.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job {job_id} has already finished ({job.status})")
+    return {"job_id": job_id, "status": "cancelling"}
@@ -1,10 +1,15 @@
-import numpy as np
 from fastapi import APIRouter, UploadFile, File, HTTPException
-import pandas as pd
 import io
 import json
+import time
+from app.utils.lazy_imports import lazy_module
+from app.utils.metrics import ANALYSIS_REQUEST_SECONDS
 from app.utils.ml_code import predict_class_only_real_estate
 
+# Imported on first use (see app.utils.lazy_imports)
+pd = lazy_module("pandas")
+np = lazy_module("numpy")
+
 router = APIRouter()
 
 @router.post("/analyze/bulk")
@@ -16,99 +21,123 @@ async def analyze_bulk(file: UploadFile = File(...)):
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="Only CSV files are allowed")
     
+    start = time.perf_counter()
     try:
         # Read CSV file
-        contents = await file.read()
-        try:
-            # Try standard utf-8
-            df = pd.read_csv(io.BytesIO(contents))
-        except:
-            # Fallback to latin-1 if utf-8 fails (common for some excel exports)
-            df = pd.read_csv(io.BytesIO(contents), encoding='latin-1')
-        
-        if df.empty:
-            raise HTTPException(status_code=400, detail="The uploaded CSV file is empty")
+        df = read_csv_upload(await file.read())
             
         # Perform prediction
         # The project logic handles preprocessing within this function as requested
         results_df = predict_class_only_real_estate(df)
         
-        # Convert the dataframe to JSON-compatible format (list of dicts)
-        results_df = results_df.replace({np.nan: None})
-        result_json = results_df.to_dict(orient='records')
+        process_time = time.perf_counter() - start
+        ANALYSIS_REQUEST_SECONDS.observe(process_time, endpoint="analyze_bulk")
         
-        # Calculate summary metrics
-        total = len(results_df)
-        real_count = len(results_df[results_df['prediction'] == 'Real'])
-        fake_count = total - real_count
-        avg_confidence = results_df['confidence'].mean() if 'confidence' in results_df.columns else 0
+        return build_bulk_response(results_df, process_time)
         
-        # Helper to find column by partial name
-        def find_col(possible_names):
-            for col in results_df.columns:
-                if any(name.lower() in col.lower() for name in possible_names):
-                    return col
-            return None
+    except Exception as e:
+        print(f"❌ Bulk analysis error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
-        # Identify key columns for EDA
-        rent_col = find_col(['rent', 'price', 'amount'])
-        rooms_col = find_col(['rooms', 'bedroom', 'bhk'])
-        floors_col = find_col(['floor', 'total_floor'])
 
-        # --- NEW: EDA Analysis Generation ---
-        eda = {}
-        
-        # 1. Rent Distribution (Histogram)
-        if rent_col:
-            hist, bin_edges = np.histogram(results_df[rent_col].dropna().astype(float), bins=10)
-            eda['rent_dist'] = {
-                "values": hist.tolist(),
-                "labels": [f"{int(bin_edges[i])}-{int(bin_edges[i+1])}" for i in range(len(bin_edges)-1)]
-            }
-            
-        # 2. Rooms vs Floors (Scatter)
-        if rooms_col and floors_col:
-            eda['rooms_vs_floors'] = [
-                {"x": float(row[floors_col]), "y": float(row[rooms_col])} 
-                for _, row in results_df.dropna(subset=[rooms_col, floors_col]).head(100).iterrows()
-            ]
-            
-        # 3. Correlation Matrix (Simple subset)
-        numeric_df = results_df.select_dtypes(include=[np.number])
-        if not numeric_df.empty:
-            corr = numeric_df.corr().round(2).fillna(0)
-            eda['correlation'] = {
-                "labels": corr.columns.tolist(),
-                "values": corr.values.tolist()
-            }
-            
-        # 4. Rent vs Label (Bar)
-        if rent_col:
-            eda['rent_vs_label'] = {
-                "Real": float(results_df[results_df['prediction'] == 'Real'][rent_col].astype(float).mean() or 0),
-                "Fake": float(results_df[results_df['prediction'] == 'Fake'][rent_col].astype(float).mean() or 0)
-            }
+def read_csv_upload(contents: bytes) -> "pd.DataFrame":
+    """
+    Parse an uploaded CSV file
+    
+    Raises:
+        HTTPException: If the file has no rows
+    """
+    try:
+        # Try standard utf-8
+        df = pd.read_csv(io.BytesIO(contents))
+    except:
+        # Fallback to latin-1 if utf-8 fails (common for some excel exports)
+        df = pd.read_csv(io.BytesIO(contents), encoding='latin-1')
+    
+    if df.empty:
+        raise HTTPException(status_code=400, detail="The uploaded CSV file is empty")
+    return df
+
 
-        return {
-            "status": "success",
-            "count": total,
-            "metrics": {
-                "real_percentage": round((real_count / total) * 100, 2) if total > 0 else 0,
-                "fake_percentage": round((fake_count / total) * 100, 2) if total > 0 else 0,
-                "average_confidence": round(avg_confidence, 2),
-                "model_accuracy": 94.2,
-                "sub_models": [
-                    {"name": "ExtraTree Classifier", "accuracy": 92.8, "weight": "40%", "status": "Stable"},
-                    {"name": "Artificial Neural Network", "accuracy": 95.5, "weight": "40%", "status": "Optimal"},
-                    {"name": "Regime-based Logic", "accuracy": 89.2, "weight": "20%", "status": "Active"}
-                ],
-                "process_time": "1.2s"
-            },
-            "eda": eda,
-            "data": result_json
+def build_bulk_response(results_df: "pd.DataFrame", process_time: float) -> dict:
+    """
+    Summary metrics, EDA charts and per-row predictions for a classified CSV
+    
+    Args:
+        results_df: Output of predict_class_only_real_estate
+        process_time: Seconds spent reading and classifying
+    """
+    # Convert the dataframe to JSON-compatible format (list of dicts)
+    results_df = results_df.replace({np.nan: None})
+    result_json = results_df.to_dict(orient='records')
+    
+    # Calculate summary metrics
+    total = len(results_df)
+    real_count = len(results_df[results_df['prediction'] == 'Real'])
+    fake_count = total - real_count
+    avg_confidence = results_df['confidence'].mean() if 'confidence' in results_df.columns else 0
+    
+    # Helper to find column by partial name
+    def find_col(possible_names):
+        for col in results_df.columns:
+            if any(name.lower() in col.lower() for name in possible_names):
+                return col
+        return None
+
+    # Identify key columns for EDA
+    rent_col = find_col(['rent', 'price', 'amount'])
+    rooms_col = find_col(['rooms', 'bedroom', 'bhk'])
+    floors_col = find_col(['floor', 'total_floor'])
+
+    # --- NEW: EDA Analysis Generation ---
+    eda = {}
+    
+    # 1. Rent Distribution (Histogram)
+    if rent_col:
+        hist, bin_edges = np.histogram(results_df[rent_col].dropna().astype(float), bins=10)
+        eda['rent_dist'] = {
+            "values": hist.tolist(),
+            "labels": [f"{int(bin_edges[i])}-{int(bin_edges[i+1])}" for i in range(len(bin_edges)-1)]
         }
         
-    except Exception as e:
-        print(f"❌ Bulk analysis error: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
+    # 2. Rooms vs Floors (Scatter)
+    if rooms_col and floors_col:
+        eda['rooms_vs_floors'] = [
+            {"x": float(row[floors_col]), "y": float(row[rooms_col])} 
+            for _, row in results_df.dropna(subset=[rooms_col, floors_col]).head(100).iterrows()
+        ]
+        
+    # 3. Correlation Matrix (Simple subset)
+    numeric_df = results_df.select_dtypes(include=[np.number])
+    if not numeric_df.empty:
+        corr = numeric_df.corr().round(2).fillna(0)
+        eda['correlation'] = {
+            "labels": corr.columns.tolist(),
+            "values": corr.values.tolist()
+        }
+        
+    # 4. Rent vs Label (Bar)
+    if rent_col:
+        eda['rent_vs_label'] = {
+            "Real": float(results_df[results_df['prediction'] == 'Real'][rent_col].astype(float).mean() or 0),
+            "Fake": float(results_df[results_df['prediction'] == 'Fake'][rent_col].astype(float).mean() or 0)
+        }
 
+    return {
+        "status": "success",
+        "count": total,
+        "metrics": {
+            "real_percentage": round((real_count / total) * 100, 2) if total > 0 else 0,
+            "fake_percentage": round((fake_count / total) * 100, 2) if total > 0 else 0,
+            "average_confidence": round(avg_confidence, 2),
+            "model_accuracy": 94.2,
+            "sub_models": [
+                {"name": "ExtraTree Classifier", "accuracy": 92.8, "weight": "40%", "status": "Stable"},
+                {"name": "Artificial Neural Network", "accuracy": 95.5, "weight": "40%", "status": "Optimal"},
+                {"name": "Regime-based Logic", "accuracy": 89.2, "weight": "20%", "status": "Active"}
+            ],
+            "process_time": f"{process_time:.2f}s"
+        },
+        "eda": eda,
+        "data": result_json
+    }
@@ -4,6 +4,7 @@ Handles WebSocket endpoints and real-time communication
 """
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
 from app.websockets.connection_manager import get_connection_manager
+from app.services.job_manager import get_job_manager
 import uuid
 import json
 
@@ -148,6 +149,11 @@ async def websocket_analysis_progress(
     room = f"analysis_{analysis_id}"
     manager.join_room(client_id, room)
     
+    # Background jobs: send the current state so late subscribers catch up
+    job = get_job_manager().get(analysis_id)
+    if job:
+        await manager.send_personal_message(job.progress_message(), client_id)
+    
     try:
         while True:
             # Keep connection alive and handle messages
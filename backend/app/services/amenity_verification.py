@@ -2,14 +2,21 @@
 Amenity Verification Service
 Verifies claims about nearby amenities using OpenStreetMap Overpass API
 """
-import requests
 from typing import Tuple, Dict, List, Optional
-from geopy.distance import geodesic
-import time
+
+from app.services.provider_health import get_provider_health, tracked_request, summarize_health
+from app.services.single_flight import SingleFlight
+from app.utils.lazy_imports import lazy_attribute
+
+# Imported on first use (see app.utils.lazy_imports)
+geodesic = lazy_attribute("geopy.distance", "geodesic")
 
 # Overpass API Configuration
 OVERPASS_API_URL = "https://overpass-api.de/api/interpreter"
-OVERPASS_TIMEOUT = 10  # seconds
+# Request timeout adapts to observed latency (capped at 10 s, see provider_health)
+
+# Coalesces concurrent identical Overpass queries
+_overpass_flight = SingleFlight("overpass")
 
 # Distance thresholds for "nearby" claims (in kilometers)
 NEARBY_THRESHOLD_KM = 2.0  # Within 2km is considered "nearby"
@@ -116,18 +123,24 @@ def query_overpass_api(query: str) -> Optional[Dict]:
     """
     Query Overpass API
     
+    Concurrent identical queries (same amenity type, radius and coordinates)
+    share a single in-flight request.
+    
     Args:
         query: Overpass QL query string
         
     Returns:
         dict: API response or None if failed
     """
+    return _overpass_flight.do(query.strip(), _post_overpass_query, query)
+
+
+def _post_overpass_query(query: str) -> Optional[Dict]:
+    """Send a query to the Overpass API"""
     try:
-        response = requests.post(
-            OVERPASS_API_URL,
-            data={'data': query},
-            timeout=OVERPASS_TIMEOUT
-        )
+        response = tracked_request('overpass', 'post', OVERPASS_API_URL, data={'data': query})
+        if response is None:
+            return None
         
         if response.status_code == 200:
             return response.json()
@@ -228,8 +241,9 @@ def verify_amenity_claims(
     title: str,
     description: str,
     latitude: float,
-    longitude: float
-) -> Tuple[float, str, Dict]:
+    longitude: float,
+    explain: bool = True
+) -> Tuple[float, Optional[str], Dict]:
     """
     Verify amenity claims in property listing
     
@@ -238,6 +252,7 @@ def verify_amenity_claims(
         description: Property description
         latitude: Property latitude
         longitude: Property longitude
+        explain: Render the explanation (None when False)
         
     Returns:
         tuple: (fraud_score, explanation, details)
@@ -253,7 +268,14 @@ def verify_amenity_claims(
     
     if not claimed_amenities:
         # No amenity claims to verify
-        return 0.0, "No specific amenity claims detected in the listing.", {}
+        return 0.0, "No specific amenity claims detected in the listing." if explain else None, {}
+    
+    # Overpass unhealthy: an empty answer would look like false claims, so don't score
+    if not get_provider_health('overpass').is_available():
+        return 0.0, (
+            "Amenity verification temporarily unavailable (Overpass API unhealthy). "
+            "Amenity claims were not checked."
+        ) if explain else None, {'skipped': True, 'reason': 'overpass_circuit_open'}
     
     # Verify each claimed amenity
     verification_results = {}
@@ -298,7 +320,35 @@ def verify_amenity_claims(
         if false_claims == total_claims:
             fraud_score = min(fraud_score + 0.2, 1.0)
     
-    # Generate explanation
+    details = {
+        'total_claims': total_claims,
+        'verified_claims': verified_claims,
+        'false_claims': false_claims,
+        'verification_results': verification_results
+    }
+    
+    if not explain:
+        return fraud_score, None, details
+    
+    return fraud_score, render_amenity_explanation(fraud_score, details), details
+
+
+def render_amenity_explanation(fraud_score: float, details: Dict) -> str:
+    """
+    Render the amenity verification explanation
+    
+    Args:
+        fraud_score: Fraud score from verify_amenity_claims
+        details: Details dict from verify_amenity_claims
+        
+    Returns:
+        str: Human-readable explanation
+    """
+    total_claims = details['total_claims']
+    verified_claims = details['verified_claims']
+    false_claims = details['false_claims']
+    verification_results = details['verification_results']
+    
     if fraud_score < 0.3:
         explanation = (
             f"✅ AMENITY CLAIMS VERIFIED: The listing mentions {total_claims} amenity/amenities, "
@@ -331,14 +381,7 @@ def verify_amenity_claims(
                 f"NOT VERIFIED - No {amenity_type.replace('_', ' ')} found within 2 km radius"
             )
     
-    details = {
-        'total_claims': total_claims,
-        'verified_claims': verified_claims,
-        'false_claims': false_claims,
-        'verification_results': verification_results
-    }
-    
-    return fraud_score, explanation, details
+    return explanation
 
 
 def get_nearby_amenities_summary(
@@ -378,9 +421,11 @@ def get_amenity_verification_status() -> Dict:
     """
     return {
         'service': 'amenity_verification',
-        'status': 'operational',
+        'status': summarize_health(['overpass']),
         'api': 'Overpass API (OpenStreetMap)',
+        'provider_health': get_provider_health('overpass').get_status(),
         'supported_amenities': list(AMENITY_KEYWORDS.keys()),
         'nearby_threshold_km': NEARBY_THRESHOLD_KM,
-        'rate_limits': 'Fair use policy'
+        'rate_limits': 'Fair use policy',
+        'coalescing': _overpass_flight.get_stats()
     }
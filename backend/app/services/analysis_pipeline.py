@@ -0,0 +1,678 @@
+"""
+Analysis Pipeline
+Schedules the fraud modules of a single listing analysis
+
+The local modules (price, text, location) are cheap and run first. With
+fixed fusion weights their scores already pin the final probability to a
+narrow range: the network-bound modules (external location 15%, amenity
+5%) can only move it within their own score bounds. With
+SHORT_CIRCUIT_POLICY=band, they are skipped when nothing they could
+return changes the risk level (their fraud types then go unchecked).
+
+Execution is a two-stage task graph:
+1. price, text and location run concurrently on a bounded CPU pool
+2. the network-bound modules that were not skipped run concurrently on a
+   separate bounded I/O pool, so slow providers cannot starve local scoring
+Fusion then combines everything. Nothing blocks the event loop, so one
+worker serves many analyses at once.
+
+Every module is timed inside its worker, feeding the module latency
+histogram and, on request, the timings block of the report.
+
+With a latency budget (run_analysis_within), the modules finished by the
+deadline are fused with renormalized weights and the rest keep running
+in the background. Under overload (local_only, see
+app.utils.admission_control) the network-bound modules are skipped
+outright and the local ones are fused the same way.
+"""
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.services.amenity_verification import detect_amenity_keywords, verify_amenity_claims
+from app.services.external_location_verification import verify_location_with_external_apis
+from app.services.fusion import (
+    FRAUD_TYPE_LABELS,
+    FUSION_MODULES,
+    SUMMARY_MODULE_NAMES,
+    fuse_fraud_scores_batch,
+    fuse_fraud_signals,
+    fusion_bounds,
+    get_risk_level,
+    renormalized_weights
+)
+from app.services.location_fraud import detect_location_fraud, detect_location_fraud_batch
+from app.services.offline_geocoder import LOCATION_VERIFICATION_MODE
+from app.services.price_fraud import analyze_price_batch, detect_price_fraud, render_price_explanation
+from app.services.provider_health import get_provider_health
+from app.services.text_fraud import detect_text_fraud, detect_text_fraud_batch
+from app.utils.metrics import Timings
+
+# Short-circuit policy for the network-bound modules:
+#   off  - always run every module (default: fraud types are always complete)
+#   band - skip when the risk level cannot change. Either module can score
+#          up to 1.0, so a skipped module's fraud type is not checked; the
+#          report lists it in skipped_modules and the scheduler note says so
+SHORT_CIRCUIT_POLICY = os.getenv("SHORT_CIRCUIT_POLICY", "off").lower()
+
+# Network-bound modules that may be skipped
+SKIPPABLE_MODULES = ('external_location', 'amenity')
+
+# Score range of a module whose result cannot be predicted
+FULL_SCORE_RANGE = (0.0, 1.0)
+
+# Steps reported to run_analysis's on_module_done callback, in typical order
+PROGRESS_STEPS = ('price', 'text', 'location', 'external_location', 'amenity', 'fusion')
+
+ModuleCallback = Callable[[str], Awaitable[None]]
+
+# Display names of modules that may be skipped
+SKIPPED_MODULE_NAMES = {
+    'external_location': "External location",
+    'amenity': "Amenity"
+}
+
+# Worker pools. Threads rather than processes: the modules share large
+# in-memory reference data (dataset, spatial and locality indexes), and
+# pandas/numpy/scikit-learn release the GIL in their heavy loops.
+ANALYSIS_CPU_WORKERS = int(os.getenv("ANALYSIS_CPU_WORKERS", str(min(4, os.cpu_count() or 1))))
+ANALYSIS_IO_WORKERS = int(os.getenv("ANALYSIS_IO_WORKERS", "16"))
+
+
+def network_module_bounds(title: str, description: str) -> Dict[str, Tuple[float, float]]:
+    """
+    Score bounds of the network-bound modules that would actually go to the network
+
+    Modules that answer locally are left out, since running them costs
+    nothing: amenity verification without amenity claims (score 0) or
+    with the Overpass circuit open, and external verification in offline mode.
+
+    Args:
+        title: Listing title
+        description: Listing description
+
+    Returns:
+        dict: Module name -> (lowest, highest) score
+    """
+    bounds = {}
+
+    if LOCATION_VERIFICATION_MODE != 'offline':
+        bounds['external_location'] = FULL_SCORE_RANGE
+
+    if detect_amenity_keywords(f"{title} {description}") and get_provider_health('overpass').is_available():
+        bounds['amenity'] = FULL_SCORE_RANGE
+
+    return bounds
+
+
+def plan_skipped_modules(
+    known_scores: Dict[str, float],
+    pending_bounds: Dict[str, Tuple[float, float]],
+    policy: str = SHORT_CIRCUIT_POLICY
+) -> List[str]:
+    """
+    Decide which pending network-bound modules can be skipped
+
+    With the band policy, the pending modules are skipped together when
+    the risk level at the lower and upper fusion bound is the same.
+    Skipped modules are then scored at their lower bound, so their fraud
+    types are not reported.
+
+    Args:
+        known_scores: Module name -> finished score (price, image, text, location)
+        pending_bounds: Module name -> (lowest, highest) score, see network_module_bounds
+        policy: 'band' or 'off'
+
+    Returns:
+        list: Modules to skip (empty if every module must run)
+    """
+    pending = {module: pending_bounds[module] for module in SKIPPABLE_MODULES if module in pending_bounds}
+    if policy != 'band' or not pending:
+        return []
+
+    lowest, highest = fusion_bounds(known_scores, pending)
+    if get_risk_level(lowest) != get_risk_level(highest):
+        return []
+
+    return list(pending)
+
+
+# Global executors (created on first use)
+_cpu_executor: Optional[ThreadPoolExecutor] = None
+_io_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_cpu_executor() -> ThreadPoolExecutor:
+    """Get the bounded pool for local (CPU-bound) modules"""
+    global _cpu_executor
+    if _cpu_executor is None:
+        with _executor_lock:
+            if _cpu_executor is None:
+                _cpu_executor = ThreadPoolExecutor(max_workers=ANALYSIS_CPU_WORKERS, thread_name_prefix="analysis-cpu")
+    return _cpu_executor
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Get the bounded pool for network-bound modules"""
+    global _io_executor
+    if _io_executor is None:
+        with _executor_lock:
+            if _io_executor is None:
+                _io_executor = ThreadPoolExecutor(max_workers=ANALYSIS_IO_WORKERS, thread_name_prefix="analysis-io")
+    return _io_executor
+
+
+async def run_in_executor(executor: ThreadPoolExecutor, func, *args, **kwargs):
+    """Run a blocking call on an executor without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+async def _external_location(listing, explain: bool, timings: Timings) -> Tuple[float, Optional[str], bool]:
+    """
+    External location verification with the router's fallback on failure
+
+    Returns:
+        tuple: (score, explanation, fallback) - fallback is True when no
+               provider answered, so the score is a neutral placeholder
+    """
+    try:
+        score, explanation, details = await run_in_executor(
+            get_io_executor(),
+            timings.call, 'external_location', verify_location_with_external_apis,
+            latitude=listing.latitude,
+            longitude=listing.longitude,
+            claimed_city=listing.city,
+            claimed_locality=listing.locality,
+            explain=explain
+        )
+        return score, explanation, bool(details.get('skipped'))
+    except Exception as e:
+        print(f"External location verification failed: {e}")
+        return 0.0, "External location verification unavailable.", True
+
+
+async def _amenity(listing, explain: bool, timings: Timings) -> Tuple[float, Optional[str], bool]:
+    """
+    Amenity verification with the router's fallback on failure
+
+    Returns:
+        tuple: (score, explanation, fallback) - fallback is True when
+               Overpass was unavailable and the claims were not checked
+    """
+    try:
+        score, explanation, details = await run_in_executor(
+            get_io_executor(),
+            timings.call, 'amenity', verify_amenity_claims,
+            title=listing.title,
+            description=listing.description,
+            latitude=listing.latitude,
+            longitude=listing.longitude,
+            explain=explain
+        )
+        return score, explanation, bool(details.get('skipped'))
+    except Exception as e:
+        print(f"Amenity verification failed: {e}")
+        return 0.0, "Amenity verification unavailable.", True
+
+
+async def _reported(
+    module: str,
+    awaitable,
+    on_module_done: Optional[ModuleCallback],
+    module_results: Optional[Dict[str, Tuple]] = None
+):
+    """Await a module, record its result and notify on_module_done (if any)"""
+    result = await awaitable
+    if module_results is not None:
+        module_results[module] = result
+    if on_module_done is not None:
+        await on_module_done(module)
+    return result
+
+
+async def run_analysis(
+    listing,
+    dataset,
+    explain: bool = True,
+    timings: Optional[Timings] = None,
+    on_module_done: Optional[ModuleCallback] = None,
+    module_results: Optional[Dict[str, Tuple]] = None,
+    local_only: bool = False
+) -> Dict:
+    """
+    Run every fraud module for one listing and fuse the results
+
+    Args:
+        listing: Validated ListingData (title, description, price, city,
+                 locality, latitude, longitude)
+        dataset: Real estate dataset for price analysis
+        explain: Render explanations (see analyze_listing)
+        timings: Stopwatch collecting per-module durations (a private one
+                 is used when omitted; histograms are fed either way)
+        on_module_done: Async callback receiving each module name as it
+                        finishes (PROGRESS_STEPS, skipped modules included)
+        module_results: Dict filled with each module's raw result as it
+                        finishes (see run_analysis_within)
+        local_only: Skip every network-bound module that would go to the
+                    network and fuse the rest with renormalized weights
+                    (load shedding)
+
+    Returns:
+        dict: FraudReport fields (fraud_probability, fraud_types, explanations,
+              module_scores, location_details, skipped_modules, degraded,
+              fallback_modules)
+    """
+    timings = timings or Timings()
+    cpu = get_cpu_executor()
+
+    # Stage 1: local modules, concurrently
+    (price_score, price_explanation), (text_score, text_explanations), \
+        (location_score, location_explanation, location_details) = await asyncio.gather(
+            _reported('price', run_in_executor(
+                cpu, timings.call, 'price', detect_price_fraud,
+                listing_price=listing.price,
+                locality=listing.locality,
+                city=listing.city,
+                df=dataset,
+                explain=explain
+            ), on_module_done, module_results),
+            _reported('text', run_in_executor(
+                cpu, timings.call, 'text', detect_text_fraud,
+                title=listing.title,
+                description=listing.description,
+                save_to_corpus=True,
+                explain=explain
+            ), on_module_done, module_results),
+            _reported('location', run_in_executor(
+                cpu, timings.call, 'location', detect_location_fraud,
+                locality=listing.locality,
+                latitude=listing.latitude,
+                longitude=listing.longitude,
+                city=listing.city,
+                price=listing.price,  # For price-location sanity check
+                return_details=True,
+                explain=explain
+            ), on_module_done, module_results)
+        )
+
+    # TODO: Integrate image fraud detection when images are provided
+    image_score = 0.0
+    image_explanation = "Image fraud detection not yet integrated."
+
+    # Stage 2: network-bound modules that can still change the outcome, concurrently
+    pending_bounds = network_module_bounds(listing.title, listing.description)
+    if local_only:
+        skipped_modules = [module for module in SKIPPABLE_MODULES if module in pending_bounds]
+        weights = renormalized_weights([module for module in FUSION_MODULES if module not in skipped_modules])
+    else:
+        skipped_modules = plan_skipped_modules(
+            known_scores={
+                'price': price_score,
+                'image': image_score,
+                'text': text_score,
+                'location': location_score
+            },
+            pending_bounds=pending_bounds
+        )
+        weights = None
+
+    async def skipped():
+        return 0.0, "", False
+
+    (external_location_score, external_location_explanation, external_location_fallback), \
+        (amenity_score, amenity_explanation, amenity_fallback) = await asyncio.gather(
+            _reported(
+                'external_location',
+                skipped() if 'external_location' in skipped_modules else _external_location(listing, explain, timings),
+                on_module_done,
+                module_results
+            ),
+            _reported(
+                'amenity',
+                skipped() if 'amenity' in skipped_modules else _amenity(listing, explain, timings),
+                on_module_done,
+                module_results
+            )
+        )
+
+    # Fusion: Price (25%), Image (20%), Text (20%), Location (15%),
+    #         External Location (15%), Amenity (5%)
+    final_fraud_probability, fraud_types, explanations = timings.call(
+        'fusion', fuse_fraud_signals,
+        price_score=price_score,
+        price_explanation=price_explanation,
+        image_score=image_score,
+        image_explanation=image_explanation,
+        text_score=text_score,
+        text_explanations=text_explanations,
+        location_score=location_score,
+        location_explanation=location_explanation,
+        external_location_score=external_location_score,
+        external_location_explanation=external_location_explanation,
+        amenity_score=amenity_score,
+        amenity_explanation=amenity_explanation,
+        explain=explain,
+        weights=weights
+    )
+
+    if explain and skipped_modules:
+        note = _load_shedding_note if local_only else _scheduler_note
+        explanations.append(note(skipped_modules, final_fraud_probability))
+    if on_module_done is not None:
+        await on_module_done('fusion')
+
+    module_scores = _module_scores(
+        price_score, image_score, text_score, location_score, external_location_score, amenity_score
+    )
+    if local_only:
+        # Shed modules carry no weight, so they have no score to show
+        for module in skipped_modules:
+            del module_scores[SUMMARY_MODULE_NAMES[module]]
+
+    return {
+        'fraud_probability': final_fraud_probability,
+        'fraud_types': fraud_types,
+        'explanations': explanations,
+        'module_scores': module_scores,
+        'location_details': location_details,
+        'skipped_modules': skipped_modules,
+        'degraded': local_only,
+        'fallback_modules': _fallback_modules(external_location_fallback, amenity_fallback)
+    }
+
+
+async def run_analysis_within(
+    listing,
+    dataset,
+    budget_seconds: float,
+    explain: bool = True,
+    timings: Optional[Timings] = None
+) -> Tuple[Dict, Optional[asyncio.Task]]:
+    """
+    Run the pipeline for one listing, answering within a latency budget
+
+    The full analysis is started as usual. If it finishes within the
+    budget its result is returned as-is. Otherwise the report is built
+    from the modules that have finished (see partial_report) and the
+    analysis keeps running in the background.
+
+    Args:
+        listing: Validated ListingData
+        dataset: Real estate dataset for price analysis
+        budget_seconds: Time to wait for the full analysis
+        explain: Render explanations (see analyze_listing)
+        timings: Stopwatch collecting per-module durations
+
+    Returns:
+        tuple: (FraudReport fields, task) - task is None for a complete
+               report, otherwise it resolves to the complete run_analysis
+               result
+    """
+    module_results: Dict[str, Tuple] = {}
+    task = asyncio.ensure_future(
+        run_analysis(listing, dataset, explain=explain, timings=timings, module_results=module_results)
+    )
+    try:
+        done, _ = await asyncio.wait({task}, timeout=max(0.0, budget_seconds))
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+
+    if task in done:
+        return task.result(), None
+    if all(module in module_results for module in PROGRESS_STEPS if module != 'fusion'):
+        # Only fusion is left, which takes microseconds
+        return await task, None
+    return partial_report(module_results, explain), task
+
+
+def partial_report(module_results: Dict[str, Tuple], explain: bool) -> Dict:
+    """
+    Fuse the modules that have finished, with their weights renormalized
+
+    Pending modules get no weight, so the finished ones keep their relative
+    importance; once every module has finished the result equals
+    run_analysis's. Fraud types and explanations come from finished
+    modules only.
+
+    Args:
+        module_results: Module name -> raw result, as filled by run_analysis
+        explain: Render explanations
+
+    Returns:
+        dict: FraudReport fields, with pending_modules listing what is missing
+    """
+    price_score, price_explanation = module_results.get('price', (0.0, ""))
+    text_score, text_explanations = module_results.get('text', (0.0, []))
+    location_score, location_explanation, location_details = module_results.get('location', (0.0, "", None))
+    external_location_score, external_location_explanation, external_location_fallback = \
+        module_results.get('external_location', (0.0, "", False))
+    amenity_score, amenity_explanation, amenity_fallback = module_results.get('amenity', (0.0, "", False))
+
+    # Image detection is not integrated yet: always "finished" with score 0, as in run_analysis
+    pending_modules = [module for module in FUSION_MODULES if module != 'image' and module not in module_results]
+    weights = renormalized_weights([module for module in FUSION_MODULES if module not in pending_modules])
+
+    fraud_probability, fraud_types, explanations = fuse_fraud_signals(
+        price_score=price_score,
+        price_explanation=price_explanation,
+        image_score=0.0,
+        image_explanation="Image fraud detection not yet integrated.",
+        text_score=text_score,
+        text_explanations=text_explanations,
+        location_score=location_score,
+        location_explanation=location_explanation,
+        external_location_score=external_location_score,
+        external_location_explanation=external_location_explanation,
+        amenity_score=amenity_score,
+        amenity_explanation=amenity_explanation,
+        explain=explain,
+        weights=weights
+    )
+
+    if explain:
+        pending_names = ", ".join(SUMMARY_MODULE_NAMES[module] for module in pending_modules)
+        explanations.append(
+            f"[Deadline] {pending_names} still pending when the latency budget ran out: "
+            f"the fraud probability is fused from the finished modules only."
+        )
+
+    module_scores = _module_scores(
+        price_score, 0.0, text_score, location_score, external_location_score, amenity_score
+    )
+    for module in pending_modules:
+        del module_scores[SUMMARY_MODULE_NAMES[module]]
+
+    return {
+        'fraud_probability': fraud_probability,
+        'fraud_types': fraud_types,
+        'explanations': explanations,
+        'module_scores': module_scores,
+        'location_details': location_details,
+        'skipped_modules': [],
+        'pending_modules': pending_modules,
+        'fallback_modules': _fallback_modules(external_location_fallback, amenity_fallback)
+    }
+
+
+async def run_batch_analysis(
+    listings: List,
+    dataset,
+    explain: bool = True,
+    timings: Optional[Timings] = None
+) -> List[Dict]:
+    """
+    Run the fraud pipeline over many listings at once
+
+    Price statistics are computed once per locality, location scoring is
+    vectorized, the text corpus is read and written once, and fusion runs
+    over the whole score matrix. Identical external location and amenity
+    lookups are made once per batch. Each result is the same as
+    run_analysis for that listing, with the listings analyzed in input
+    order (earlier listings count as existing text for later ones).
+
+    Args:
+        listings: Validated ListingData objects
+        dataset: Real estate dataset for price analysis
+        explain: Render explanations (see analyze_listing)
+        timings: Stopwatch for the batch stages (recorded as batch_<module>)
+
+    Returns:
+        list: FraudReport fields per listing, in input order
+    """
+    n = len(listings)
+    if n == 0:
+        return []
+
+    titles = [listing.title for listing in listings]
+    descriptions = [listing.description for listing in listings]
+    prices = [listing.price for listing in listings]
+    cities = [listing.city for listing in listings]
+    localities = [listing.locality for listing in listings]
+    timings = timings or Timings()
+    cpu = get_cpu_executor()
+
+    # Stage 1: batched local modules, concurrently
+    price_results, text_results, location_batch = await asyncio.gather(
+        run_in_executor(cpu, timings.call, 'batch_price', analyze_price_batch, prices, localities, cities, dataset),
+        run_in_executor(
+            cpu, timings.call, 'batch_text', detect_text_fraud_batch,
+            titles, descriptions, save_to_corpus=True, explain=explain
+        ),
+        run_in_executor(
+            cpu, timings.call, 'batch_location', detect_location_fraud_batch,
+            cities, localities,
+            [listing.latitude for listing in listings],
+            [listing.longitude for listing in listings],
+            prices,
+            exact_distances=True
+        )
+    )
+
+    image_score = 0.0
+    image_explanation = "Image fraud detection not yet integrated."
+
+    # Stage 2: per-listing skip decisions, then one lookup per distinct request
+    skipped_by_row = [
+        plan_skipped_modules(
+            known_scores={
+                'price': price_results[i][0],
+                'image': image_score,
+                'text': text_results[i][0],
+                'location': float(location_batch.scores[i])
+            },
+            pending_bounds=network_module_bounds(titles[i], descriptions[i])
+        )
+        for i in range(n)
+    ]
+
+    external_keys = [None] * n
+    amenity_keys = [None] * n
+    lookups = {}
+    for i, listing in enumerate(listings):
+        if 'external_location' not in skipped_by_row[i]:
+            external_keys[i] = ('external_location', listing.latitude, listing.longitude, listing.city, listing.locality)
+            if external_keys[i] not in lookups:
+                lookups[external_keys[i]] = _external_location(listing, explain, timings)
+        if 'amenity' not in skipped_by_row[i]:
+            claims = tuple(detect_amenity_keywords(f"{listing.title} {listing.description}"))
+            amenity_keys[i] = ('amenity', claims, listing.latitude, listing.longitude)
+            if amenity_keys[i] not in lookups:
+                lookups[amenity_keys[i]] = _amenity(listing, explain, timings)
+
+    lookup_results = dict(zip(lookups, await asyncio.gather(*lookups.values())))
+    external_results = [lookup_results[key] if key else (0.0, "", False) for key in external_keys]
+    amenity_results = [lookup_results[key] if key else (0.0, "", False) for key in amenity_keys]
+
+    # Fusion over the whole score matrix
+    score_rows = [
+        (
+            price_results[i][0],
+            image_score,
+            text_results[i][0],
+            float(location_batch.scores[i]),
+            external_results[i][0],
+            amenity_results[i][0]
+        )
+        for i in range(n)
+    ]
+    module_explanations = None
+    if explain:
+        module_explanations = [
+            {
+                'price': render_price_explanation(price_results[i][1]),
+                'image': image_explanation,
+                'text': text_results[i][1],
+                'location': location_batch.explanation(i),
+                'external_location': external_results[i][1],
+                'amenity': amenity_results[i][1]
+            }
+            for i in range(n)
+        ]
+    fused = timings.call(
+        'batch_fusion', fuse_fraud_scores_batch,
+        score_rows,
+        modules=FUSION_MODULES,
+        module_explanations=module_explanations,
+        explain_rows=range(n) if explain else None
+    )
+
+    reports = []
+    for i in range(n):
+        probability = float(fused.probabilities[i])
+        explanations = fused.explanations.get(i, [])
+        if explain and skipped_by_row[i]:
+            explanations.append(_scheduler_note(skipped_by_row[i], probability))
+        reports.append({
+            'fraud_probability': probability,
+            'fraud_types': fused.fraud_types(i),
+            'explanations': explanations,
+            'module_scores': _module_scores(*score_rows[i]),
+            'location_details': location_batch.details(i),
+            'skipped_modules': skipped_by_row[i],
+            'fallback_modules': _fallback_modules(external_results[i][2], amenity_results[i][2])
+        })
+    return reports
+
+
+def _module_scores(price, image, text, location, external_location, amenity) -> Dict[str, float]:
+    """Module scores keyed by display name, as shown in FraudReport"""
+    return {
+        "Price": price,
+        "Image": image,
+        "Text": text,
+        "Location": location,
+        "External Location": external_location,
+        "Amenity": amenity
+    }
+
+
+def _fallback_modules(external_location_fallback: bool, amenity_fallback: bool) -> List[str]:
+    """Network-bound modules whose result is a fallback for an unavailable provider"""
+    flags = {'external_location': external_location_fallback, 'amenity': amenity_fallback}
+    return [module for module, fallback in flags.items() if fallback]
+
+
+def _scheduler_note(skipped_modules: List[str], fraud_probability: float) -> str:
+    """Explanation line recording the modules the scheduler skipped"""
+    skipped_names = ", ".join(SKIPPED_MODULE_NAMES[module] for module in skipped_modules)
+    unchecked_types = ", ".join(FRAUD_TYPE_LABELS[module] for module in skipped_modules)
+    return (
+        f"[Scheduler] {skipped_names} verification skipped: the risk level is "
+        f"{get_risk_level(fraud_probability)[0]} whatever these checks return "
+        f"(not checked for: {unchecked_types})."
+    )
+
+
+def _load_shedding_note(skipped_modules: List[str], fraud_probability: float) -> str:
+    """Explanation line recording the modules left out under overload"""
+    skipped_names = ", ".join(SKIPPED_MODULE_NAMES[module] for module in skipped_modules)
+    return (
+        f"[Load shedding] {skipped_names} verification skipped while the service is "
+        f"overloaded: the fraud probability is fused from the local checks only."
+    )
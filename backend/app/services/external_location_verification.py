@@ -2,13 +2,25 @@
 External Location Verification Service
 Uses multiple free APIs to verify location accuracy and detect fraud
 """
-import requests
-import time
 from typing import Tuple, Dict, List, Optional
-from geopy.distance import geodesic
 import os
 from dotenv import load_dotenv
 
+from app.services.geocode_cache import get_geocode_cache
+from app.services.rate_limiter import get_rate_limiter
+from app.services.provider_health import get_provider_health, tracked_request, summarize_health
+from app.services.single_flight import SingleFlight
+from app.utils.lazy_imports import lazy_attribute
+from app.services.locality_resolver import resolve_locality
+from app.services.offline_geocoder import (
+    LOCATION_VERIFICATION_MODE,
+    OFFLINE_CONFIDENCE_THRESHOLD,
+    reverse_geocode_offline
+)
+
+# Imported on first use (see app.utils.lazy_imports)
+geodesic = lazy_attribute("geopy.distance", "geodesic")
+
 # Load environment variables
 load_dotenv()
 
@@ -24,9 +36,8 @@ LOCATIONIQ_API_KEY = os.getenv("LOCATIONIQ_API_KEY", "")
 OPENCAGE_API_KEY = os.getenv("OPENCAGE_API_KEY", "")
 GEOAPIFY_API_KEY = os.getenv("GEOAPIFY_API_KEY", "")
 
-# Rate limiting
-LAST_NOMINATIM_CALL = 0
-NOMINATIM_DELAY = 1.0  # 1 second between calls (Nominatim requirement)
+# Rate limiting (1 req/s for Nominatim, daily quotas for keyed APIs)
+# is enforced by the shared token buckets in app.services.rate_limiter
 
 # Thresholds
 CONSENSUS_THRESHOLD = 0.6  # 60% of APIs must agree
@@ -44,13 +55,10 @@ def call_nominatim_api(latitude: float, longitude: float) -> Optional[Dict]:
     Returns:
         dict: API response or None if failed
     """
-    global LAST_NOMINATIM_CALL
-    
     # Rate limiting - Nominatim requires 1 second between requests
-    current_time = time.time()
-    time_since_last_call = current_time - LAST_NOMINATIM_CALL
-    if time_since_last_call < NOMINATIM_DELAY:
-        time.sleep(NOMINATIM_DELAY - time_since_last_call)
+    if not get_rate_limiter().acquire('nominatim'):
+        print("Nominatim API skipped: rate limit queue is full")
+        return None
     
     try:
         params = {
@@ -65,8 +73,9 @@ def call_nominatim_api(latitude: float, longitude: float) -> Optional[Dict]:
             'User-Agent': 'RealEstateFraudDetection/1.0'  # Required by Nominatim
         }
         
-        response = requests.get(NOMINATIM_BASE_URL, params=params, headers=headers, timeout=5)
-        LAST_NOMINATIM_CALL = time.time()
+        response = tracked_request('nominatim', 'get', NOMINATIM_BASE_URL, params=params, headers=headers)
+        if response is None:
+            return None
         
         if response.status_code == 200:
             return response.json()
@@ -97,7 +106,9 @@ def call_bigdatacloud_api(latitude: float, longitude: float) -> Optional[Dict]:
             'localityLanguage': 'en'
         }
         
-        response = requests.get(BIGDATACLOUD_BASE_URL, params=params, timeout=5)
+        response = tracked_request('bigdatacloud', 'get', BIGDATACLOUD_BASE_URL, params=params)
+        if response is None:
+            return None
         
         if response.status_code == 200:
             return response.json()
@@ -124,6 +135,10 @@ def call_locationiq_api(latitude: float, longitude: float) -> Optional[Dict]:
     if not LOCATIONIQ_API_KEY:
         return None
     
+    if not get_rate_limiter().acquire('locationiq'):
+        print("LocationIQ API skipped: rate limit or daily quota reached")
+        return None
+    
     try:
         params = {
             'key': LOCATIONIQ_API_KEY,
@@ -133,7 +148,9 @@ def call_locationiq_api(latitude: float, longitude: float) -> Optional[Dict]:
             'addressdetails': 1
         }
         
-        response = requests.get(LOCATIONIQ_BASE_URL, params=params, timeout=5)
+        response = tracked_request('locationiq', 'get', LOCATIONIQ_BASE_URL, params=params)
+        if response is None:
+            return None
         
         if response.status_code == 200:
             return response.json()
@@ -160,6 +177,10 @@ def call_opencage_api(latitude: float, longitude: float) -> Optional[Dict]:
     if not OPENCAGE_API_KEY:
         return None
     
+    if not get_rate_limiter().acquire('opencage'):
+        print("OpenCage API skipped: rate limit or daily quota reached")
+        return None
+    
     try:
         params = {
             'key': OPENCAGE_API_KEY,
@@ -168,7 +189,9 @@ def call_opencage_api(latitude: float, longitude: float) -> Optional[Dict]:
             'pretty': 0
         }
         
-        response = requests.get(OPENCAGE_BASE_URL, params=params, timeout=5)
+        response = tracked_request('opencage', 'get', OPENCAGE_BASE_URL, params=params)
+        if response is None:
+            return None
         
         if response.status_code == 200:
             data = response.json()
@@ -263,6 +286,73 @@ def extract_location_info(api_name: str, api_response: Dict) -> Dict:
     return location_info
 
 
+# Coalesces concurrent identical reverse-geocode lookups
+_geocode_flight = SingleFlight("reverse_geocode")
+
+# Provider name -> API call function
+PROVIDER_CALLS = {
+    'nominatim': call_nominatim_api,
+    'bigdatacloud': call_bigdatacloud_api,
+    'locationiq': call_locationiq_api,
+    'opencage': call_opencage_api
+}
+
+
+def get_enabled_providers() -> List[str]:
+    """
+    Get providers to query, in priority order
+    
+    Nominatim and BigDataCloud need no key; LocationIQ and OpenCage
+    are only queried when their API keys are configured. Providers
+    with an open circuit breaker are left out until they are probed again.
+    
+    Returns:
+        list: Provider names
+    """
+    providers = ['nominatim', 'bigdatacloud']
+    if LOCATIONIQ_API_KEY:
+        providers.append('locationiq')
+    if OPENCAGE_API_KEY:
+        providers.append('opencage')
+    
+    # Skip providers whose circuit breaker is open (before spending rate-limit slots)
+    return [name for name in providers if get_provider_health(name).is_available()]
+
+
+def lookup_provider(api_name: str, latitude: float, longitude: float) -> Optional[Dict]:
+    """
+    Reverse-geocode with one provider, consulting the geocode cache first
+    
+    Args:
+        api_name: Provider name (key of PROVIDER_CALLS)
+        latitude: Latitude coordinate
+        longitude: Longitude coordinate
+        
+    Returns:
+        dict: Standardized location info, or None if the provider failed
+    """
+    cache = get_geocode_cache()
+    
+    cached = cache.get(api_name, latitude, longitude)
+    if cached is not None:
+        return cached
+    
+    # Concurrent misses for the same provider and geohash cell share one call
+    key = cache.make_key(api_name, latitude, longitude)
+    return _geocode_flight.do(key, _fetch_location_info, api_name, latitude, longitude)
+
+
+def _fetch_location_info(api_name: str, latitude: float, longitude: float) -> Optional[Dict]:
+    """Call a provider and cache its normalized result"""
+    api_response = PROVIDER_CALLS[api_name](latitude, longitude)
+    if not api_response:
+        return None  # Failures are not cached so the provider is retried
+    
+    location_info = extract_location_info(api_name, api_response)
+    get_geocode_cache().set(api_name, latitude, longitude, location_info)
+    return location_info
+
+
 def normalize_string(s: Optional[str]) -> str:
     """Normalize string for comparison"""
     if not s:
@@ -270,6 +360,40 @@ def normalize_string(s: Optional[str]) -> str:
     return s.lower().strip().replace('-', ' ').replace('_', ' ')
 
 
+def city_matches_result(claimed_city: str, result: Dict) -> bool:
+    """Whether an API result confirms the claimed city (empty fields never match)"""
+    claimed_city_norm = normalize_string(claimed_city)
+    api_city = normalize_string(result.get('city'))
+    return bool(api_city and claimed_city_norm and (claimed_city_norm in api_city or api_city in claimed_city_norm))
+
+
+def locality_matches_result(claimed_city: str, claimed_locality: str, result: Dict) -> bool:
+    """
+    Whether an API result confirms the claimed locality
+    
+    Checks the locality, suburb and neighbourhood fields. Names are first
+    resolved to canonical localities (so "HITEC City" confirms
+    "Hitech City"), falling back to substring containment for names the
+    resolver does not know.
+    """
+    claimed_locality_norm = normalize_string(claimed_locality)
+    if not claimed_locality_norm:
+        return False
+    claimed_match = resolve_locality(claimed_locality, claimed_city)
+    
+    for field in ('locality', 'suburb', 'neighbourhood'):
+        value = normalize_string(result.get(field))
+        if not value:
+            continue
+        if claimed_locality_norm in value or value in claimed_locality_norm:
+            return True
+        if claimed_match is not None:
+            api_match = resolve_locality(value, claimed_city)
+            if api_match is not None and api_match.locality == claimed_match.locality:
+                return True
+    return False
+
+
 def calculate_location_match(claimed_city: str, claimed_locality: str, api_results: List[Dict]) -> float:
     """
     Calculate how well the API results match the claimed location
@@ -285,30 +409,12 @@ def calculate_location_match(claimed_city: str, claimed_locality: str, api_resul
     if not api_results:
         return 0.0
     
-    claimed_city_norm = normalize_string(claimed_city)
-    claimed_locality_norm = normalize_string(claimed_locality)
-    
-    city_matches = 0
-    locality_matches = 0
     total_apis = len(api_results)
-    
-    for result in api_results:
-        # Check city match
-        api_city = normalize_string(result.get('city'))
-        if api_city and claimed_city_norm in api_city or api_city in claimed_city_norm:
-            city_matches += 1
-        
-        # Check locality match (check multiple fields)
-        api_locality = normalize_string(result.get('locality'))
-        api_suburb = normalize_string(result.get('suburb'))
-        api_neighbourhood = normalize_string(result.get('neighbourhood'))
-        
-        if any([
-            claimed_locality_norm in api_locality or api_locality in claimed_locality_norm,
-            claimed_locality_norm in api_suburb or api_suburb in claimed_locality_norm,
-            claimed_locality_norm in api_neighbourhood or api_neighbourhood in claimed_locality_norm
-        ]):
-            locality_matches += 1
+    city_matches = sum(1 for result in api_results if city_matches_result(claimed_city, result))
+    locality_matches = sum(
+        1 for result in api_results
+        if locality_matches_result(claimed_city, claimed_locality, result)
+    )
     
     # Calculate match score
     city_score = city_matches / total_apis
@@ -324,8 +430,9 @@ def verify_location_with_external_apis(
     latitude: float,
     longitude: float,
     claimed_city: str,
-    claimed_locality: str
-) -> Tuple[float, str, Dict]:
+    claimed_locality: str,
+    explain: bool = True
+) -> Tuple[float, Optional[str], Dict]:
     """
     Verify location using multiple external APIs
     
@@ -334,6 +441,7 @@ def verify_location_with_external_apis(
         longitude: Listing longitude
         claimed_city: Claimed city name
         claimed_locality: Claimed locality name
+        explain: Render the explanation (None when False)
         
     Returns:
         tuple: (fraud_score, explanation, details)
@@ -343,48 +451,42 @@ def verify_location_with_external_apis(
     """
     # Validate coordinates
     if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
-        return 0.9, "Invalid coordinates provided.", {}
+        return 0.9, "Invalid coordinates provided." if explain else None, {}
     
-    # Call multiple APIs
     api_results = []
     api_responses = {}
     
-    # 1. Nominatim (always call - no key required)
-    nominatim_response = call_nominatim_api(latitude, longitude)
-    if nominatim_response:
-        location_info = extract_location_info('nominatim', nominatim_response)
-        api_results.append(location_info)
-        api_responses['nominatim'] = location_info
-    
-    # 2. BigDataCloud (always call - no key required)
-    bigdatacloud_response = call_bigdatacloud_api(latitude, longitude)
-    if bigdatacloud_response:
-        location_info = extract_location_info('bigdatacloud', bigdatacloud_response)
-        api_results.append(location_info)
-        api_responses['bigdatacloud'] = location_info
-    
-    # 3. LocationIQ (if API key available)
-    if LOCATIONIQ_API_KEY:
-        locationiq_response = call_locationiq_api(latitude, longitude)
-        if locationiq_response:
-            location_info = extract_location_info('locationiq', locationiq_response)
-            api_results.append(location_info)
-            api_responses['locationiq'] = location_info
-    
-    # 4. OpenCage (if API key available)
-    if OPENCAGE_API_KEY:
-        opencage_response = call_opencage_api(latitude, longitude)
-        if opencage_response:
-            location_info = extract_location_info('opencage', opencage_response)
-            api_results.append(location_info)
-            api_responses['opencage'] = location_info
+    # Offline reverse geocoder: settles the check locally when confident,
+    # and is the only source in offline mode
+    if LOCATION_VERIFICATION_MODE != 'online':
+        offline_info = reverse_geocode_offline(latitude, longitude)
+        if offline_info and (
+            LOCATION_VERIFICATION_MODE == 'offline' or
+            offline_info['confidence'] >= OFFLINE_CONFIDENCE_THRESHOLD
+        ):
+            api_results.append(offline_info)
+            api_responses['offline'] = offline_info
+    
+    # Call multiple APIs (cached per provider by rounded coordinates)
+    if not api_results and LOCATION_VERIFICATION_MODE != 'offline':
+        for api_name in get_enabled_providers():
+            location_info = lookup_provider(api_name, latitude, longitude)
+            if location_info:
+                api_results.append(location_info)
+                api_responses[api_name] = location_info
     
     # Check if we got any results
     if not api_results:
+        if LOCATION_VERIFICATION_MODE == 'offline':
+            return 0.5, (
+                "⚠️ Unable to verify location offline. "
+                "The coordinates are outside the coverage of our locality reference data."
+            ) if explain else None, {}
+        # Every provider failed or is in backoff: a transient outcome
         return 0.5, (
             "⚠️ Unable to verify location using external APIs. "
             "This could indicate network issues or invalid coordinates."
-        ), {}
+        ) if explain else None, {'skipped': True, 'reason': 'no_provider_response'}
     
     # Calculate consensus match score
     match_score = calculate_location_match(claimed_city, claimed_locality, api_results)
@@ -392,16 +494,72 @@ def verify_location_with_external_apis(
     # Calculate fraud score (inverse of match score)
     fraud_score = 1.0 - match_score
     
-    # Generate explanation
     num_apis = len(api_results)
-    city_matches = sum(1 for r in api_results if normalize_string(claimed_city) in normalize_string(r.get('city', '')))
-    locality_matches = sum(1 for r in api_results if any([
-        normalize_string(claimed_locality) in normalize_string(r.get('locality', '')),
-        normalize_string(claimed_locality) in normalize_string(r.get('suburb', '')),
-        normalize_string(claimed_locality) in normalize_string(r.get('neighbourhood', ''))
-    ]))
-    
-    if fraud_score < 0.3:
+    city_matches = sum(1 for r in api_results if city_matches_result(claimed_city, r))
+    locality_matches = sum(1 for r in api_results if locality_matches_result(claimed_city, claimed_locality, r))
+    
+    details = {
+        'source': 'offline' if 'offline' in api_responses else 'external',
+        'apis_called': num_apis,
+        'city_matches': city_matches,
+        'locality_matches': locality_matches,
+        'match_score': match_score,
+        'api_responses': api_responses
+    }
+    
+    if not explain:
+        return fraud_score, None, details
+    
+    return fraud_score, render_external_explanation(fraud_score, claimed_city, claimed_locality, details), details
+
+
+def render_external_explanation(
+    fraud_score: float,
+    claimed_city: str,
+    claimed_locality: str,
+    details: Dict
+) -> str:
+    """
+    Render the external verification explanation
+    
+    Args:
+        fraud_score: Fraud score from verify_location_with_external_apis
+        claimed_city: Claimed city name
+        claimed_locality: Claimed locality name
+        details: Details dict from verify_location_with_external_apis
+        
+    Returns:
+        str: Human-readable explanation
+    """
+    num_apis = details['apis_called']
+    city_matches = details['city_matches']
+    locality_matches = details['locality_matches']
+    api_responses = details['api_responses']
+    
+    if details.get('source') == 'offline':
+        # Settled by the offline geocoder: one lookup, no external API was called
+        city_result = "confirmed" if city_matches else "did not confirm"
+        locality_result = "confirmed" if locality_matches else "did not confirm"
+        matches = (
+            f"The offline locality reference data {city_result} the city '{claimed_city}' "
+            f"and {locality_result} the locality '{claimed_locality}'."
+        )
+        if fraud_score < 0.3:
+            explanation = (
+                f"✅ VERIFIED: Location verified offline (no external API was called). {matches} "
+                f"The coordinates appear accurate."
+            )
+        elif fraud_score < 0.6:
+            explanation = (
+                f"⚠️ MODERATE RISK: Partial offline verification. {matches} "
+                f"The location may be inaccurate or misleading."
+            )
+        else:
+            explanation = (
+                f"🚨 HIGH RISK: Location could not be verified offline. {matches} "
+                f"This strongly suggests fraudulent or incorrect location information."
+            )
+    elif fraud_score < 0.3:
         explanation = (
             f"✅ VERIFIED: Location verified by {num_apis} external API(s). "
             f"{city_matches}/{num_apis} APIs confirmed the city '{claimed_city}', "
@@ -424,22 +582,17 @@ def verify_location_with_external_apis(
         )
     
     # Add API details
-    if api_results:
-        explanation += f"\n\nVerified locations from APIs:"
+    if api_responses:
+        if details.get('source') == 'offline':
+            explanation += f"\n\nNearest locality in the offline reference data:"
+        else:
+            explanation += f"\n\nVerified locations from APIs:"
         for api_name, result in api_responses.items():
             city = result.get('city', 'Unknown')
             locality = result.get('locality') or result.get('suburb') or result.get('neighbourhood', 'Unknown')
             explanation += f"\n- {api_name.capitalize()}: {locality}, {city}"
     
-    details = {
-        'apis_called': num_apis,
-        'city_matches': city_matches,
-        'locality_matches': locality_matches,
-        'match_score': match_score,
-        'api_responses': api_responses
-    }
-    
-    return fraud_score, explanation, details
+    return explanation
 
 
 def get_external_verification_status() -> Dict:
@@ -449,20 +602,29 @@ def get_external_verification_status() -> Dict:
     Returns:
         dict: Service status
     """
+    apis_available = {
+        'nominatim': True,
+        'bigdatacloud': True,
+        'locationiq': bool(LOCATIONIQ_API_KEY),
+        'opencage': bool(OPENCAGE_API_KEY),
+        'geoapify': bool(GEOAPIFY_API_KEY)
+    }
+    limiter_status = get_rate_limiter().get_status()
+    configured = [name for name, available in apis_available.items() if available and name in PROVIDER_CALLS]
+    
     return {
         'service': 'external_location_verification',
-        'status': 'operational',
-        'apis_available': {
-            'nominatim': True,
-            'bigdatacloud': True,
-            'locationiq': bool(LOCATIONIQ_API_KEY),
-            'opencage': bool(OPENCAGE_API_KEY),
-            'geoapify': bool(GEOAPIFY_API_KEY)
-        },
+        'status': summarize_health(configured),
+        'mode': LOCATION_VERIFICATION_MODE,
+        'offline_confidence_threshold': OFFLINE_CONFIDENCE_THRESHOLD,
+        'apis_available': apis_available,
+        'provider_health': {name: get_provider_health(name).get_status() for name in configured},
         'rate_limits': {
-            'nominatim': '1 request/second',
+            'nominatim': limiter_status['nominatim'],
             'bigdatacloud': 'unlimited',
-            'locationiq': '10,000/day' if LOCATIONIQ_API_KEY else 'not configured',
-            'opencage': '2,500/day' if OPENCAGE_API_KEY else 'not configured'
-        }
+            'locationiq': limiter_status['locationiq'] if LOCATIONIQ_API_KEY else 'not configured',
+            'opencage': limiter_status['opencage'] if OPENCAGE_API_KEY else 'not configured'
+        },
+        'cache': get_geocode_cache().get_stats(),
+        'coalescing': _geocode_flight.get_stats()
     }
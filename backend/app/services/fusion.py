@@ -7,7 +7,9 @@ This module implements a weighted fusion strategy that is:
 - Explainable (clear reasoning for every decision)
 - Transparent (no black-box ML)
 """
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Sequence
+
+from app.utils.ml_imports import HAS_NUMPY, np
 
 
 # ============================================================
@@ -28,6 +30,54 @@ FUSION_WEIGHTS = {
 # Fraud type threshold
 FRAUD_TYPE_THRESHOLD = 0.6  # Only include fraud types with score > 0.6
 
+# Explanation threshold
+EXPLANATION_THRESHOLD = 0.3  # Only explain modules with score > 0.3
+
+# Module order for score matrices (columns of fuse_fraud_scores_batch)
+FUSION_MODULES = ('price', 'image', 'text', 'location', 'external_location', 'amenity')
+
+# Fraud type label per module
+FRAUD_TYPE_LABELS = {
+    'price': "Price Fraud",
+    'image': "Image Fraud",
+    'text': "Text Fraud",
+    'location': "Location Fraud",
+    'external_location': "External Location Fraud",
+    'amenity': "Amenity Fraud"
+}
+
+# Module names shown in the fusion summary, in display order
+SUMMARY_MODULE_NAMES = {
+    'price': "Price",
+    'image': "Image",
+    'text': "Text",
+    'location': "Location",
+    'external_location': "External Location",
+    'amenity': "Amenity"
+}
+
+# Risk levels: (minimum probability, level, emoji), highest first
+RISK_LEVELS = (
+    (0.8, "CRITICAL", "🚨"),
+    (0.6, "HIGH", "⚠️"),
+    (0.4, "MODERATE", "⚠️"),
+    (0.2, "LOW", "ℹ️"),
+    (0.0, "MINIMAL", "✓"),
+)
+
+
+def get_risk_level(fraud_probability: float) -> Tuple[str, str]:
+    """
+    Map a fraud probability to its risk level
+    
+    Returns:
+        tuple: (risk_level, risk_emoji)
+    """
+    for minimum, level, emoji in RISK_LEVELS:
+        if fraud_probability >= minimum:
+            return level, emoji
+    return RISK_LEVELS[-1][1], RISK_LEVELS[-1][2]
+
 
 def validate_fraud_score(score: float, module_name: str) -> float:
     """
@@ -61,7 +111,8 @@ def weighted_fusion(
     text_score: float,
     location_score: float,
     external_location_score: float = 0.0,
-    amenity_score: float = 0.0
+    amenity_score: float = 0.0,
+    weights: Optional[Dict[str, float]] = None
 ) -> float:
     """
     Compute weighted fusion of fraud scores
@@ -79,6 +130,8 @@ def weighted_fusion(
         location_score: Location fraud score (0-1)
         external_location_score: External location verification score (0-1)
         amenity_score: Amenity verification score (0-1)
+        weights: Module weights to use instead of FUSION_WEIGHTS (missing
+                 modules weigh 0, see renormalized_weights)
         
     Returns:
         float: Final fraud probability (0-1)
@@ -92,13 +145,15 @@ def weighted_fusion(
     amenity_score = validate_fraud_score(amenity_score, "Amenity")
     
     # Compute weighted sum
+    if weights is None:
+        weights = FUSION_WEIGHTS
     final_score = (
-        FUSION_WEIGHTS['price'] * price_score +
-        FUSION_WEIGHTS['image'] * image_score +
-        FUSION_WEIGHTS['text'] * text_score +
-        FUSION_WEIGHTS['location'] * location_score +
-        FUSION_WEIGHTS['external_location'] * external_location_score +
-        FUSION_WEIGHTS['amenity'] * amenity_score
+        weights.get('price', 0.0) * price_score +
+        weights.get('image', 0.0) * image_score +
+        weights.get('text', 0.0) * text_score +
+        weights.get('location', 0.0) * location_score +
+        weights.get('external_location', 0.0) * external_location_score +
+        weights.get('amenity', 0.0) * amenity_score
     )
     
     # Ensure result is in valid range (should always be true, but safety check)
@@ -107,6 +162,51 @@ def weighted_fusion(
     return final_score
 
 
+def fusion_bounds(
+    known_scores: Dict[str, float],
+    pending_bounds: Dict[str, Tuple[float, float]]
+) -> Tuple[float, float]:
+    """
+    Lower and upper bound of weighted_fusion while some modules are pending
+
+    The fusion is linear in each score, so the bounds are reached with
+    every pending module at its own lower or upper bound.
+
+    Args:
+        known_scores: Module name -> finished score
+        pending_bounds: Module name -> (lowest, highest) score it can return
+
+    Returns:
+        tuple: (lowest, highest) final fraud probability
+    """
+    known = sum(
+        FUSION_WEIGHTS[module] * max(0.0, min(1.0, score or 0.0))
+        for module, score in known_scores.items()
+    )
+    lowest = known + sum(FUSION_WEIGHTS[module] * low for module, (low, _) in pending_bounds.items())
+    highest = known + sum(FUSION_WEIGHTS[module] * high for module, (_, high) in pending_bounds.items())
+    return max(0.0, min(1.0, lowest)), max(0.0, min(1.0, highest))
+
+
+def renormalized_weights(modules: Sequence[str]) -> Dict[str, float]:
+    """
+    FUSION_WEIGHTS of the given modules, rescaled to sum to 1
+
+    Used to fuse a partial result (some modules still pending) so the
+    finished modules keep their relative importance.
+
+    Args:
+        modules: Names of the modules to fuse
+
+    Returns:
+        dict: Module name -> weight (empty if the modules have no weight)
+    """
+    total = sum(FUSION_WEIGHTS[module] for module in modules)
+    if total <= 0:
+        return {}
+    return {module: FUSION_WEIGHTS[module] / total for module in modules}
+
+
 def identify_fraud_types(
     price_score: float,
     image_score: float,
@@ -172,7 +272,7 @@ def aggregate_explanations(
     """
     Aggregate explanations from all fraud modules
     
-    Includes explanations from modules with significant fraud signals (score > 0.3)
+    Includes explanations from modules with significant fraud signals (score > EXPLANATION_THRESHOLD)
     Orders explanations by fraud score (highest first)
     
     Args:
@@ -196,7 +296,7 @@ def aggregate_explanations(
     all_explanations = []
     
     # Price
-    if price_score > 0.3 and price_explanation:
+    if price_score > EXPLANATION_THRESHOLD and price_explanation:
         all_explanations.append({
             'score': price_score,
             'weight': FUSION_WEIGHTS['price'],
@@ -205,7 +305,7 @@ def aggregate_explanations(
         })
     
     # Image
-    if image_score > 0.3 and image_explanation:
+    if image_score > EXPLANATION_THRESHOLD and image_explanation:
         all_explanations.append({
             'score': image_score,
             'weight': FUSION_WEIGHTS['image'],
@@ -214,7 +314,7 @@ def aggregate_explanations(
         })
     
     # Text (can have multiple explanations)
-    if text_score > 0.3 and text_explanations:
+    if text_score > EXPLANATION_THRESHOLD and text_explanations:
         for text_exp in text_explanations:
             all_explanations.append({
                 'score': text_score,
@@ -224,7 +324,7 @@ def aggregate_explanations(
             })
     
     # Location
-    if location_score > 0.3 and location_explanation:
+    if location_score > EXPLANATION_THRESHOLD and location_explanation:
         all_explanations.append({
             'score': location_score,
             'weight': FUSION_WEIGHTS['location'],
@@ -233,7 +333,7 @@ def aggregate_explanations(
         })
     
     # External Location
-    if external_location_score > 0.3 and external_location_explanation:
+    if external_location_score > EXPLANATION_THRESHOLD and external_location_explanation:
         all_explanations.append({
             'score': external_location_score,
             'weight': FUSION_WEIGHTS['external_location'],
@@ -242,7 +342,7 @@ def aggregate_explanations(
         })
     
     # Amenity
-    if amenity_score > 0.3 and amenity_explanation:
+    if amenity_score > EXPLANATION_THRESHOLD and amenity_explanation:
         all_explanations.append({
             'score': amenity_score,
             'weight': FUSION_WEIGHTS['amenity'],
@@ -262,7 +362,8 @@ def aggregate_explanations(
 def generate_fusion_summary(
     final_fraud_probability: float,
     fraud_types: List[str],
-    individual_scores: Dict[str, float]
+    individual_scores: Dict[str, float],
+    weights: Optional[Dict[str, float]] = None
 ) -> str:
     """
     Generate a summary explanation of the fusion decision
@@ -271,26 +372,14 @@ def generate_fusion_summary(
         final_fraud_probability: Final fused fraud score
         fraud_types: List of detected fraud types
         individual_scores: Dictionary of individual module scores
+        weights: Weights used for the fusion (FUSION_WEIGHTS by default);
+                 modules without a weight are listed as pending
         
     Returns:
         str: Summary explanation
     """
     # Determine risk level
-    if final_fraud_probability >= 0.8:
-        risk_level = "CRITICAL"
-        risk_emoji = "🚨"
-    elif final_fraud_probability >= 0.6:
-        risk_level = "HIGH"
-        risk_emoji = "⚠️"
-    elif final_fraud_probability >= 0.4:
-        risk_level = "MODERATE"
-        risk_emoji = "⚠️"
-    elif final_fraud_probability >= 0.2:
-        risk_level = "LOW"
-        risk_emoji = "ℹ️"
-    else:
-        risk_level = "MINIMAL"
-        risk_emoji = "✓"
+    risk_level, risk_emoji = get_risk_level(final_fraud_probability)
     
     # Build summary
     summary = f"{risk_emoji} {risk_level} RISK: Overall fraud probability is {final_fraud_probability:.1%}.\n"
@@ -302,12 +391,15 @@ def generate_fusion_summary(
     
     # Add module breakdown
     summary += "\nModule Scores:\n"
-    summary += f"  • Price: {individual_scores.get('price', 0):.1%} (weight: {FUSION_WEIGHTS['price']:.0%})\n"
-    summary += f"  • Image: {individual_scores.get('image', 0):.1%} (weight: {FUSION_WEIGHTS['image']:.0%})\n"
-    summary += f"  • Text: {individual_scores.get('text', 0):.1%} (weight: {FUSION_WEIGHTS['text']:.0%})\n"
-    summary += f"  • Location: {individual_scores.get('location', 0):.1%} (weight: {FUSION_WEIGHTS['location']:.0%})\n"
-    summary += f"  • External Location: {individual_scores.get('external_location', 0):.1%} (weight: {FUSION_WEIGHTS['external_location']:.0%})\n"
-    summary += f"  • Amenity: {individual_scores.get('amenity', 0):.1%} (weight: {FUSION_WEIGHTS['amenity']:.0%})"
+    if weights is None:
+        weights = FUSION_WEIGHTS
+    lines = []
+    for module, name in SUMMARY_MODULE_NAMES.items():
+        if module in weights:
+            lines.append(f"  • {name}: {individual_scores.get(module, 0):.1%} (weight: {weights[module]:.0%})")
+        else:
+            lines.append(f"  • {name}: pending")
+    summary += "\n".join(lines)
     
     return summary
 
@@ -324,7 +416,9 @@ def fuse_fraud_signals(
     external_location_score: float = 0.0,
     external_location_explanation: str = "",
     amenity_score: float = 0.0,
-    amenity_explanation: str = ""
+    amenity_explanation: str = "",
+    explain: bool = True,
+    weights: Optional[Dict[str, float]] = None
 ) -> Tuple[float, List[str], List[str]]:
     """
     Main fusion function - combines all fraud signals
@@ -350,6 +444,9 @@ def fuse_fraud_signals(
         external_location_explanation: External location explanation, optional
         amenity_score: Amenity verification score (0-1), optional
         amenity_explanation: Amenity explanation, optional
+        explain: Aggregate explanations and the summary (empty list when False)
+        weights: Fusion weights to use instead of FUSION_WEIGHTS (for partial
+                 results, see renormalized_weights)
         
     Returns:
         tuple: (final_fraud_probability, fraud_types, explanations)
@@ -370,7 +467,8 @@ def fuse_fraud_signals(
         text_score=text_score,
         location_score=location_score,
         external_location_score=external_location_score,
-        amenity_score=amenity_score
+        amenity_score=amenity_score,
+        weights=weights
     )
     
     # ============================================================
@@ -385,6 +483,9 @@ def fuse_fraud_signals(
         amenity_score=amenity_score
     )
     
+    if not explain:
+        return final_fraud_probability, fraud_types, []
+    
     # ============================================================
     # STEP 3: Aggregate explanations (ordered by importance)
     # ============================================================
@@ -418,7 +519,8 @@ def fuse_fraud_signals(
     fusion_summary = generate_fusion_summary(
         final_fraud_probability=final_fraud_probability,
         fraud_types=fraud_types,
-        individual_scores=individual_scores
+        individual_scores=individual_scores,
+        weights=weights
     )
     
     # Add summary at the beginning
@@ -427,6 +529,146 @@ def fuse_fraud_signals(
     return final_fraud_probability, fraud_types, explanations
 
 
+class FusionBatchResult:
+    """
+    Columnar result of fuse_fraud_scores_batch
+    
+    Attributes:
+        modules: Module name per score column
+        scores: (n, m) validated score matrix
+        probabilities: (n,) fused fraud probabilities
+        fraud_type_mask: (n, m) True where a module's score exceeds FRAUD_TYPE_THRESHOLD
+        risk_levels: (n,) risk level names
+        explanations: Row index -> explanation list, for the rows that requested them
+    """
+
+    def __init__(self, modules, scores, probabilities, fraud_type_mask, risk_levels, explanations):
+        self.modules = modules
+        self.scores = scores
+        self.probabilities = probabilities
+        self.fraud_type_mask = fraud_type_mask
+        self.risk_levels = risk_levels
+        self.explanations = explanations
+
+    def __len__(self) -> int:
+        return len(self.probabilities)
+
+    def fraud_types(self, i: int) -> List[str]:
+        """Fraud type labels for row i, in module order"""
+        return [FRAUD_TYPE_LABELS[m] for m, flagged in zip(self.modules, self.fraud_type_mask[i]) if flagged]
+
+    def module_scores(self, i: int) -> Dict[str, float]:
+        """Module name -> score for row i"""
+        return {m: float(score) for m, score in zip(self.modules, self.scores[i])}
+
+    def rows(self) -> List[Tuple[float, List[str], Optional[List[str]]]]:
+        """
+        Row-wise results in input order
+        
+        Returns:
+            list: (probability, fraud_types, explanations or None) per row
+        """
+        return [
+            (float(p), self.fraud_types(i), self.explanations.get(i))
+            for i, p in enumerate(self.probabilities)
+        ]
+
+
+def fuse_fraud_scores_batch(
+    scores,
+    modules: Sequence[str] = FUSION_MODULES,
+    module_explanations: Optional[Sequence[Dict]] = None,
+    explain_rows=None
+) -> FusionBatchResult:
+    """
+    Vectorized fusion over an (n_listings × n_modules) score matrix
+    
+    Weights, fraud-type thresholds and risk levels are applied to all rows
+    at once. Explanations are assembled only for the rows in explain_rows,
+    with the same ordering and summary as fuse_fraud_signals.
+    
+    Args:
+        scores: (n, m) score matrix (array-like); NaN counts as 0.0
+        modules: Module name per column (subset/order of FUSION_MODULES)
+        module_explanations: Per-row dicts of module -> explanation
+                             ('text' maps to a list); needed for explain_rows
+        explain_rows: Row indices (or boolean mask) to build explanations for
+        
+    Returns:
+        FusionBatchResult
+    """
+    if not HAS_NUMPY:
+        raise RuntimeError("fuse_fraud_scores_batch requires numpy")
+    
+    modules = tuple(modules)
+    unknown = [m for m in modules if m not in FUSION_WEIGHTS]
+    if unknown:
+        raise ValueError(f"Unknown fusion modules: {unknown}")
+    
+    matrix = np.array(scores, dtype=float).reshape(-1, len(modules))
+    
+    # ============================================================
+    # STEP 1: Validate (NaN -> 0, clamp to [0, 1])
+    # ============================================================
+    matrix = np.nan_to_num(matrix, nan=0.0)
+    out_of_range = int(((matrix < 0.0) | (matrix > 1.0)).sum())
+    if out_of_range:
+        print(f"Warning: {out_of_range} fusion scores outside [0, 1], clamping")
+    matrix = np.clip(matrix, 0.0, 1.0)
+    
+    # ============================================================
+    # STEP 2: Weighted fusion, fraud types and risk levels
+    # ============================================================
+    weights = np.array([FUSION_WEIGHTS[m] for m in modules])
+    probabilities = np.clip(matrix @ weights, 0.0, 1.0)
+    fraud_type_mask = matrix > FRAUD_TYPE_THRESHOLD
+    
+    # First (highest) level whose minimum the probability reaches
+    levels = np.array([level for _, level, _ in RISK_LEVELS])
+    level_index = np.select(
+        [probabilities >= minimum for minimum, _, _ in RISK_LEVELS],
+        list(range(len(RISK_LEVELS))),
+        default=len(RISK_LEVELS) - 1
+    )
+    risk_levels = levels[level_index]
+    
+    # ============================================================
+    # STEP 3: Explanations for requested rows only
+    # ============================================================
+    explanations = {}
+    if explain_rows is not None:
+        rows = np.flatnonzero(explain_rows) if np.asarray(explain_rows).dtype == bool else explain_rows
+        for i in rows:
+            i = int(i)
+            row_scores = {m: float(matrix[i, j]) for j, m in enumerate(modules)}
+            row_texts = module_explanations[i] if module_explanations is not None else {}
+            explanations[i] = _explain_row(float(probabilities[i]), row_scores, row_texts)
+    
+    return FusionBatchResult(modules, matrix, probabilities, fraud_type_mask, risk_levels, explanations)
+
+
+def _explain_row(probability: float, row_scores: Dict[str, float], row_texts: Dict) -> List[str]:
+    """Explanations for one batch row, identical to fuse_fraud_signals output"""
+    scores = {m: row_scores.get(m, 0.0) for m in FUSION_MODULES}
+    explanations = aggregate_explanations(
+        price_score=scores['price'],
+        price_explanation=row_texts.get('price', ""),
+        image_score=scores['image'],
+        image_explanation=row_texts.get('image', ""),
+        text_score=scores['text'],
+        text_explanations=row_texts.get('text') or [],
+        location_score=scores['location'],
+        location_explanation=row_texts.get('location', ""),
+        external_location_score=scores['external_location'],
+        external_location_explanation=row_texts.get('external_location', ""),
+        amenity_score=scores['amenity'],
+        amenity_explanation=row_texts.get('amenity', "")
+    )
+    fraud_types = [FRAUD_TYPE_LABELS[m] for m in FUSION_MODULES if scores[m] > FRAUD_TYPE_THRESHOLD]
+    explanations.insert(0, generate_fusion_summary(probability, fraud_types, scores))
+    return explanations
+
+
 def get_fusion_weights() -> Dict[str, float]:
     """
     Get current fusion weights
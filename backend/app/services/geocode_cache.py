@@ -0,0 +1,129 @@
+"""
+Reverse-Geocode Cache Service
+Caches normalized reverse-geocoding results per provider, keyed by geohash-quantized coordinates
+"""
+import os
+from typing import Dict, Optional
+
+from app.utils.tiered_cache import TieredCache
+
+# Geohash precision (cell size): 6 ≈ 1.2 km, 7 ≈ 150 m, 8 ≈ 38 m
+GEOCODE_CACHE_PRECISION = int(os.getenv("GEOCODE_CACHE_PRECISION", "7"))
+
+# Reverse geocodes change rarely - keep them for a week by default
+GEOCODE_CACHE_TTL_SECONDS = float(os.getenv("GEOCODE_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+GEOCODE_CACHE_MAX_ENTRIES = int(os.getenv("GEOCODE_CACHE_MAX_ENTRIES", "5000"))
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOCODE_CACHE_PRECISION) -> str:
+    """
+    Encode coordinates as a geohash string
+
+    Points in the same geohash cell share a cache entry, so listings a few
+    metres apart reuse each other's reverse-geocoding results.
+
+    Args:
+        latitude: Latitude coordinate
+        longitude: Longitude coordinate
+        precision: Number of geohash characters
+
+    Returns:
+        str: Geohash of the cell containing the point
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    geohash = []
+    bits = 0
+    bit_count = 0
+    even_bit = True  # Geohash interleaves bits starting with longitude
+
+    while len(geohash) < precision:
+        if even_bit:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lon_range[0] = mid
+            else:
+                bits = bits << 1
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits = bits << 1
+                lat_range[1] = mid
+
+        even_bit = not even_bit
+        bit_count += 1
+
+        if bit_count == 5:
+            geohash.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(geohash)
+
+
+class GeocodeCache:
+    """Per-provider cache of `extract_location_info` output"""
+
+    def __init__(
+        self,
+        precision: int = GEOCODE_CACHE_PRECISION,
+        ttl_seconds: float = GEOCODE_CACHE_TTL_SECONDS,
+        max_entries: int = GEOCODE_CACHE_MAX_ENTRIES
+    ):
+        self.precision = precision
+        self._cache = TieredCache(
+            namespace="reverse_geocode",
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds
+        )
+
+    def make_key(self, provider: str, latitude: float, longitude: float) -> str:
+        """Build the cache key for a provider lookup"""
+        return f"{provider}:{encode_geohash(latitude, longitude, self.precision)}"
+
+    def get(self, provider: str, latitude: float, longitude: float) -> Optional[Dict]:
+        """
+        Get a cached location info dict
+
+        Args:
+            provider: API name (nominatim, bigdatacloud, ...)
+            latitude: Latitude coordinate
+            longitude: Longitude coordinate
+
+        Returns:
+            dict: Normalized location info, or None on miss
+        """
+        return self._cache.get(self.make_key(provider, latitude, longitude))
+
+    def set(self, provider: str, latitude: float, longitude: float, location_info: Dict):
+        """Store a normalized location info dict for a provider"""
+        self._cache.set(self.make_key(provider, latitude, longitude), location_info)
+
+    def clear(self):
+        """Drop all cached reverse geocodes"""
+        self._cache.clear()
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics"""
+        stats = self._cache.get_stats()
+        stats['geohash_precision'] = self.precision
+        return stats
+
+
+# Global geocode cache instance
+_geocode_cache = None
+
+
+def get_geocode_cache() -> GeocodeCache:
+    """Get or create the global geocode cache instance"""
+    global _geocode_cache
+    if _geocode_cache is None:
+        _geocode_cache = GeocodeCache()
+    return _geocode_cache
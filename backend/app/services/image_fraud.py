@@ -2,11 +2,15 @@
 Image Fraud Detection Service
 Detects duplicate/reused images using perceptual hashing
 """
-from PIL import Image
-import imagehash
 import os
 import json
-from typing import Tuple, List, Dict
+from typing import Callable, Tuple, List, Dict, Optional
+
+from app.utils.lazy_imports import lazy_module
+
+# Imported on first use (see app.utils.lazy_imports)
+Image = lazy_module("PIL.Image")
+imagehash = lazy_module("imagehash")
 
 # Path to store image hashes
 HASH_STORAGE_FILE = "app/data/image_hashes.json"
@@ -78,13 +82,19 @@ def hamming_distance(hash1: str, hash2: str) -> int:
         return 999  # Return high value if comparison fails
 
 
-def detect_image_fraud(image_paths: List[str], save_hashes: bool = True) -> Tuple[float, int, str]:
+def detect_image_fraud(
+    image_paths: List[str],
+    save_hashes: bool = True,
+    on_image_done: Optional[Callable[[str], None]] = None
+) -> Tuple[float, int, str]:
     """
     Detect image fraud by comparing with previously uploaded images
     
     Args:
         image_paths: List of image file paths to analyze
         save_hashes: Whether to save hashes for future comparisons
+        on_image_done: Called with each image path once it has been hashed
+                       (or skipped), e.g. to report progress
         
     Returns:
         tuple: (fraud_score, duplicate_count, explanation)
@@ -102,6 +112,8 @@ def detect_image_fraud(image_paths: List[str], save_hashes: bool = True) -> Tupl
     new_hashes = []
     for img_path in image_paths:
         if not os.path.exists(img_path):
+            if on_image_done is not None:
+                on_image_done(img_path)
             continue
         
         try:
@@ -112,7 +124,9 @@ def detect_image_fraud(image_paths: List[str], save_hashes: bool = True) -> Tupl
             })
         except Exception as e:
             print(f"Warning: Could not process {img_path}: {e}")
-            continue
+        
+        if on_image_done is not None:
+            on_image_done(img_path)
     
     if not new_hashes:
         return 0.0, 0, "Could not process any images."
@@ -0,0 +1,298 @@
+"""
+Job Manager Service
+Runs long analyses in the background and publishes their progress
+
+Submitting a job returns its id at once. Jobs run on the event loop
+(their heavy steps already go to the bounded analysis pools), at most
+JOB_MAX_CONCURRENT at a time, with at most JOB_MAX_PENDING queued or
+running. Progress is pushed to the WebSocket room f"analysis_{job_id}"
+(see routers/websocket.websocket_analysis_progress), and the result is
+kept for JOB_RETENTION_SECONDS after the job finishes.
+"""
+import asyncio
+import contextlib
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.websockets.connection_manager import get_connection_manager
+
+JOB_MAX_CONCURRENT = int(os.getenv("JOB_MAX_CONCURRENT", "2"))
+JOB_MAX_PENDING = int(os.getenv("JOB_MAX_PENDING", "100"))
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", "3600"))
+
+# Job states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+
+class JobQueueFull(Exception):
+    """Raised when JOB_MAX_PENDING jobs are already queued or running"""
+
+
+class JobError(Exception):
+    """Raised by a job runner to fail the job with a user-facing message"""
+
+
+def progress_room(job_id: str) -> str:
+    """WebSocket room receiving a job's progress"""
+    return f"analysis_{job_id}"
+
+
+@dataclass
+class Job:
+    """State of one background job"""
+    id: str
+    kind: str
+    status: str = JOB_QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    completed: int = 0
+    total: int = 0
+    stage: str = "queued"
+    result: Any = None
+    error: Optional[str] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def progress(self) -> int:
+        """Percent complete (100 once the job has finished)"""
+        if self.status in FINISHED_STATES:
+            return 100
+        if not self.total:
+            return 0
+        return min(99, int(self.completed * 100 / self.total))
+
+    def progress_message(self) -> Dict:
+        """WebSocket progress message for the job's current state"""
+        return {
+            "type": "analysis_progress",
+            "analysis_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": self.progress,
+            "completed": self.completed,
+            "total": self.total,
+            "stage": self.stage,
+            "timestamp": time.time()
+        }
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        """
+        Job status for the HTTP API
+
+        Args:
+            include_result: Include the result (only present once completed)
+        """
+        status = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": self.progress,
+            "completed": self.completed,
+            "total": self.total,
+            "stage": self.stage,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error
+        }
+        if include_result and self.status == JOB_COMPLETED:
+            status["result"] = self.result
+        return status
+
+
+class JobContext:
+    """Handle a running job uses to report progress"""
+
+    def __init__(self, manager: "JobManager", job: Job, loop: asyncio.AbstractEventLoop):
+        self.manager = manager
+        self.job = job
+        self._loop = loop
+
+    async def update(self, completed: Optional[int] = None, total: Optional[int] = None, stage: Optional[str] = None):
+        """
+        Record progress and publish it to the job's room
+
+        Args:
+            completed: Units done so far (modules, listings, rows, images)
+            total: Total units, if known or changed
+            stage: Short description of the current step
+        """
+        if total is not None:
+            self.job.total = total
+        if completed is not None:
+            self.job.completed = completed
+        if stage is not None:
+            self.job.stage = stage
+        await self.manager.publish(self.job)
+
+    async def advance(self, stage: Optional[str] = None, units: int = 1):
+        """Mark units as done (see update)"""
+        await self.update(completed=self.job.completed + units, stage=stage)
+
+    def advance_threadsafe(self, stage: Optional[str] = None, units: int = 1):
+        """advance() for code running in worker threads (fire and forget)"""
+        asyncio.run_coroutine_threadsafe(self.advance(stage, units), self._loop)
+
+
+JobRunner = Callable[[JobContext], Awaitable[Any]]
+
+
+class JobManager:
+    """Bounded background job queue with WebSocket progress"""
+
+    def __init__(
+        self,
+        max_concurrent: int = JOB_MAX_CONCURRENT,
+        max_pending: int = JOB_MAX_PENDING,
+        retention_seconds: float = JOB_RETENTION_SECONDS
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_pending = max_pending
+        self.retention_seconds = retention_seconds
+        self._jobs: Dict[str, Job] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _purge_finished(self):
+        """Forget finished jobs past their retention time"""
+        cutoff = time.time() - self.retention_seconds
+        for job_id in [j.id for j in self._jobs.values() if j.finished_at and j.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def active_count(self) -> int:
+        """Jobs queued or running"""
+        return sum(1 for job in self._jobs.values() if job.status not in FINISHED_STATES)
+
+    def submit(self, kind: str, runner: JobRunner, total: int = 0, limited: bool = True) -> Job:
+        """
+        Queue a job (must be called from the event loop)
+
+        Args:
+            kind: Job type label ('listing', 'batch', 'bulk_csv', 'images')
+            runner: Async function doing the work; receives a JobContext and
+                    returns the JSON-serializable result
+            total: Initial number of progress units, if known
+            limited: Wait for one of the max_concurrent slots. False for
+                     jobs that only follow work already running elsewhere
+                     (still counted against max_pending)
+
+        Returns:
+            Job: The queued job (its id is the analysis id for progress)
+
+        Raises:
+            JobQueueFull: If max_pending jobs are already queued or running
+        """
+        self._purge_finished()
+        if self.active_count() >= self.max_pending:
+            raise JobQueueFull(f"{self.max_pending} jobs are already queued or running")
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+
+        job = Job(id=uuid.uuid4().hex, kind=kind, total=total)
+        self._jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job, runner, limited))
+        return job
+
+    async def _run(self, job: Job, runner: JobRunner, limited: bool = True):
+        """Wait for a slot, run the job and publish its outcome"""
+        context = JobContext(self, job, asyncio.get_running_loop())
+        try:
+            async with (self._slots if limited else contextlib.nullcontext()):
+                job.status = JOB_RUNNING
+                job.started_at = time.time()
+                await context.update(stage="started")
+                job.result = await runner(context)
+                job.status = JOB_COMPLETED
+                job.stage = "completed"
+        except asyncio.CancelledError:
+            job.status = JOB_CANCELLED
+            job.stage = "cancelled"
+        except JobError as e:
+            job.status = JOB_FAILED
+            job.stage = "failed"
+            job.error = str(e)
+        except Exception as e:
+            print(f"Job {job.id} ({job.kind}) failed: {e}")
+            job.status = JOB_FAILED
+            job.stage = "failed"
+            job.error = "Job failed unexpectedly"
+        finally:
+            job.finished_at = time.time()
+            job.task = None
+
+        await self.publish(job)
+        await get_connection_manager().broadcast_to_room(
+            {
+                "type": "analysis_complete",
+                "analysis_id": job.id,
+                "status": job.status,
+                "error": job.error,
+                "result_url": f"/api/jobs/{job.id}"
+            },
+            progress_room(job.id)
+        )
+
+    async def publish(self, job: Job):
+        """Push a job's progress to its WebSocket room"""
+        try:
+            await get_connection_manager().broadcast_to_room(job.progress_message(), progress_room(job.id))
+        except Exception as e:
+            print(f"Job {job.id}: progress broadcast failed: {e}")
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by id (None if unknown or expired)"""
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job
+
+        Returns:
+            bool: True if the job was still active
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.task is None:
+            return False
+        job.task.cancel()
+        return True
+
+    def list_jobs(self) -> List[Dict]:
+        """Status of every retained job, newest first"""
+        self._purge_finished()
+        jobs = sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+        return [job.to_dict(include_result=False) for job in jobs]
+
+    def get_stats(self) -> Dict:
+        """Get job queue statistics"""
+        counts: Dict[str, int] = {}
+        for job in self._jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            'max_concurrent': self.max_concurrent,
+            'max_pending': self.max_pending,
+            'retention_seconds': self.retention_seconds,
+            'active': self.active_count(),
+            'by_status': counts
+        }
+
+
+# Global job manager instance
+_job_manager = None
+
+
+def get_job_manager() -> JobManager:
+    """Get or create the global job manager instance"""
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager()
+    return _job_manager
@@ -0,0 +1,274 @@
+"""
+Locality Profile Service
+Per-locality spatial spread models and boundaries, built by app/data/build_locality_profiles.py
+
+Each profile describes where a locality's listings actually are: a
+robust centroid, a covariance ellipse (km, local east/north plane) and
+the percentiles of listing distances in Mahalanobis units. Distance
+limits are read off that ellipse, so they follow each locality's size
+and shape instead of applying one radius everywhere.
+
+Profiles also carry a boundary polygon. Boundaries are held in a uniform
+grid of bounding boxes, so "which localities contain this point" only
+runs point-in-polygon tests on the few polygons whose box covers it.
+
+With the shared reference snapshot (the default), the profiles are
+rebuilt whenever the dataset changes and stored in the snapshot; the
+packaged app/data/locality_profiles.json is only used without one.
+"""
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from app.services.locality_registry import RELOAD_CHECK_INTERVAL_SECONDS, make_key
+from app.utils.data_loader import LOCALITY_PROFILES_SNAPSHOT_FILE, get_loaded_dataset
+
+# Profile table written by the build step (used when the snapshot has none)
+LOCALITY_PROFILES_FILE = "app/data/locality_profiles.json"
+
+EARTH_RADIUS_KM = 6371.0
+
+# Suspicious beyond the 99th-percentile listing (in Mahalanobis units) plus a margin;
+# high risk at twice that, the same ratio as the fixed 1.5 km / 3 km thresholds
+PROFILE_SUSPICIOUS_PERCENTILE = 'p99'
+PROFILE_SUSPICIOUS_MARGIN = 1.15
+PROFILE_HIGH_RISK_FACTOR = 2.0
+
+# Boundary grid cell size (degrees, ~2 km)
+BOUNDARY_GRID_CELL_DEG = 0.02
+
+
+@dataclass(frozen=True)
+class LocalityBoundary:
+    """Boundary polygon of one locality"""
+    city: str
+    locality: str
+    bbox: Tuple[float, float, float, float]  # (min_lat, min_lon, max_lat, max_lon)
+    polygon: Tuple[Tuple[float, float], ...]  # (lat, lon) vertices, not closed
+
+    def contains(self, latitude: float, longitude: float) -> bool:
+        """
+        Point-in-polygon test (ray casting) after a bounding-box check
+
+        Returns:
+            bool: True if the point is inside the boundary
+        """
+        min_lat, min_lon, max_lat, max_lon = self.bbox
+        if not (min_lat <= latitude <= max_lat and min_lon <= longitude <= max_lon):
+            return False
+
+        inside = False
+        vertices = self.polygon
+        j = len(vertices) - 1
+        for i in range(len(vertices)):
+            lat_i, lon_i = vertices[i]
+            lat_j, lon_j = vertices[j]
+            if (lat_i > latitude) != (lat_j > latitude):
+                crossing = lon_i + (latitude - lat_i) * (lon_j - lon_i) / (lat_j - lat_i)
+                if longitude < crossing:
+                    inside = not inside
+            j = i
+        return inside
+
+
+class BoundaryIndex:
+    """Uniform grid over boundary bounding boxes"""
+
+    def __init__(self, boundaries: List[LocalityBoundary], cell_deg: float = BOUNDARY_GRID_CELL_DEG):
+        self.cell_deg = cell_deg
+        self.size = len(boundaries)
+        self._cells: Dict[Tuple[int, int], List[LocalityBoundary]] = defaultdict(list)
+
+        for boundary in boundaries:
+            min_lat, min_lon, max_lat, max_lon = boundary.bbox
+            for row in range(self._cell(min_lat), self._cell(max_lat) + 1):
+                for col in range(self._cell(min_lon), self._cell(max_lon) + 1):
+                    self._cells[(row, col)].append(boundary)
+
+    def _cell(self, value: float) -> int:
+        return int(math.floor(value / self.cell_deg))
+
+    def localities_at(self, latitude: float, longitude: float) -> List[LocalityBoundary]:
+        """
+        Boundaries containing a point
+
+        Returns:
+            list: Containing LocalityBoundary objects (usually zero or one)
+        """
+        candidates = self._cells.get((self._cell(latitude), self._cell(longitude)), ())
+        return [b for b in candidates if b.contains(latitude, longitude)]
+
+
+@dataclass(frozen=True)
+class LocalityProfile:
+    """Spatial spread model of one locality"""
+    city: str
+    locality: str
+    n: int
+    latitude: float
+    longitude: float
+    inv_cov: Tuple[float, float, float]  # Inverse covariance [a, b, c] for [[a, b], [b, c]]
+    suspicious_mahalanobis: float
+    high_risk_mahalanobis: float
+    distance_km: Dict
+    boundary: Optional[LocalityBoundary] = None
+
+    def offset_km(self, latitude: float, longitude: float) -> Tuple[float, float]:
+        """East/north offset (km) of a point from the profile centroid"""
+        east = math.radians(longitude - self.longitude) * EARTH_RADIUS_KM * math.cos(math.radians(self.latitude))
+        north = math.radians(latitude - self.latitude) * EARTH_RADIUS_KM
+        return east, north
+
+    def thresholds_towards(self, latitude: float, longitude: float) -> Tuple[float, float]:
+        """
+        Suspicious and high-risk distances (km) in the direction of a point
+
+        The limits are the radii of the profile's threshold ellipses along
+        the centroid -> point bearing.
+
+        Returns:
+            tuple: (suspicious_km, high_risk_km)
+        """
+        east, north = self.offset_km(latitude, longitude)
+        if east == 0 and north == 0:
+            east, north = 0.0, 1.0  # Any bearing will do at the centroid
+
+        a, b, c = self.inv_cov
+        planar_km = math.hypot(east, north)
+        mahalanobis = math.sqrt(a * east * east + 2 * b * east * north + c * north * north)
+        km_per_unit = planar_km / mahalanobis
+
+        return self.suspicious_mahalanobis * km_per_unit, self.high_risk_mahalanobis * km_per_unit
+
+
+def _parse_profile(entry: Dict) -> LocalityProfile:
+    """Build a LocalityProfile from a JSON table entry"""
+    var_e, cov_en, var_n = entry['cov_km2']
+    det = var_e * var_n - cov_en * cov_en
+    suspicious = entry['mahalanobis'][PROFILE_SUSPICIOUS_PERCENTILE] * PROFILE_SUSPICIOUS_MARGIN
+
+    boundary = None
+    if entry.get('boundary'):
+        boundary = LocalityBoundary(
+            city=entry['city'],
+            locality=entry['locality'],
+            bbox=tuple(entry['boundary']['bbox']),
+            polygon=tuple((lat, lon) for lat, lon in entry['boundary']['polygon'])
+        )
+
+    return LocalityProfile(
+        city=entry['city'],
+        locality=entry['locality'],
+        n=entry['n'],
+        latitude=entry['centroid'][0],
+        longitude=entry['centroid'][1],
+        inv_cov=(var_n / det, -cov_en / det, var_e / det),
+        suspicious_mahalanobis=suspicious,
+        high_risk_mahalanobis=suspicious * PROFILE_HIGH_RISK_FACTOR,
+        distance_km=dict(entry['distance_km']),
+        boundary=boundary
+    )
+
+
+def load_locality_profiles(path: str = LOCALITY_PROFILES_FILE) -> Tuple[Dict[str, LocalityProfile], float]:
+    """
+    Load the profile table
+
+    Returns:
+        tuple: ("city|locality" key -> LocalityProfile, file mtime).
+               Empty if the file is missing.
+
+    Raises:
+        ValueError, KeyError, TypeError: If the file is invalid (e.g. half written)
+    """
+    if not os.path.exists(path):
+        return {}, 0.0
+
+    mtime = os.path.getmtime(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        table = json.load(f)
+    profiles = {}
+    for entry in table.get('profiles', {}).values():
+        profile = _parse_profile(entry)
+        profiles[make_key(profile.city, profile.locality)] = profile
+    return profiles, mtime
+
+
+def locality_profiles_file() -> str:
+    """
+    Profile table in use: the one built into the attached reference
+    snapshot, else LOCALITY_PROFILES_FILE
+    """
+    dataset = get_loaded_dataset()
+    path = dataset.derived_file(LOCALITY_PROFILES_SNAPSHOT_FILE) if hasattr(dataset, 'derived_file') else None
+    return path or LOCALITY_PROFILES_FILE
+
+
+# Global profile table and boundary index (reloaded when the file changes)
+_profiles: Optional[Dict[str, LocalityProfile]] = None
+_boundary_index: Optional[BoundaryIndex] = None
+_profiles_path: Optional[str] = None
+_profiles_mtime = 0.0
+_failed_source: Optional[Tuple[str, float]] = None
+_last_check = 0.0
+_load_lock = threading.Lock()
+
+
+def get_locality_profiles() -> Dict[str, LocalityProfile]:
+    """
+    Get the current profile table, reloading it if the file changed
+
+    A file that cannot be parsed keeps the previous table in service
+    (until the file changes again); only the first load falls back to an
+    empty table. The table is also reloaded when the file in use changes
+    (see locality_profiles_file).
+    """
+    global _profiles, _boundary_index, _profiles_path, _profiles_mtime, _failed_source, _last_check
+    now = time.monotonic()
+    if _profiles is not None and now - _last_check < RELOAD_CHECK_INTERVAL_SECONDS:
+        return _profiles
+
+    with _load_lock:
+        _last_check = now
+        path = locality_profiles_file()
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = 0.0
+        source = (path, mtime)
+        if _profiles is None or (source != (_profiles_path, _profiles_mtime) and source != _failed_source):
+            try:
+                profiles, loaded_mtime = load_locality_profiles(path)
+            except Exception as e:
+                _failed_source = source
+                if _profiles is not None:
+                    print(f"⚠️ Locality profiles reload failed, keeping the previous version: {e}")
+                    return _profiles
+                print(f"Error loading locality profiles: {e}")
+                profiles, loaded_mtime = {}, 0.0
+            else:
+                _failed_source = None
+            _boundary_index = BoundaryIndex([p.boundary for p in profiles.values() if p.boundary is not None])
+            _profiles, _profiles_path, _profiles_mtime = profiles, path, loaded_mtime
+    return _profiles
+
+
+def get_boundary_index() -> BoundaryIndex:
+    """Get the boundary grid index for the current profile table"""
+    get_locality_profiles()
+    return _boundary_index
+
+
+def get_locality_profile(city: Optional[str], locality: Optional[str]) -> Optional[LocalityProfile]:
+    """
+    Constant-time profile lookup for a canonical (city, locality)
+
+    Returns:
+        LocalityProfile or None if the locality has too few listings
+    """
+    return get_locality_profiles().get(make_key(city, locality))
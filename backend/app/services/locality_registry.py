@@ -0,0 +1,329 @@
+"""
+Locality Registry Service
+Process-wide, immutable view of the locality reference data
+
+The registry is built once from locality_coordinates.json and shared by
+every request. It is rebuilt when the file's mtime changes (checked at
+most every RELOAD_CHECK_INTERVAL_SECONDS) or when the process receives
+SIGHUP. Readers always see a complete registry: a reload builds a new
+object and swaps the reference.
+"""
+import json
+import math
+import os
+import re
+import signal
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+from app.utils.ml_imports import HAS_NUMPY, np
+
+# Reference data file
+LOCALITY_COORDS_FILE = "app/data/locality_coordinates.json"
+
+# How often the file's mtime is checked for changes (seconds)
+RELOAD_CHECK_INTERVAL_SECONDS = 5.0
+
+# Alternate spellings and abbreviations -> canonical locality name
+# Records may also carry their own "aliases" list in the JSON file
+LOCALITY_ALIASES = {
+    'Hitech City': ['HITEC City', 'Hi-Tech City', 'Hi Tech City', 'Cyber City'],
+    'LB Nagar': ['L.B. Nagar', 'L B Nagar', 'Lal Bahadur Nagar'],
+    'SR Nagar': ['S.R. Nagar', 'S R Nagar', 'Sanjeeva Reddy Nagar'],
+    'Dilsukhnagar': ['Dilsukh Nagar'],
+    'Secunderabad': ['Secundrabad', 'Sec-bad'],
+    'Kukatpally': ['KPHB', 'Kukatpalli'],
+    'Andheri West': ['Andheri (W)', 'Andheri W'],
+    'Andheri East': ['Andheri (E)', 'Andheri E'],
+    'Bandra West': ['Bandra (W)', 'Bandra W'],
+    'Thane West': ['Thane (W)', 'Thane W'],
+    'Malad West': ['Malad (W)', 'Malad W'],
+    'Borivali West': ['Borivali (W)', 'Borivali W', 'Borivli West'],
+    'Goregaon East': ['Goregaon (E)', 'Goregaon E'],
+    'Kandivali West': ['Kandivali (W)', 'Kandivali W', 'Kandivli West'],
+    'Vashi': ['Navi Mumbai Vashi'],
+}
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """
+    Normalize a city or locality name for lookups
+
+    Lowercases, turns punctuation into spaces and collapses whitespace,
+    so "L.B. Nagar", "l b  nagar" and "L-B Nagar" share one key.
+
+    Args:
+        name: Raw name
+
+    Returns:
+        str: Normalized key ("" for empty input)
+    """
+    if not name:
+        return ""
+    return _NON_ALNUM.sub(' ', name.lower()).strip()
+
+
+def make_key(city: Optional[str], locality: Optional[str]) -> str:
+    """Composite "city|locality" key from raw names"""
+    return f"{normalize_name(city)}|{normalize_name(locality)}"
+
+
+@dataclass(frozen=True)
+class LocalityRecord:
+    """One reference locality with precomputed keys and coordinates"""
+    city: str
+    locality: str
+    key: str
+    city_key: str
+    locality_key: str
+    latitude: Optional[float]
+    longitude: Optional[float]
+    lat_rad: Optional[float]
+    lon_rad: Optional[float]
+    avg_price: Optional[float]
+    data: Mapping
+
+    @property
+    def has_coordinates(self) -> bool:
+        return self.latitude is not None and self.longitude is not None
+
+
+class LocalityRegistry:
+    """Immutable locality lookup tables"""
+
+    def __init__(self, localities, mtime: float = 0.0):
+        self.mtime = mtime
+        self.loaded_at = time.time()
+
+        records = []
+        by_key = {}
+        by_locality = {}
+        aliases = {}
+
+        for loc in localities:
+            if not loc.get('locality'):
+                continue
+
+            lat = loc.get('latitude')
+            lon = loc.get('longitude')
+            record = LocalityRecord(
+                city=loc.get('city', ''),
+                locality=loc['locality'],
+                key=make_key(loc.get('city'), loc['locality']),
+                city_key=normalize_name(loc.get('city')),
+                locality_key=normalize_name(loc['locality']),
+                latitude=lat,
+                longitude=lon,
+                lat_rad=math.radians(lat) if lat is not None else None,
+                lon_rad=math.radians(lon) if lon is not None else None,
+                avg_price=loc.get('avg_price'),
+                data=MappingProxyType(dict(loc))
+            )
+            records.append(record)
+            by_key[record.key] = record
+            # Locality-only fallback; later records win, as in the legacy loader
+            by_locality[record.locality_key] = record
+
+            for alias in list(LOCALITY_ALIASES.get(record.locality, [])) + list(loc.get('aliases', [])):
+                aliases[make_key(record.city, alias)] = record.key
+
+        self.records: Tuple[LocalityRecord, ...] = tuple(records)
+        self.by_key: Mapping[str, LocalityRecord] = MappingProxyType(by_key)
+        self.by_locality: Mapping[str, LocalityRecord] = MappingProxyType(by_locality)
+        self.aliases: Mapping[str, str] = MappingProxyType(aliases)
+
+        # Column arrays (radians) for vectorized distance work
+        with_coords = [r for r in self.records if r.has_coordinates]
+        self.coordinate_records: Tuple[LocalityRecord, ...] = tuple(with_coords)
+        if HAS_NUMPY:
+            self.lat_rad = np.array([r.lat_rad for r in with_coords], dtype=float)
+            self.lon_rad = np.array([r.lon_rad for r in with_coords], dtype=float)
+            self.lat_rad.setflags(write=False)
+            self.lon_rad.setflags(write=False)
+        else:
+            self.lat_rad = tuple(r.lat_rad for r in with_coords)
+            self.lon_rad = tuple(r.lon_rad for r in with_coords)
+
+        # Legacy "city|locality" and "locality" -> raw dict view
+        legacy = {}
+        for record in self.records:
+            legacy[record.key] = record.data
+            legacy[record.locality_key] = record.data
+        self.legacy_view: Mapping[str, Mapping] = MappingProxyType(legacy)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def get(self, city: Optional[str], locality: Optional[str]) -> Optional[LocalityRecord]:
+        """
+        Exact lookup by city and locality (aliases included)
+
+        Args:
+            city: Claimed city name
+            locality: Claimed locality name
+
+        Returns:
+            LocalityRecord or None
+        """
+        key = make_key(city, locality)
+        record = self.by_key.get(key)
+        if record is None and key in self.aliases:
+            record = self.by_key.get(self.aliases[key])
+        return record
+
+    def resolve(self, locality: Optional[str], city: Optional[str] = None) -> Optional[LocalityRecord]:
+        """
+        Resolve a claimed locality, falling back to a locality-only match
+
+        The fallback never crosses cities: a locality found under a
+        different city than the one claimed is treated as unknown.
+
+        Args:
+            locality: Claimed locality name
+            city: Claimed city name (optional)
+
+        Returns:
+            LocalityRecord or None
+        """
+        if city:
+            record = self.get(city, locality)
+            if record is not None:
+                return record
+
+        record = self.by_locality.get(normalize_name(locality))
+        if record is None:
+            return None
+        if city and record.city_key and record.city_key != normalize_name(city):
+            return None
+        return record
+
+    def get_stats(self) -> Dict:
+        """Get registry statistics"""
+        return {
+            'localities': len(self.records),
+            'with_coordinates': len(self.coordinate_records),
+            'aliases': len(self.aliases),
+            'source_mtime': self.mtime,
+            'loaded_at': self.loaded_at
+        }
+
+
+def read_locality_registry(path: str = LOCALITY_COORDS_FILE) -> LocalityRegistry:
+    """
+    Build a registry from the reference data file
+
+    Raises:
+        OSError, ValueError: If the file is missing or invalid (e.g. half written)
+    """
+    mtime = os.path.getmtime(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        localities = json.load(f)
+    return LocalityRegistry(localities, mtime)
+
+
+# Global registry instance
+_registry: Optional[LocalityRegistry] = None
+_last_check = 0.0
+_reload_requested = False
+_failed_mtime: Optional[float] = None
+_reload_lock = threading.Lock()
+
+
+def _source_mtime() -> Optional[float]:
+    """Modification time of the reference data file (None if it is missing)"""
+    try:
+        return os.path.getmtime(LOCALITY_COORDS_FILE)
+    except OSError:
+        return None
+
+
+def _reload_locked() -> LocalityRegistry:
+    """
+    Rebuild the registry and swap it in (caller holds _reload_lock)
+
+    On a reload, a file that cannot be read keeps the previous registry
+    in service (until the file changes again); only the first load falls
+    back to an empty registry.
+    """
+    global _registry, _last_check, _reload_requested, _failed_mtime
+    _reload_requested = False
+    _last_check = time.monotonic()
+    try:
+        registry = read_locality_registry()
+    except Exception as e:
+        if _registry is not None:
+            _failed_mtime = _source_mtime()
+            print(f"⚠️ Locality registry reload failed, keeping the previous version: {e}")
+            return _registry
+        print(f"Error loading locality coordinates: {e}")
+        registry = LocalityRegistry([])
+    _registry = registry
+    _failed_mtime = None
+    print(f"📍 Locality registry loaded: {len(_registry)} localities")
+    return _registry
+
+
+def reload_locality_registry() -> LocalityRegistry:
+    """Rebuild the registry from disk and swap it in (keeps the previous one on a read error)"""
+    with _reload_lock:
+        return _reload_locked()
+
+
+def get_locality_registry() -> LocalityRegistry:
+    """
+    Get the current registry, rebuilding it if the source file changed
+
+    Returns:
+        LocalityRegistry: Shared immutable registry
+    """
+    global _last_check
+    registry = _registry
+    if registry is None or _reload_requested:
+        with _reload_lock:
+            # Another caller may have loaded it while we waited
+            if _registry is None or _reload_requested:
+                return _reload_locked()
+            return _registry
+
+    now = time.monotonic()
+    if now - _last_check >= RELOAD_CHECK_INTERVAL_SECONDS:
+        _last_check = now
+        mtime = _source_mtime()
+        if mtime != registry.mtime and mtime != _failed_mtime:
+            with _reload_lock:
+                mtime = _source_mtime()
+                if _registry is registry and mtime != registry.mtime and mtime != _failed_mtime:
+                    return _reload_locked()
+                return _registry
+
+    return registry
+
+
+def install_reload_signal_handler():
+    """
+    Reload the registry on SIGHUP (POSIX only, main thread only)
+
+    The handler only flags the reload; the next registry access performs
+    it, so the handler never blocks on the reload lock.
+
+    Returns:
+        bool: True if the handler was installed
+    """
+    if not hasattr(signal, 'SIGHUP'):
+        return False
+
+    def request_reload(signum, frame):
+        global _reload_requested
+        _reload_requested = True
+
+    try:
+        signal.signal(signal.SIGHUP, request_reload)
+        return True
+    except ValueError:
+        # Not running in the main thread
+        return False
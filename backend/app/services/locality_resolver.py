@@ -0,0 +1,285 @@
+"""
+Locality Resolver Service
+Resolves raw locality strings (misspellings, abbreviations, aliases) to canonical (city, locality) names
+
+Lookup order:
+1. Exact match on the normalized name
+2. Alias table (LOCALITY_ALIASES and per-record "aliases")
+3. Fuzzy match: trigram postings select a few candidates, which are then
+   ranked by edit distance
+
+Canonical names come from the locality registry and the dataset, so a
+resolved name can be used both for reference coordinates and for
+filtering price comparables.
+"""
+import os
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.services.locality_registry import get_locality_registry, normalize_name
+
+# Minimum edit-distance similarity (1 - distance / longer length) for a fuzzy match
+FUZZY_MATCH_THRESHOLD = float(os.getenv("FUZZY_MATCH_THRESHOLD", "0.75"))
+
+# Candidates (by shared trigrams) checked with edit distance per lookup
+FUZZY_MAX_CANDIDATES = 8
+
+# Resolved queries kept per index
+RESOLVE_CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class LocalityMatch:
+    """Canonical locality a raw string resolved to"""
+    city: str
+    locality: str
+    method: str   # 'exact', 'alias' or 'fuzzy'
+    score: float  # 1.0 for exact/alias matches
+
+
+def _trigrams(name: str) -> set:
+    """Character trigrams of a normalized name, padded so word edges count"""
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """
+    Levenshtein distance between two strings
+
+    Args:
+        a: First string
+        b: Second string
+        max_distance: Stop early once every alignment exceeds this
+
+    Returns:
+        int: Edit distance (max_distance + 1 if cut off early)
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb)
+            ))
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+class LocalityIndex:
+    """Precomputed exact, alias and trigram lookup tables over canonical localities"""
+
+    def __init__(self, localities: Iterable[Tuple[str, str]], aliases: Optional[Dict[Tuple[str, str], str]] = None):
+        """
+        Args:
+            localities: Canonical (city, locality) names
+            aliases: (city, alias) -> canonical locality name
+        """
+        self.entries: List[Tuple[str, str]] = []
+        self._names: List[str] = []
+        self._city_keys: List[str] = []
+        self._exact: Dict[str, List[int]] = defaultdict(list)
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+
+        seen = set()
+        for city, locality in localities:
+            key = (normalize_name(city), normalize_name(locality))
+            if not key[1] or key in seen:
+                continue
+            seen.add(key)
+            entry_id = len(self.entries)
+            self.entries.append((city, locality))
+            self._names.append(key[1])
+            self._city_keys.append(key[0])
+            self._exact[key[1]].append(entry_id)
+            for gram in _trigrams(key[1]):
+                self._postings[gram].append(entry_id)
+
+        by_key = {(self._city_keys[i], self._names[i]): i for i in range(len(self.entries))}
+        self._aliases: Dict[str, List[int]] = defaultdict(list)
+        for (city, alias), canonical in (aliases or {}).items():
+            entry_id = by_key.get((normalize_name(city), normalize_name(canonical)))
+            if entry_id is not None:
+                self._aliases[normalize_name(alias)].append(entry_id)
+
+        self._cache: Dict[Tuple[str, str], Optional[LocalityMatch]] = {}
+        self._cache_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _pick(self, entry_ids: List[int], city_key: str) -> Optional[int]:
+        """First entry in the claimed city (any city if none claimed)"""
+        for entry_id in entry_ids:
+            if not city_key or self._city_keys[entry_id] == city_key:
+                return entry_id
+        return None
+
+    def _fuzzy(self, name: str, city_key: str) -> Optional[Tuple[int, float]]:
+        """Best trigram candidate by edit-distance similarity"""
+        shared = defaultdict(int)
+        for gram in _trigrams(name):
+            for entry_id in self._postings.get(gram, ()):
+                if not city_key or self._city_keys[entry_id] == city_key:
+                    shared[entry_id] += 1
+
+        candidates = sorted(shared, key=shared.get, reverse=True)[:FUZZY_MAX_CANDIDATES]
+
+        best = None
+        for entry_id in candidates:
+            candidate = self._names[entry_id]
+            longest = max(len(name), len(candidate))
+            max_distance = int(longest * (1.0 - FUZZY_MATCH_THRESHOLD))
+            distance = edit_distance(name, candidate, max_distance)
+            if distance > max_distance:
+                continue
+            similarity = 1.0 - distance / longest
+            if best is None or similarity > best[1]:
+                best = (entry_id, similarity)
+        return best
+
+    def resolve(self, locality: Optional[str], city: Optional[str] = None) -> Optional[LocalityMatch]:
+        """
+        Resolve a raw locality string to its canonical name
+
+        Args:
+            locality: Raw locality name
+            city: Claimed city (restricts matches to that city when given)
+
+        Returns:
+            LocalityMatch or None if nothing is close enough
+        """
+        name = normalize_name(locality)
+        if not name:
+            return None
+        city_key = normalize_name(city)
+
+        cache_key = (city_key, name)
+        if cache_key in self._cache:
+            return self._cache[cache_key]
+
+        match = None
+        entry_id = self._pick(self._exact.get(name, []), city_key)
+        if entry_id is not None:
+            match = LocalityMatch(*self.entries[entry_id], method='exact', score=1.0)
+        else:
+            entry_id = self._pick(self._aliases.get(name, []), city_key)
+            if entry_id is not None:
+                match = LocalityMatch(*self.entries[entry_id], method='alias', score=1.0)
+            else:
+                best = self._fuzzy(name, city_key)
+                if best is not None:
+                    match = LocalityMatch(*self.entries[best[0]], method='fuzzy', score=round(best[1], 3))
+
+        with self._cache_lock:
+            if len(self._cache) >= RESOLVE_CACHE_SIZE:
+                self._cache.clear()
+            self._cache[cache_key] = match
+        return match
+
+    def get_stats(self) -> Dict:
+        """Get index statistics"""
+        return {
+            'localities': len(self.entries),
+            'aliases': len(self._aliases),
+            'trigrams': len(self._postings),
+            'cached_queries': len(self._cache)
+        }
+
+
+def dataset_localities(df) -> List[Tuple[str, str]]:
+    """
+    Distinct (city, locality) names in the dataset
+
+    Both the 'Location' and 'Locality' columns are used, since price
+    analysis filters on 'Location' and the Hyderabad data fills both.
+    """
+    if df is None or 'City' not in df.columns:
+        return []
+
+    names = set()
+    for column in ('Location', 'Locality'):
+        if column in df.columns:
+            # Plain iteration works for a DataFrame and the shared ReferenceDataset
+            names.update(
+                (city, locality) for city, locality in zip(df['City'], df[column])
+                if isinstance(city, str) and isinstance(locality, str)
+            )
+    return sorted(names)
+
+
+def _registry_aliases(registry) -> Dict[Tuple[str, str], str]:
+    """(city, alias) -> canonical locality from the registry alias table"""
+    aliases = {}
+    for alias_key, canonical_key in registry.aliases.items():
+        record = registry.by_key.get(canonical_key)
+        if record is not None:
+            aliases[(record.city, alias_key.split('|', 1)[1])] = record.locality
+    return aliases
+
+
+def build_locality_index(registry, extra_localities: Iterable[Tuple[str, str]] = ()) -> LocalityIndex:
+    """
+    Build the index from the registry (reference names win) plus extra names
+
+    Args:
+        registry: LocalityRegistry
+        extra_localities: Additional (city, locality) names, e.g. from the dataset
+
+    Returns:
+        LocalityIndex
+    """
+    localities = [(record.city, record.locality) for record in registry.records]
+    localities.extend(extra_localities)
+    return LocalityIndex(localities, _registry_aliases(registry))
+
+
+# Global index instance (rebuilt when the locality registry is reloaded)
+_locality_index = None
+_built_for_registry = None
+_dataset_localities = None
+_build_lock = threading.Lock()
+
+
+def get_locality_index() -> LocalityIndex:
+    """Get or build the global locality index"""
+    global _locality_index, _built_for_registry, _dataset_localities
+    registry = get_locality_registry()
+    if _locality_index is None or _built_for_registry is not registry:
+        with _build_lock:
+            if _locality_index is None or _built_for_registry is not registry:
+                if _dataset_localities is None:
+                    try:
+                        from app.utils.data_loader import get_dataset
+                        _dataset_localities = dataset_localities(get_dataset())
+                    except Exception as e:
+                        print(f"Locality index: dataset unavailable ({e}), using reference data only")
+                        _dataset_localities = []
+                _locality_index = build_locality_index(registry, _dataset_localities)
+                _built_for_registry = registry
+    return _locality_index
+
+
+def resolve_locality(locality: Optional[str], city: Optional[str] = None) -> Optional[LocalityMatch]:
+    """
+    Resolve a raw locality string (see LocalityIndex.resolve)
+
+    Returns:
+        LocalityMatch or None
+    """
+    try:
+        return get_locality_index().resolve(locality, city)
+    except Exception as e:
+        print(f"Locality resolver error: {e}")
+        return None
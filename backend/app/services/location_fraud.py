@@ -3,56 +3,58 @@ Location Fraud Detection Service
 Detects misleading or fraudulent location information using geospatial analysis
 """
 import math
-import json
-import os
-from typing import Tuple, Optional, Dict
-from geopy.distance import geodesic
+from typing import Tuple, Optional, Dict, List, Mapping, Sequence
 
-# Reference data file
-LOCALITY_COORDS_FILE = "app/data/locality_coordinates.json"
+from app.services.locality_registry import get_locality_registry
+from app.services.locality_profiles import get_boundary_index, get_locality_profile
+from app.services.locality_resolver import resolve_locality
+from app.services.offline_geocoder import find_nearest_localities
+from app.utils.lazy_imports import lazy_attribute
+from app.utils.ml_imports import HAS_NUMPY, np
+from app.utils.spatial_index import EARTH_RADIUS_KM
+
+# Imported on first use (see app.utils.lazy_imports)
+geodesic = lazy_attribute("geopy.distance", "geodesic")
 
 # Distance thresholds (in kilometers)
+# Fallback for localities without a data-derived profile (see locality_profiles)
 SUSPICIOUS_DISTANCE_KM = 1.5  # > 1.5 km is suspicious
 HIGH_RISK_DISTANCE_KM = 3.0   # > 3 km is high risk
 
 # Price deviation threshold (for combined fraud detection)
 PRICE_DEVIATION_THRESHOLD = 0.3  # 30% deviation
+PRICE_BOOST = 0.15                   # Added when distance and price are both anomalous
+PRICE_BOOST_MIN_DISTANCE_SCORE = 0.3
+
+# Minimum distance score when the listing lies inside another locality's boundary
+# (and outside the claimed one), regardless of distance
+OTHER_LOCALITY_MIN_SCORE = 0.4
+
+# Score for coordinates outside valid latitude/longitude ranges
+INVALID_COORDINATES_SCORE = 0.8
 
+# Row outcomes (used to render explanations after scoring)
+STATUS_MISSING_COORDINATES = "missing_coordinates"
+STATUS_INVALID_COORDINATES = "invalid_coordinates"
+STATUS_UNKNOWN_LOCALITY = "unknown_locality"
+STATUS_INSUFFICIENT_REFERENCE = "insufficient_reference"
+STATUS_SCORED = "scored"
 
-def load_locality_coordinates() -> Dict[str, Dict]:
+# Nearest actual localities reported for mismatched or unknown localities
+NEAREST_LOCALITY_COUNT = 3
+
+
+def load_locality_coordinates() -> Mapping[str, Mapping]:
     """
-    Load locality coordinate reference data
+    Get locality coordinate reference data
+    
+    Served from the shared in-memory registry; the JSON file is only
+    re-read when it changes on disk.
     
     Returns:
-        dict: "city|locality" -> coordinate data mapping
+        dict: "city|locality" and "locality" -> coordinate data mapping (read-only)
     """
-    if not os.path.exists(LOCALITY_COORDS_FILE):
-        return {}
-    
-    try:
-        with open(LOCALITY_COORDS_FILE, 'r', encoding='utf-8') as f:
-            localities = json.load(f)
-            
-        # Convert list to dict for faster lookup
-        locality_dict = {}
-        for loc in localities:
-            # Use composite key "city|locality" for precise matching
-            # Also lowercase for case-insensitive matching
-            city = loc.get('city', '').lower().strip()
-            locality = loc['locality'].lower().strip()
-            
-            # Primary key: city|locality
-            full_key = f"{city}|{locality}"
-            locality_dict[full_key] = loc
-            
-            # Fallback key: just locality (if unique or for legacy support)
-            # CAUTION: This might stick with the last loaded city if duplicates exist
-            locality_dict[locality] = loc
-        
-        return locality_dict
-    except Exception as e:
-        print(f"Error loading locality coordinates: {e}")
-        return {}
+    return get_locality_registry().legacy_view
 
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -92,6 +94,19 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     return distance
 
 
+def haversine_distance_radians(lat1_rad: float, lon1_rad: float, lat2_rad: float, lon2_rad: float) -> float:
+    """
+    Haversine distance for coordinates already in radians
+    
+    Returns:
+        float: Distance in kilometers
+    """
+    dlat = lat2_rad - lat1_rad
+    dlon = lon2_rad - lon1_rad
+    a = math.sin(dlat / 2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon / 2)**2
+    return 6371.0 * 2 * math.asin(math.sqrt(a))
+
+
 def validate_coordinates(latitude: float, longitude: float) -> bool:
     """
     Validate if coordinates are within valid ranges
@@ -111,8 +126,10 @@ def detect_location_fraud(
     latitude: float,
     longitude: float,
     city: str,
-    price: Optional[float] = None
-) -> Tuple[float, str]:
+    price: Optional[float] = None,
+    return_details: bool = False,
+    explain: bool = True
+):
     """
     Detect location fraud using geospatial analysis
     
@@ -126,74 +143,98 @@ def detect_location_fraud(
         longitude: Listing longitude
         city: Claimed city name
         price: Listing price (optional, for price-location sanity check)
+        return_details: Also return a details dict (status, distance,
+                        reference centroid, nearest actual localities)
+        explain: Render the explanation (None when False). The nearest
+                 actual localities are looked up either way for doubtful
+                 claims, since details report them.
         
     Returns:
-        tuple: (location_fraud_score, explanation)
+        tuple: (location_fraud_score, explanation), or
+               (location_fraud_score, explanation, details) with return_details
             - location_fraud_score (float): 0.0 to 1.0
             - explanation (str): Human-readable explanation
     """
-    # Load reference data
-    locality_data = load_locality_coordinates()
+    score, explanation, details = _detect_location_fraud(locality, latitude, longitude, city, price, explain)
+    if return_details:
+        return score, explanation, details
+    return score, explanation
+
+
+def _nearest_for(status: str, distance_score: float, latitude: float, longitude: float) -> list:
+    """Nearest actual localities, looked up only when the claim is doubtful"""
+    if status == STATUS_UNKNOWN_LOCALITY or (status == STATUS_SCORED and distance_score > 0):
+        return find_nearest_localities(latitude, longitude, NEAREST_LOCALITY_COUNT)
+    return []
+
+
+def _detect_location_fraud(
+    locality: str,
+    latitude: float,
+    longitude: float,
+    city: str,
+    price: Optional[float],
+    explain: bool = True
+) -> Tuple[float, Optional[str], Dict]:
+    """detect_location_fraud implementation, always returning details"""
+    def render(status, name, **facts):
+        return render_location_explanation(status, name, latitude, longitude, **facts) if explain else None
+    
+    # Shared reference data (no file I/O per request)
+    registry = get_locality_registry()
     
     # ============================================================
     # EDGE CASE 1: Missing or invalid coordinates
     # ============================================================
     if latitude is None or longitude is None:
-        return 0.0, "Location coordinates not provided. Cannot perform location verification."
+        return 0.0, render(STATUS_MISSING_COORDINATES, locality), {
+            'status': STATUS_MISSING_COORDINATES
+        }
     
     if not validate_coordinates(latitude, longitude):
-        return 0.8, (
-            f"Invalid coordinates provided (Lat: {latitude}, Lon: {longitude}). "
-            f"This may indicate fraudulent or incorrect location data."
-        )
+        return INVALID_COORDINATES_SCORE, render(STATUS_INVALID_COORDINATES, locality), {
+            'status': STATUS_INVALID_COORDINATES
+        }
     
     # ============================================================
     # EDGE CASE 2: Unknown locality
     # ============================================================
-    locality_key = locality.lower().strip()
-    city_key = city.lower().strip()
-    full_key = f"{city_key}|{locality_key}"
-    
-    ref_data = None
-    
-    # Try exact match first
-    if full_key in locality_data:
-        ref_data = locality_data[full_key]
-    # Fallback to just locality match if city not found
-    elif locality_key in locality_data:
-        ref_data = locality_data[locality_key]
-        # Check if the found locality belongs to a different city
-        found_city = ref_data.get('city', '').lower()
-        if found_city and found_city != city_key:
-             # Match found but in different city
-             # We treat this as "Locality not found in declared City"
-             # But it's better to be conservative and say unknown
-             ref_data = None
+    # Exact "city|locality" match (aliases included), falling back to a
+    # locality-only match that never crosses into a different city, then
+    # to a fuzzy match for misspellings
+    record = resolve_reference(registry, locality, city)
+    ref_data = record.data if record is not None else None
 
     if ref_data is None:
-        # Unknown locality - cannot verify
-        return 0.0, (
-            f"The locality '{locality}' is not in our reference database. "
-            f"Cannot verify location accuracy. This is not necessarily fraudulent, "
-            f"but location verification is unavailable."
-        )
+        # Unknown locality - cannot verify, but report where the listing actually is
+        nearest = _nearest_for(STATUS_UNKNOWN_LOCALITY, 0.0, latitude, longitude)
+        return 0.0, render(STATUS_UNKNOWN_LOCALITY, locality, nearest_localities=nearest), {
+            'status': STATUS_UNKNOWN_LOCALITY,
+            'nearest_localities': nearest
+        }
+    
+    # Data-derived spread of the locality's listings (None for sparse localities)
+    profile = get_locality_profile(record.city, record.locality)
     
     # ============================================================
     # EDGE CASE 3: Insufficient reference data
     # ============================================================
     # ref_data is already set from above logic
     
-    if 'latitude' not in ref_data or 'longitude' not in ref_data:
-        return 0.0, (
-            f"Insufficient reference data for '{locality}'. "
-            f"Cannot perform location verification."
-        )
+    if profile is None and ('latitude' not in ref_data or 'longitude' not in ref_data):
+        return 0.0, render(STATUS_INSUFFICIENT_REFERENCE, locality), {
+            'status': STATUS_INSUFFICIENT_REFERENCE
+        }
     
     # ============================================================
     # MAIN ANALYSIS: Calculate distance from locality center
     # ============================================================
-    ref_lat = ref_data['latitude']
-    ref_lon = ref_data['longitude']
+    # The profile centroid is where the locality's listings actually are
+    if profile is not None:
+        ref_lat, ref_lon = profile.latitude, profile.longitude
+    else:
+        ref_lat = ref_data['latitude']
+        ref_lon = ref_data['longitude']
     
     # Calculate distance using Haversine formula
     distance_km = haversine_distance(ref_lat, ref_lon, latitude, longitude)
@@ -212,54 +253,231 @@ def detect_location_fraud(
     # ============================================================
     # CALCULATE BASE FRAUD SCORE (based on distance)
     # ============================================================
-    if distance_km <= SUSPICIOUS_DISTANCE_KM:
-        # Within acceptable range
+    # Limits follow the locality's own footprint in the listing's direction
+    if profile is not None:
+        suspicious_km, high_risk_km = profile.thresholds_towards(latitude, longitude)
+    else:
+        suspicious_km, high_risk_km = SUSPICIOUS_DISTANCE_KM, HIGH_RISK_DISTANCE_KM
+    
+    # Boundary containment overrides the distance check where polygons exist
+    inside_boundary, containing = check_boundaries(profile, record.locality, latitude, longitude)
+    
+    if inside_boundary:
         distance_score = 0.0
-        distance_risk = "low"
-    elif distance_km <= HIGH_RISK_DISTANCE_KM:
-        # Suspicious range (1.5 - 3 km)
-        # Linear scaling: 1.5km -> 0.4, 3km -> 0.7
-        distance_score = 0.4 + (distance_km - SUSPICIOUS_DISTANCE_KM) * 0.2
-        distance_risk = "moderate"
     else:
-        # High risk (> 3 km)
-        # Cap at 0.9 to leave room for price boost
-        distance_score = min(0.7 + (distance_km - HIGH_RISK_DISTANCE_KM) * 0.1, 0.9)
-        distance_risk = "high"
+        distance_score = score_distance(distance_km, suspicious_km, high_risk_km)
+        if containing:
+            distance_score = max(distance_score, OTHER_LOCALITY_MIN_SCORE)
     
     # ============================================================
     # PRICE-LOCATION SANITY CHECK (if price provided)
     # ============================================================
     price_boost = 0.0
-    price_explanation = ""
+    avg_price = ref_data.get('avg_price')
     
-    if price is not None and 'avg_price' in ref_data and ref_data['avg_price'] > 0:
-        avg_price = ref_data['avg_price']
+    if price is not None and avg_price and avg_price > 0:
         price_deviation = abs(price - avg_price) / avg_price
         
         # If both distance AND price are anomalous, boost fraud score
-        if distance_score > 0.3 and price_deviation > PRICE_DEVIATION_THRESHOLD:
-            price_boost = 0.15  # Add 15% to fraud score
-            price_explanation = (
-                f" Additionally, the price (₹{price:,.0f}) deviates significantly "
-                f"from the locality average (₹{avg_price:,.0f}), "
-                f"which strengthens the suspicion of location fraud."
-            )
+        if distance_score > PRICE_BOOST_MIN_DISTANCE_SCORE and price_deviation > PRICE_DEVIATION_THRESHOLD:
+            price_boost = PRICE_BOOST  # Add 15% to fraud score
     
     # ============================================================
     # FINAL FRAUD SCORE
     # ============================================================
     location_fraud_score = min(distance_score + price_boost, 1.0)
     
-    # ============================================================
-    # GENERATE EXPLANATION
-    # ============================================================
-    if distance_km <= SUSPICIOUS_DISTANCE_KM:
+    # Where the listing actually is, when it is not where it claims to be
+    nearest = _nearest_for(STATUS_SCORED, distance_score, latitude, longitude)
+    
+    # Canonical name, so resolved misspellings read correctly
+    explanation = render(
+        STATUS_SCORED, record.locality,
+        distance_km=distance_km, ref_lat=ref_lat, ref_lon=ref_lon,
+        price=price, avg_price=avg_price, price_boosted=price_boost > 0,
+        nearest_localities=nearest,
+        suspicious_km=suspicious_km, high_risk_km=high_risk_km,
+        profile_points=profile.n if profile is not None else None,
+        inside_boundary=inside_boundary, containing_localities=containing
+    )
+    
+    details = {
+        'status': STATUS_SCORED,
+        'distance_km': round(distance_km, 3),
+        'reference': {
+            'city': record.city,
+            'locality': record.locality,
+            'latitude': ref_lat,
+            'longitude': ref_lon
+        },
+        'thresholds': {
+            'suspicious_km': round(suspicious_km, 3),
+            'high_risk_km': round(high_risk_km, 3),
+            'source': 'locality_profile' if profile is not None else 'fixed'
+        },
+        'boundary': {
+            'inside_claimed': inside_boundary,
+            'containing_localities': containing
+        },
+        'price_boosted': price_boost > 0,
+        'nearest_localities': nearest
+    }
+    
+    return location_fraud_score, explanation, details
+
+
+def resolve_reference(registry, locality: str, city: Optional[str] = None):
+    """
+    Find the reference record for a claimed locality
+    
+    Tries the registry's exact and alias lookups first, then the fuzzy
+    locality resolver (e.g. "Gachibauli" -> "Gachibowli").
+    
+    Returns:
+        LocalityRecord or None
+    """
+    record = registry.resolve(locality, city)
+    if record is not None:
+        return record
+    
+    match = resolve_locality(locality, city)
+    if match is None:
+        return None
+    return registry.get(match.city, match.locality)
+
+
+def check_boundaries(profile, claimed_locality: str, latitude: float, longitude: float) -> Tuple[Optional[bool], List[str]]:
+    """
+    Test a point against the locality boundary polygons
+    
+    Args:
+        profile: Claimed locality's LocalityProfile (or None)
+        claimed_locality: Canonical claimed locality name
+        latitude: Listing latitude
+        longitude: Listing longitude
+        
+    Returns:
+        tuple: (inside_claimed, containing_localities)
+            - inside_claimed: True/False, or None if the claimed locality has no boundary
+            - containing_localities: Other localities whose boundary contains the point
+              (empty when inside the claimed one)
+    """
+    inside = None
+    if profile is not None and profile.boundary is not None:
+        inside = profile.boundary.contains(latitude, longitude)
+    if inside:
+        return True, []
+    
+    containing = [
+        boundary.locality for boundary in get_boundary_index().localities_at(latitude, longitude)
+        if boundary.locality != claimed_locality
+    ]
+    return inside, containing
+
+
+def score_distance(
+    distance_km: float,
+    suspicious_km: float = SUSPICIOUS_DISTANCE_KM,
+    high_risk_km: float = HIGH_RISK_DISTANCE_KM
+) -> float:
+    """
+    Piecewise distance score (before any price boost)
+    
+    - <= suspicious:        0.0
+    - suspicious-high risk: 0.4 -> 0.7 linearly
+    - > high risk:          0.7 + 0.1/km, capped at 0.9 to leave room for the price boost
+    
+    With the default 1.5 km / 3 km thresholds the middle band rises 0.2 per km.
+    """
+    if distance_km <= suspicious_km:
+        # Within acceptable range
+        return 0.0
+    if distance_km <= high_risk_km:
+        # Suspicious range
+        return 0.4 + (distance_km - suspicious_km) / (high_risk_km - suspicious_km) * 0.3
+    # High risk
+    return min(0.7 + (distance_km - high_risk_km) * 0.1, 0.9)
+
+
+def render_location_explanation(
+    status: str,
+    locality: str,
+    latitude: Optional[float],
+    longitude: Optional[float],
+    distance_km: Optional[float] = None,
+    ref_lat: Optional[float] = None,
+    ref_lon: Optional[float] = None,
+    price: Optional[float] = None,
+    avg_price: Optional[float] = None,
+    price_boosted: bool = False,
+    nearest_localities: Optional[List[Dict]] = None,
+    suspicious_km: float = SUSPICIOUS_DISTANCE_KM,
+    high_risk_km: float = HIGH_RISK_DISTANCE_KM,
+    profile_points: Optional[int] = None,
+    inside_boundary: Optional[bool] = None,
+    containing_localities: Optional[List[str]] = None
+) -> str:
+    """
+    Render the human-readable location explanation
+    
+    Kept separate from scoring so batch callers can render text only for
+    the rows they actually report.
+    
+    Args:
+        status: One of the STATUS_* constants
+        locality: Claimed locality name
+        latitude: Listing latitude
+        longitude: Listing longitude
+        distance_km: Distance from the locality center (STATUS_SCORED only)
+        ref_lat: Locality center latitude (STATUS_SCORED only)
+        ref_lon: Locality center longitude (STATUS_SCORED only)
+        price: Listing price
+        avg_price: Locality average price
+        price_boosted: Whether the price-location boost was applied
+        nearest_localities: Nearest actual localities (from find_nearest_localities)
+        suspicious_km: Suspicious distance threshold used for scoring
+        high_risk_km: High-risk distance threshold used for scoring
+        profile_points: Listings behind a data-derived threshold (None if fixed)
+        inside_boundary: Whether the point is inside the claimed locality's boundary
+                         (None if it has no boundary)
+        containing_localities: Other localities whose boundary contains the point
+        
+    Returns:
+        str: Explanation text
+    """
+    if status == STATUS_MISSING_COORDINATES:
+        return "Location coordinates not provided. Cannot perform location verification."
+    
+    if status == STATUS_INVALID_COORDINATES:
+        return (
+            f"Invalid coordinates provided (Lat: {latitude}, Lon: {longitude}). "
+            f"This may indicate fraudulent or incorrect location data."
+        )
+    
+    if status == STATUS_UNKNOWN_LOCALITY:
+        return (
+            f"The locality '{locality}' is not in our reference database. "
+            f"Cannot verify location accuracy. This is not necessarily fraudulent, "
+            f"but location verification is unavailable."
+        ) + _render_nearest(nearest_localities)
+    
+    if status == STATUS_INSUFFICIENT_REFERENCE:
+        return (
+            f"Insufficient reference data for '{locality}'. "
+            f"Cannot perform location verification."
+        )
+    
+    if inside_boundary:
+        explanation = (
+            f"The property lies inside the mapped boundary of '{locality}', approximately "
+            f"{distance_km:.2f} km from its center. Location information appears accurate."
+        )
+    elif distance_km <= suspicious_km and not containing_localities:
         explanation = (
             f"The property is located approximately {distance_km:.2f} km from the center of '{locality}', "
             f"which is within the acceptable range. Location information appears accurate."
         )
-    elif distance_km <= HIGH_RISK_DISTANCE_KM:
+    elif distance_km <= high_risk_km:
         explanation = (
             f"⚠️ MODERATE RISK: The property is located approximately {distance_km:.2f} km away "
             f"from the claimed locality center of '{locality}'. "
@@ -272,8 +490,17 @@ def detect_location_fraud(
             f"This significant distance strongly suggests misleading or fraudulent location claims."
         )
     
+    if containing_localities:
+        listed = ", ".join(f"'{name}'" for name in containing_localities)
+        explanation += f" The coordinates fall inside the mapped boundary of {listed} instead."
+    
     # Add price explanation if applicable
-    explanation += price_explanation
+    if price_boosted:
+        explanation += (
+            f" Additionally, the price (₹{price:,.0f}) deviates significantly "
+            f"from the locality average (₹{avg_price:,.0f}), "
+            f"which strengthens the suspicion of location fraud."
+        )
     
     # Add reference coordinates for transparency
     explanation += (
@@ -281,7 +508,343 @@ def detect_location_fraud(
         f"Listing coordinates: ({latitude:.4f}, {longitude:.4f})."
     )
     
-    return location_fraud_score, explanation
+    if profile_points is not None and not inside_boundary:
+        explanation += (
+            f"\nThresholds for '{locality}' are derived from {profile_points} listings: "
+            f"suspicious beyond {suspicious_km:.2f} km, high risk beyond {high_risk_km:.2f} km in this direction."
+        )
+    
+    explanation += _render_nearest(nearest_localities)
+    
+    return explanation
+
+
+def _render_nearest(nearest_localities: Optional[List[Dict]]) -> str:
+    """Explanation suffix listing the nearest actual localities"""
+    if not nearest_localities:
+        return ""
+    listed = ", ".join(
+        f"'{n['locality']}' ({n['distance_km']:.2f} km)" for n in nearest_localities
+    )
+    return f"\nNearest known localities to the listing coordinates: {listed}."
+
+
+class LocationBatchResult:
+    """
+    Columnar result of detect_location_fraud_batch
+    
+    Scores and intermediate values are NumPy arrays aligned with the input
+    rows. Explanations are rendered lazily via explanation(i).
+    """
+
+    def __init__(self, localities, ref_cities, ref_localities, latitudes, longitudes, prices, status,
+                 distance_km, ref_lat, ref_lon, avg_price, price_boosted, scores,
+                 suspicious_km, high_risk_km, profile_points, inside_boundary, containing):
+        self.localities = localities
+        self.ref_cities = ref_cities
+        self.ref_localities = ref_localities
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.prices = prices
+        self.status = status
+        self.distance_km = distance_km
+        self.ref_lat = ref_lat
+        self.ref_lon = ref_lon
+        self.avg_price = avg_price
+        self.price_boosted = price_boosted
+        self.scores = scores
+        self.suspicious_km = suspicious_km
+        self.high_risk_km = high_risk_km
+        self.profile_points = profile_points
+        self.inside_boundary = inside_boundary
+        self.containing = containing
+        self._nearest: Dict[int, list] = {}
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def nearest_localities(self, i: int) -> list:
+        """Nearest actual localities for row i (looked up once, only for doubtful claims)"""
+        if i not in self._nearest:
+            status = str(self.status[i])
+            self._nearest[i] = _nearest_for(
+                status,
+                float(self.scores[i]) if status == STATUS_SCORED and not self.inside_boundary[i] else 0.0,
+                self.latitudes[i], self.longitudes[i]
+            )
+        return self._nearest[i]
+
+    def explanation(self, i: int) -> str:
+        """Render the explanation for row i (including the nearest-locality lookup)"""
+        price = self.prices[i]
+        status = str(self.status[i])
+        suspicious_km, high_risk_km = float(self.suspicious_km[i]), float(self.high_risk_km[i])
+        inside_boundary = self.inside_boundary[i]
+        nearest = self.nearest_localities(i)
+        # Canonical name for scored rows, as in the per-row path
+        return render_location_explanation(
+            status, self.ref_localities[i] if status == STATUS_SCORED else self.localities[i],
+            None if np.isnan(self.latitudes[i]) else float(self.latitudes[i]),
+            None if np.isnan(self.longitudes[i]) else float(self.longitudes[i]),
+            distance_km=float(self.distance_km[i]),
+            ref_lat=float(self.ref_lat[i]),
+            ref_lon=float(self.ref_lon[i]),
+            price=None if np.isnan(price) else float(price),
+            avg_price=float(self.avg_price[i]),
+            price_boosted=bool(self.price_boosted[i]),
+            nearest_localities=nearest,
+            suspicious_km=suspicious_km,
+            high_risk_km=high_risk_km,
+            profile_points=int(self.profile_points[i]) or None,
+            inside_boundary=inside_boundary,
+            containing_localities=self.containing[i]
+        )
+
+    def details(self, i: int) -> Dict:
+        """
+        Details dict for row i, as returned by detect_location_fraud(return_details=True)
+        
+        Args:
+            i: Row index
+        """
+        status = str(self.status[i])
+        if status == STATUS_UNKNOWN_LOCALITY:
+            return {
+                'status': status,
+                'nearest_localities': self.nearest_localities(i)
+            }
+        if status != STATUS_SCORED:
+            return {'status': status}
+        
+        return {
+            'status': status,
+            'distance_km': round(float(self.distance_km[i]), 3),
+            'reference': {
+                'city': self.ref_cities[i],
+                'locality': self.ref_localities[i],
+                'latitude': float(self.ref_lat[i]),
+                'longitude': float(self.ref_lon[i])
+            },
+            'thresholds': {
+                'suspicious_km': round(float(self.suspicious_km[i]), 3),
+                'high_risk_km': round(float(self.high_risk_km[i]), 3),
+                'source': 'locality_profile' if self.profile_points[i] > 0 else 'fixed'
+            },
+            'boundary': {
+                'inside_claimed': self.inside_boundary[i],
+                'containing_localities': self.containing[i]
+            },
+            'price_boosted': bool(self.price_boosted[i]),
+            'nearest_localities': self.nearest_localities(i)
+        }
+
+    def results(self, explain: bool = True) -> List[Tuple[float, Optional[str]]]:
+        """
+        Row-wise (score, explanation) pairs in input order
+        
+        Args:
+            explain: Render explanations (None when False)
+        """
+        return [
+            (float(score), self.explanation(i) if explain else None)
+            for i, score in enumerate(self.scores)
+        ]
+
+
+def detect_location_fraud_batch(
+    cities: Sequence[str],
+    localities: Sequence[str],
+    latitudes: Sequence[Optional[float]],
+    longitudes: Sequence[Optional[float]],
+    prices: Optional[Sequence[Optional[float]]] = None,
+    exact_distances: bool = False
+) -> LocationBatchResult:
+    """
+    Vectorized detect_location_fraud over many listings
+    
+    Each distinct (city, locality) pair is resolved against the registry
+    once and joined back to the rows through integer codes; distances,
+    distance scores and the price boost are then computed as array
+    operations. Explanations are not rendered here - see
+    LocationBatchResult.explanation().
+    
+    Distances use the haversine formula rather than geopy's ellipsoidal
+    geodesic, so they can differ from the per-row path by up to ~0.5%.
+    Pass exact_distances=True to use geodesic distances and per-row thresholds (tens of
+    microseconds per row) when results must match the per-row path.
+    
+    Args:
+        cities: Claimed city per listing
+        localities: Claimed locality per listing
+        latitudes: Listing latitudes (None for missing)
+        longitudes: Listing longitudes (None for missing)
+        prices: Listing prices (optional; None entries are skipped)
+        exact_distances: Use geopy geodesic distances and scalar threshold math, as detect_location_fraud does
+        
+    Returns:
+        LocationBatchResult: Per-row scores and intermediate arrays
+    """
+    if not HAS_NUMPY:
+        raise RuntimeError("detect_location_fraud_batch requires numpy")
+    
+    n = len(localities)
+    registry = get_locality_registry()
+    
+    lat = np.array([np.nan if v is None else v for v in latitudes], dtype=float)
+    lon = np.array([np.nan if v is None else v for v in longitudes], dtype=float)
+    if prices is None:
+        price = np.full(n, np.nan)
+    else:
+        price = np.array([np.nan if v is None else v for v in prices], dtype=float)
+    
+    # ============================================================
+    # CATEGORICAL JOIN: (city, locality) -> reference centroid
+    # ============================================================
+    codes = np.empty(n, dtype=np.int64)
+    categories = {}
+    for i, pair in enumerate(zip(cities, localities)):
+        codes[i] = categories.setdefault(pair, len(categories))
+    
+    # One slot per distinct pair; NaN marks an unknown locality
+    n_cat = len(categories)
+    ref_lat_cat = np.full(n_cat, np.nan)
+    ref_lon_cat = np.full(n_cat, np.nan)
+    avg_price_cat = np.full(n_cat, np.nan)
+    known_cat = np.zeros(n_cat, dtype=bool)
+    ref_name_cat = [None] * n_cat
+    ref_city_cat = [None] * n_cat
+    
+    # Locality profiles: inverse covariance and Mahalanobis limits (0 points = fixed thresholds)
+    inv_cov_cat = np.zeros((n_cat, 3))
+    limits_cat = np.zeros((n_cat, 2))
+    points_cat = np.zeros(n_cat, dtype=np.int64)
+    profile_cat = [None] * n_cat
+    
+    for (city, locality), code in categories.items():
+        record = resolve_reference(registry, locality, city)
+        if record is None:
+            continue
+        known_cat[code] = True
+        ref_name_cat[code] = record.locality
+        ref_city_cat[code] = record.city
+        if record.has_coordinates:
+            ref_lat_cat[code] = record.latitude
+            ref_lon_cat[code] = record.longitude
+        if record.avg_price:
+            avg_price_cat[code] = record.avg_price
+        
+        profile = get_locality_profile(record.city, record.locality)
+        if profile is not None:
+            profile_cat[code] = profile
+            ref_lat_cat[code] = profile.latitude
+            ref_lon_cat[code] = profile.longitude
+            inv_cov_cat[code] = profile.inv_cov
+            limits_cat[code] = (profile.suspicious_mahalanobis, profile.high_risk_mahalanobis)
+            points_cat[code] = profile.n
+    
+    ref_lat = ref_lat_cat[codes]
+    ref_lon = ref_lon_cat[codes]
+    avg_price = avg_price_cat[codes]
+    known = known_cat[codes]
+    profile_points = points_cat[codes]
+    
+    # ============================================================
+    # ROW STATUS (mirrors the per-row edge cases, in order)
+    # ============================================================
+    missing = np.isnan(lat) | np.isnan(lon)
+    with np.errstate(invalid='ignore'):
+        invalid = ~missing & ((np.abs(lat) > 90) | (np.abs(lon) > 180))
+    unknown = ~missing & ~invalid & ~known
+    insufficient = ~missing & ~invalid & known & np.isnan(ref_lat)
+    scored = ~(missing | invalid | unknown | insufficient)
+    
+    status = np.select(
+        [missing, invalid, unknown, insufficient],
+        [STATUS_MISSING_COORDINATES, STATUS_INVALID_COORDINATES,
+         STATUS_UNKNOWN_LOCALITY, STATUS_INSUFFICIENT_REFERENCE],
+        default=STATUS_SCORED
+    )
+    
+    # ============================================================
+    # DISTANCES (NumPy haversine, scored rows only)
+    # ============================================================
+    distance_km = np.full(n, np.nan)
+    if scored.any():
+        lat1, lon1 = np.radians(ref_lat[scored]), np.radians(ref_lon[scored])
+        lat2, lon2 = np.radians(lat[scored]), np.radians(lon[scored])
+        a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        distance_km[scored] = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+        if exact_distances:
+            for i in np.flatnonzero(scored):
+                try:
+                    distance_km[i] = geodesic((ref_lat[i], ref_lon[i]), (lat[i], lon[i])).kilometers
+                except Exception:
+                    pass  # Keep the haversine distance, as the per-row path does
+    
+    # ============================================================
+    # THRESHOLDS (profile ellipse radius along each listing's bearing)
+    # ============================================================
+    suspicious_km = np.full(n, SUSPICIOUS_DISTANCE_KM)
+    high_risk_km = np.full(n, HIGH_RISK_DISTANCE_KM)
+    profiled = scored & (profile_points > 0)
+    if profiled.any():
+        inv_cov = inv_cov_cat[codes[profiled]]
+        limits = limits_cat[codes[profiled]]
+        east = np.radians(lon[profiled] - ref_lon[profiled]) * EARTH_RADIUS_KM * np.cos(np.radians(ref_lat[profiled]))
+        north = np.radians(lat[profiled] - ref_lat[profiled]) * EARTH_RADIUS_KM
+        at_centre = (east == 0) & (north == 0)
+        north = np.where(at_centre, 1.0, north)  # Any bearing will do at the centroid
+        mahalanobis = np.sqrt(
+            inv_cov[:, 0] * east ** 2 + 2 * inv_cov[:, 1] * east * north + inv_cov[:, 2] * north ** 2
+        )
+        km_per_unit = np.hypot(east, north) / mahalanobis
+        suspicious_km[profiled] = limits[:, 0] * km_per_unit
+        high_risk_km[profiled] = limits[:, 1] * km_per_unit
+        if exact_distances:
+            # Same scalar math as the per-row path (numpy trig can differ in the last bit)
+            for i in np.flatnonzero(profiled):
+                suspicious_km[i], high_risk_km[i] = profile_cat[codes[i]].thresholds_towards(lat[i], lon[i])
+
+    # ============================================================
+    # PIECEWISE DISTANCE SCORE + PRICE BOOST
+    # ============================================================
+    d = np.where(scored, distance_km, 0.0)
+    distance_score = np.select(
+        [d <= suspicious_km, d <= high_risk_km],
+        [0.0, 0.4 + (d - suspicious_km) / (high_risk_km - suspicious_km) * 0.3],
+        default=np.minimum(0.7 + (d - high_risk_km) * 0.1, 0.9)
+    )
+    
+    # Boundary containment (point-in-polygon is per row, microseconds each)
+    inside_boundary = [None] * n
+    containing = [[] for _ in range(n)]
+    for i in np.flatnonzero(scored):
+        code = codes[i]
+        inside_boundary[i], containing[i] = check_boundaries(profile_cat[code], ref_name_cat[code], lat[i], lon[i])
+    
+    inside = np.array([flag is True for flag in inside_boundary], dtype=bool)
+    elsewhere = np.array([bool(names) for names in containing], dtype=bool)
+    distance_score = np.where(inside, 0.0, distance_score)
+    distance_score = np.where(elsewhere, np.maximum(distance_score, OTHER_LOCALITY_MIN_SCORE), distance_score)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        price_deviation = np.abs(price - avg_price) / avg_price
+    price_boosted = (
+        scored &
+        (avg_price > 0) &
+        (distance_score > PRICE_BOOST_MIN_DISTANCE_SCORE) &
+        (price_deviation > PRICE_DEVIATION_THRESHOLD)
+    )
+    
+    scores = np.minimum(distance_score + np.where(price_boosted, PRICE_BOOST, 0.0), 1.0)
+    scores = np.where(scored, scores, np.where(invalid, INVALID_COORDINATES_SCORE, 0.0))
+    
+    return LocationBatchResult(
+        list(localities), [ref_city_cat[code] for code in codes], [ref_name_cat[code] for code in codes],
+        lat, lon, price, status,
+        distance_km, ref_lat, ref_lon, avg_price, price_boosted, scores,
+        suspicious_km, high_risk_km, profile_points, inside_boundary, containing
+    )
 
 
 def get_locality_info(locality: str) -> Optional[Dict]:
@@ -294,9 +857,8 @@ def get_locality_info(locality: str) -> Optional[Dict]:
     Returns:
         dict: Locality information or None if not found
     """
-    locality_data = load_locality_coordinates()
-    locality_key = locality.lower().strip()
-    return locality_data.get(locality_key)
+    record = get_locality_registry().resolve(locality)
+    return dict(record.data) if record is not None else None
 
 
 def calculate_distance_between_localities(locality1: str, locality2: str) -> Optional[float]:
@@ -310,23 +872,20 @@ def calculate_distance_between_localities(locality1: str, locality2: str) -> Opt
     Returns:
         float: Distance in kilometers, or None if localities not found
     """
-    locality_data = load_locality_coordinates()
+    registry = get_locality_registry()
+    loc1 = registry.resolve(locality1)
+    loc2 = registry.resolve(locality2)
     
-    loc1_key = locality1.lower().strip()
-    loc2_key = locality2.lower().strip()
-    
-    if loc1_key not in locality_data or loc2_key not in locality_data:
+    if loc1 is None or loc2 is None:
         return None
     
-    loc1 = locality_data[loc1_key]
-    loc2 = locality_data[loc2_key]
-    
-    if 'latitude' not in loc1 or 'latitude' not in loc2:
+    if not loc1.has_coordinates or not loc2.has_coordinates:
         return None
     
-    distance = haversine_distance(
-        loc1['latitude'], loc1['longitude'],
-        loc2['latitude'], loc2['longitude']
+    # Coordinates are pre-converted to radians in the registry
+    distance = haversine_distance_radians(
+        loc1.lat_rad, loc1.lon_rad,
+        loc2.lat_rad, loc2.lon_rad
     )
     
     return distance
@@ -0,0 +1,323 @@
+"""
+Offline Reverse Geocoder Service
+Resolves coordinates to (city, locality) locally from the locality reference data and dataset listings
+
+Two sources of evidence are combined:
+1. Nearest-centroid tessellation over locality_coordinates.json. Assigning a
+   point to its nearest centroid is equivalent to a Voronoi partition; the
+   margin between the nearest and second-nearest centroid tells how deep
+   inside its cell the point lies.
+2. A k-nearest-neighbour vote over dataset listing coordinates, which
+   captures each locality's real footprint rather than just its centre.
+"""
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from app.services.locality_registry import get_locality_registry
+from app.utils.spatial_index import SpatialIndex
+
+# Verification mode for verify_location_with_external_apis:
+#   online  - external APIs only (offline geocoder unused)
+#   hybrid  - skip external APIs when the offline answer is confident
+#   offline - never call external APIs (for environments without internet)
+LOCATION_VERIFICATION_MODE = os.getenv("LOCATION_VERIFICATION_MODE", "hybrid").lower()
+
+# Confidence needed before external providers are skipped in hybrid mode
+OFFLINE_CONFIDENCE_THRESHOLD = float(os.getenv("OFFLINE_CONFIDENCE_THRESHOLD", "0.75"))
+
+# Number of dataset listings consulted for the locality vote
+NEIGHBOUR_COUNT = 15
+
+# Distance limits (in kilometers)
+FULL_CONFIDENCE_DISTANCE_KM = 1.5  # Within this of the evidence, distance does not reduce confidence
+MAX_LOCALITY_DISTANCE_KM = 5.0     # Beyond this, no locality is reported
+MAX_CITY_DISTANCE_KM = 30.0        # Beyond this, the point is outside our coverage
+
+# Listings consulted when ranking the nearest localities to a point
+NEAREST_LISTING_NEIGHBOURS = 50
+
+# Coordinates shared by listings of several localities are placeholders (e.g. a city centre)
+PLACEHOLDER_MIN_LOCALITIES = 2
+
+
+def _distance_factor(distance_km: float) -> float:
+    """Confidence multiplier that decays linearly to 0 at MAX_LOCALITY_DISTANCE_KM"""
+    if distance_km <= FULL_CONFIDENCE_DISTANCE_KM:
+        return 1.0
+    if distance_km >= MAX_LOCALITY_DISTANCE_KM:
+        return 0.0
+    return 1.0 - (distance_km - FULL_CONFIDENCE_DISTANCE_KM) / (MAX_LOCALITY_DISTANCE_KM - FULL_CONFIDENCE_DISTANCE_KM)
+
+
+def load_reference_localities() -> List[Dict]:
+    """
+    Get locality centroids with valid coordinates
+
+    Returns:
+        list: Locality records (city, locality, latitude, longitude)
+    """
+    return [
+        {
+            'city': record.city,
+            'locality': record.locality,
+            'latitude': record.latitude,
+            'longitude': record.longitude
+        }
+        for record in get_locality_registry().coordinate_records
+    ]
+
+
+def extract_listing_points(df) -> List[Dict]:
+    """
+    Extract usable (city, locality, lat, lon) points from the dataset
+
+    Rows without coordinates or a locality are skipped, as are placeholder
+    coordinates shared by listings from several localities.
+
+    Args:
+        df: Real estate dataset (DataFrame or shared ReferenceDataset) or None
+
+    Returns:
+        list: Point dicts with city, locality, latitude and longitude
+    """
+    if df is None or 'Latitude' not in df.columns or 'Longitude' not in df.columns:
+        return []
+
+    locality_col = 'Locality' if 'Locality' in df.columns else 'Location'
+    if locality_col not in df.columns:
+        return []
+
+    points = []
+    localities_at = defaultdict(set)
+
+    for city, locality, lat, lon in zip(
+        df['City'], df[locality_col], df['Latitude'], df['Longitude']
+    ):
+        if not isinstance(locality, str) or lat != lat or lon != lon:  # NaN check
+            continue
+        point = {'city': city, 'locality': locality, 'latitude': float(lat), 'longitude': float(lon)}
+        localities_at[(point['latitude'], point['longitude'])].add(locality)
+        points.append(point)
+
+    return [
+        p for p in points
+        if len(localities_at[(p['latitude'], p['longitude'])]) < PLACEHOLDER_MIN_LOCALITIES
+    ]
+
+
+class OfflineGeocoder:
+    """Local reverse geocoder over locality centroids and listing points"""
+
+    def __init__(self, localities: List[Dict], listing_points: List[Dict]):
+        self.localities = localities
+        self.listing_points = listing_points
+
+        self.centroid_index = SpatialIndex(
+            [loc['latitude'] for loc in localities],
+            [loc['longitude'] for loc in localities]
+        )
+        self.listing_index = SpatialIndex(
+            [p['latitude'] for p in listing_points],
+            [p['longitude'] for p in listing_points]
+        )
+
+    def _vote(self, latitude: float, longitude: float) -> Optional[Dict]:
+        """Inverse-distance weighted locality vote among nearby listings"""
+        neighbours = [
+            (d, i) for d, i in self.listing_index.query(latitude, longitude, k=NEIGHBOUR_COUNT)
+            if d <= MAX_LOCALITY_DISTANCE_KM
+        ]
+        if not neighbours:
+            return None
+
+        weights = defaultdict(float)
+        nearest_for = {}
+        for distance_km, i in neighbours:
+            point = self.listing_points[i]
+            key = (point['city'], point['locality'])
+            weights[key] += 1.0 / (distance_km + 0.05)  # 50 m softening avoids division by zero
+            nearest_for.setdefault(key, distance_km)
+
+        winner = max(weights, key=weights.get)
+        return {
+            'city': winner[0],
+            'locality': winner[1],
+            'share': weights[winner] / sum(weights.values()),
+            'distance_km': nearest_for[winner]
+        }
+
+    def reverse(self, latitude: float, longitude: float) -> Optional[Dict]:
+        """
+        Resolve coordinates to a city and locality
+
+        Args:
+            latitude: Latitude coordinate
+            longitude: Longitude coordinate
+
+        Returns:
+            dict: Location info in the same shape as extract_location_info
+                  (plus 'distance_km'), or None if outside coverage
+        """
+        nearest = self.centroid_index.query(latitude, longitude, k=2)
+        if not nearest or nearest[0][0] > MAX_CITY_DISTANCE_KM:
+            return None
+
+        d1, i1 = nearest[0]
+        centroid = self.localities[i1]
+
+        # Voronoi margin: 1.0 at the centroid, 0.0 on the cell boundary
+        if len(nearest) > 1:
+            d2 = nearest[1][0]
+            cell_margin = (d2 - d1) / (d2 + d1) if (d2 + d1) > 0 else 1.0
+        else:
+            cell_margin = 1.0
+
+        vote = self._vote(latitude, longitude)
+
+        if vote is None:
+            city, locality = centroid.get('city'), centroid['locality']
+            distance_km = d1
+            confidence = _distance_factor(d1) * cell_margin
+        elif (vote['city'], vote['locality']) == (centroid.get('city'), centroid['locality']):
+            # Both sources agree
+            city, locality = vote['city'], vote['locality']
+            distance_km = min(d1, vote['distance_km'])
+            confidence = _distance_factor(distance_km) * (0.5 * cell_margin + 0.5 * vote['share'])
+        else:
+            # Listings disagree with the nearest centroid - trust the listings, but less
+            city, locality = vote['city'], vote['locality']
+            distance_km = vote['distance_km']
+            confidence = _distance_factor(distance_km) * 0.5 * vote['share']
+
+        return {
+            'city': city,
+            'locality': locality if distance_km <= MAX_LOCALITY_DISTANCE_KM else None,
+            'suburb': None,
+            'neighbourhood': None,
+            'state': None,
+            'country': 'India',
+            'confidence': round(confidence, 3),
+            'distance_km': round(distance_km, 3)
+        }
+
+    def nearest_localities(self, latitude: float, longitude: float, k: int = 3) -> List[Dict]:
+        """
+        Find the localities nearest to a point
+
+        A locality's distance is the smaller of the distance to its centroid
+        and to its nearest dataset listing, so large localities are not
+        penalised for having their centre far from their edge.
+
+        Args:
+            latitude: Latitude coordinate
+            longitude: Longitude coordinate
+            k: Number of localities to return
+
+        Returns:
+            list: Dicts with city, locality, distance_km and centroid_distance_km,
+                  sorted by distance (empty if outside coverage)
+        """
+        best = {}
+
+        for distance_km, i in self.centroid_index.query(latitude, longitude, k=k * 3):
+            loc = self.localities[i]
+            key = (loc.get('city'), loc['locality'])
+            best[key] = {
+                'city': key[0],
+                'locality': key[1],
+                'distance_km': distance_km,
+                'centroid_distance_km': distance_km
+            }
+
+        for distance_km, i in self.listing_index.query(latitude, longitude, k=NEAREST_LISTING_NEIGHBOURS):
+            point = self.listing_points[i]
+            key = (point['city'], point['locality'])
+            entry = best.get(key)
+            if entry is None:
+                best[key] = {
+                    'city': key[0],
+                    'locality': key[1],
+                    'distance_km': distance_km,
+                    'centroid_distance_km': None
+                }
+            elif distance_km < entry['distance_km']:
+                entry['distance_km'] = distance_km
+
+        ranked = sorted(
+            (e for e in best.values() if e['distance_km'] <= MAX_CITY_DISTANCE_KM),
+            key=lambda e: e['distance_km']
+        )[:k]
+
+        for entry in ranked:
+            entry['distance_km'] = round(entry['distance_km'], 3)
+            if entry['centroid_distance_km'] is not None:
+                entry['centroid_distance_km'] = round(entry['centroid_distance_km'], 3)
+        return ranked
+
+    def get_stats(self) -> Dict:
+        """Get index statistics"""
+        return {
+            'localities_indexed': self.centroid_index.size,
+            'listing_points_indexed': self.listing_index.size,
+            'index_backend': self.centroid_index.backend
+        }
+
+
+# Global offline geocoder instance (built on first use)
+_offline_geocoder = None
+_built_for_registry = None
+_listing_points = None
+_build_lock = threading.Lock()
+
+
+def get_offline_geocoder() -> OfflineGeocoder:
+    """
+    Get or build the global offline geocoder instance
+
+    The geocoder is rebuilt when the locality registry is reloaded.
+    """
+    global _offline_geocoder, _built_for_registry, _listing_points
+    registry = get_locality_registry()
+    if _offline_geocoder is None or _built_for_registry is not registry:
+        with _build_lock:
+            if _offline_geocoder is None or _built_for_registry is not registry:
+                if _listing_points is None:
+                    try:
+                        from app.utils.data_loader import get_dataset
+                        _listing_points = extract_listing_points(get_dataset())
+                    except Exception as e:
+                        print(f"Offline geocoder: dataset unavailable ({e}), using centroids only")
+                        _listing_points = []
+                _offline_geocoder = OfflineGeocoder(load_reference_localities(), _listing_points)
+                _built_for_registry = registry
+    return _offline_geocoder
+
+
+def reverse_geocode_offline(latitude: float, longitude: float) -> Optional[Dict]:
+    """
+    Resolve coordinates locally (see OfflineGeocoder.reverse)
+
+    Returns:
+        dict: Location info or None if unresolved
+    """
+    try:
+        return get_offline_geocoder().reverse(latitude, longitude)
+    except Exception as e:
+        print(f"Offline geocoder error: {e}")
+        return None
+
+
+def find_nearest_localities(latitude: float, longitude: float, k: int = 3) -> List[Dict]:
+    """
+    Nearest localities to a point (see OfflineGeocoder.nearest_localities)
+
+    Returns:
+        list: Nearest localities, or an empty list on error
+    """
+    try:
+        return get_offline_geocoder().nearest_localities(latitude, longitude, k)
+    except Exception as e:
+        print(f"Nearest locality lookup error: {e}")
+        return []
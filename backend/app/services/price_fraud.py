@@ -11,10 +11,19 @@ Methods:
 
 Final score = max(z_score_normalized, iqr_score) for maximum sensitivity
 """
-from app.utils.ml_imports import pd, HAS_PANDAS, get_unavailable_message
+import math
 
+from app.utils.ml_imports import HAS_PANDAS, get_unavailable_message
+from app.services.locality_resolver import resolve_locality
+from app.utils.reference_snapshot import ReferenceDataset
 
-def detect_price_fraud(listing_price: float, locality: str, city: str, df=None):
+
+def has_reference_data(df) -> bool:
+    """True if df can be used for comparables (a snapshot needs no pandas)"""
+    return df is not None and (HAS_PANDAS or isinstance(df, ReferenceDataset))
+
+
+def detect_price_fraud(listing_price: float, locality: str, city: str, df=None, explain: bool = True):
     """
     Detect price fraud using combined Z-Score and IQR analysis
     
@@ -23,21 +32,95 @@ def detect_price_fraud(listing_price: float, locality: str, city: str, df=None):
         locality: Locality/location name
         city: City name
         df: Real estate dataset (optional on free tier)
+        explain: Render the explanation (None when False)
         
     Returns:
         tuple: (fraud_score, explanation)
             - fraud_score (float): 0.0 to 1.0, where 1.0 is definitely fraud
             - explanation (str): Human-readable explanation with statistics
     """
+    fraud_score, facts = analyze_price(listing_price, locality, city, df)
+    return fraud_score, render_price_explanation(facts) if explain else None
+
+
+def analyze_price(listing_price: float, locality: str, city: str, df=None):
+    """
+    Score a listing price and collect the facts behind the score
+    
+    Args:
+        listing_price: Price of the listing to analyze
+        locality: Locality/location name
+        city: City name
+        df: Real estate dataset (optional on free tier)
+        
+    Returns:
+        tuple: (fraud_score, facts)
+            - fraud_score (float): 0.0 to 1.0
+            - facts (dict): 'case' plus the statistics for render_price_explanation
+    """
     # Check if pandas is available
-    if not HAS_PANDAS or df is None:
+    if not has_reference_data(df):
         # Basic price validation without ML
         if listing_price < 100000:
-            return 0.8, f"Price ₹{listing_price:,.0f} seems unusually low. {get_unavailable_message()}"
+            score = 0.8
         elif listing_price > 100000000:
-            return 0.7, f"Price ₹{listing_price:,.0f} seems unusually high. {get_unavailable_message()}"
+            score = 0.7
         else:
-            return 0.3, f"Price ₹{listing_price:,.0f} appears reasonable. {get_unavailable_message()}"
+            score = 0.3
+        return score, {'listing_price': listing_price, 'locality': locality, 'city': city, 'case': 'basic'}
+    
+    return score_price(listing_price, locality, city, locality_price_stats(locality, city, df))
+
+
+def analyze_price_batch(listing_prices, localities, cities, df=None):
+    """
+    analyze_price over many listings
+    
+    Comparable-price statistics are computed once per distinct
+    (city, locality) instead of once per listing; results are identical
+    to calling analyze_price for each listing.
+    
+    Args:
+        listing_prices: Listing prices
+        localities: Claimed localities
+        cities: Claimed cities
+        df: Real estate dataset (optional on free tier)
+        
+    Returns:
+        list: (fraud_score, facts) per listing, in input order
+    """
+    if not has_reference_data(df):
+        return [analyze_price(p, l, c, df) for p, l, c in zip(listing_prices, localities, cities)]
+    
+    stats_by_locality = {}
+    results = []
+    for listing_price, locality, city in zip(listing_prices, localities, cities):
+        key = (city, locality)
+        if key not in stats_by_locality:
+            stats_by_locality[key] = locality_price_stats(locality, city, df)
+        results.append(score_price(listing_price, locality, city, stats_by_locality[key]))
+    return results
+
+
+def locality_price_stats(locality: str, city: str, df) -> dict:
+    """
+    Comparable-price statistics for a claimed locality
+    
+    Args:
+        locality: Locality/location name
+        city: City name
+        df: Real estate dataset (DataFrame or shared ReferenceDataset)
+        
+    Returns:
+        dict: 'case' ('no_city_data', 'insufficient_comparables' or 'stats'),
+              plus 'comparables' and the price statistics when available
+    """
+    # Shared snapshot: the statistics are precomputed per locality
+    if isinstance(df, ReferenceDataset):
+        if not df.has_city(city):
+            return {'case': 'no_city_data'}
+        match = resolve_locality(locality, city)
+        return df.price_stats(city, (match.locality if match is not None else locality).lower())
     
     # Filter dataset by city and locality (case-insensitive match)
     # Handle column names flexibly
@@ -52,10 +135,7 @@ def detect_price_fraud(listing_price: float, locality: str, city: str, df=None):
         city_df = df
         
     if len(city_df) == 0:
-        return 0.0, (
-            f"No data available for city '{city}'. "
-            f"Cannot perform reliable price analysis."
-        )
+        return {'case': 'no_city_data'}
 
     # 2. Filter by Locality
     if 'Location' in df.columns:
@@ -65,37 +145,60 @@ def detect_price_fraud(listing_price: float, locality: str, city: str, df=None):
     else:
         loc_col = df.columns[2] # Fallback to 3rd column usually location
         
-    locality_df = city_df[city_df[loc_col].str.lower() == locality.lower()]
+    # Resolve misspellings and aliases to the dataset's canonical name
+    match = resolve_locality(locality, city)
+    locality_key = (match.locality if match is not None else locality).lower()
+    
+    locality_df = city_df[city_df[loc_col].str.lower() == locality_key]
     
     # EDGE CASE 1: Very small locality samples
     if len(locality_df) < 5:
-        return 0.0, (
-            f"Insufficient comparable listings in '{locality}' for reliable price analysis. "
-            f"Only {len(locality_df)} properties found (minimum 5 required)."
-        )
+        return {'case': 'insufficient_comparables', 'comparables': len(locality_df)}
     
     # Extract price data
     prices = locality_df["Price"]
     
-    # Compute basic statistics
-    mean_price = prices.mean()
-    median_price = prices.median()
-    std_price = prices.std()
+    return {
+        'case': 'stats',
+        'comparables': len(locality_df),
+        'mean_price': prices.mean(),
+        'median_price': prices.median(),
+        'std_price': prices.std(),
+        'q1': prices.quantile(0.25),
+        'q3': prices.quantile(0.75)
+    }
+
+
+def score_price(listing_price: float, locality: str, city: str, stats: dict):
+    """
+    Score a listing price against its locality's comparable-price statistics
+    
+    Args:
+        listing_price: Price of the listing to analyze
+        locality: Locality/location name
+        city: City name
+        stats: Statistics from locality_price_stats
+        
+    Returns:
+        tuple: (fraud_score, facts), see analyze_price
+    """
+    facts = {'listing_price': listing_price, 'locality': locality, 'city': city}
+    
+    if stats['case'] != 'stats':
+        return 0.0, {**facts, **stats}
+    
+    mean_price = stats['mean_price']
+    median_price = stats['median_price']
+    std_price = stats['std_price']
+    
+    facts.update(mean_price=mean_price, median_price=median_price, comparables=stats['comparables'])
     
     # EDGE CASE 2: Zero variance (all prices identical)
-    if std_price == 0 or pd.isna(std_price):
+    if std_price == 0 or math.isnan(std_price):
         if abs(listing_price - mean_price) < 0.01:
-            return 0.0, (
-                f"The listed price matches the standard price for '{locality}' "
-                f"(₹{mean_price:,.0f})."
-            )
+            return 0.0, {**facts, 'case': 'uniform_match'}
         else:
-            deviation_percent = abs(listing_price - mean_price) / mean_price * 100
-            return 0.8, (
-                f"All properties in '{locality}' are priced at ₹{mean_price:,.0f}, "
-                f"but this listing is {deviation_percent:.1f}% different. "
-                f"This is highly unusual."
-            )
+            return 0.8, {**facts, 'case': 'uniform_mismatch'}
     
     # ============================================================
     # METHOD 1: Z-SCORE ANALYSIS
@@ -106,8 +209,8 @@ def detect_price_fraud(listing_price: float, locality: str, city: str, df=None):
     # ============================================================
     # METHOD 2: IQR (INTERQUARTILE RANGE) ANALYSIS
     # ============================================================
-    Q1 = prices.quantile(0.25)
-    Q3 = prices.quantile(0.75)
+    Q1 = stats['q1']
+    Q3 = stats['q3']
     IQR = Q3 - Q1
     
     # IQR bounds (1.5 * IQR is standard for outlier detection)
@@ -132,9 +235,75 @@ def detect_price_fraud(listing_price: float, locality: str, city: str, df=None):
     # ============================================================
     final_fraud_score = max(z_score_normalized, iqr_score)
     
+    facts.update(
+        case='scored',
+        fraud_score=final_fraud_score,
+        z_score=z_score,
+        iqr_flag=iqr_flag,
+        lower_bound=lower_bound,
+        upper_bound=upper_bound
+    )
+    return final_fraud_score, facts
+
+
+def render_price_explanation(facts: dict) -> str:
+    """
+    Render the price explanation from analyze_price facts
+    
+    Args:
+        facts: Facts dict returned by analyze_price
+        
+    Returns:
+        str: Human-readable explanation with statistics
+    """
+    case = facts['case']
+    listing_price = facts['listing_price']
+    locality = facts['locality']
+    
+    if case == 'basic':
+        if listing_price < 100000:
+            return f"Price ₹{listing_price:,.0f} seems unusually low. {get_unavailable_message()}"
+        elif listing_price > 100000000:
+            return f"Price ₹{listing_price:,.0f} seems unusually high. {get_unavailable_message()}"
+        else:
+            return f"Price ₹{listing_price:,.0f} appears reasonable. {get_unavailable_message()}"
+    
+    if case == 'no_city_data':
+        return (
+            f"No data available for city '{facts['city']}'. "
+            f"Cannot perform reliable price analysis."
+        )
+    
+    if case == 'insufficient_comparables':
+        return (
+            f"Insufficient comparable listings in '{locality}' for reliable price analysis. "
+            f"Only {facts['comparables']} properties found (minimum 5 required)."
+        )
+    
+    mean_price = facts['mean_price']
+    median_price = facts['median_price']
+    
+    if case == 'uniform_match':
+        return (
+            f"The listed price matches the standard price for '{locality}' "
+            f"(₹{mean_price:,.0f})."
+        )
+    
+    if case == 'uniform_mismatch':
+        deviation_percent = abs(listing_price - mean_price) / mean_price * 100
+        return (
+            f"All properties in '{locality}' are priced at ₹{mean_price:,.0f}, "
+            f"but this listing is {deviation_percent:.1f}% different. "
+            f"This is highly unusual."
+        )
+    
     # ============================================================
     # GENERATE EXAMINER-APPROVED EXPLANATION
     # ============================================================
+    final_fraud_score = facts['fraud_score']
+    iqr_flag = facts['iqr_flag']
+    lower_bound = facts['lower_bound']
+    upper_bound = facts['upper_bound']
     deviation_percent = abs(listing_price - mean_price) / mean_price * 100
     
     # Determine if price is low or high
@@ -185,4 +354,4 @@ def detect_price_fraud(listing_price: float, locality: str, city: str, df=None):
             f"Deviation: {deviation_percent:.1f}%. No price anomaly detected."
         )
     
-    return final_fraud_score, explanation
+    return explanation
@@ -0,0 +1,278 @@
+"""
+Provider Health Service
+Rolling latency/error statistics, circuit breakers and adaptive timeouts for external APIs
+
+Circuit breaker states:
+- closed:    requests flow normally
+- open:      provider is skipped until the cool-down elapses
+- half_open: a single probe request decides whether to close or re-open
+"""
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from app.utils.lazy_imports import lazy_module
+from app.utils.metrics import OUTBOUND_REQUEST_SECONDS
+
+# Imported on first use (see app.utils.lazy_imports)
+requests = lazy_module("requests")
+
+# Rolling window of most recent calls per provider
+HEALTH_WINDOW_SIZE = 50
+
+# Breaker trips on this many consecutive failures...
+CONSECUTIVE_FAILURES_TO_OPEN = 3
+# ...or when the window error rate exceeds this (after MIN_CALLS_FOR_ERROR_RATE calls)
+ERROR_RATE_TO_OPEN = 0.5
+MIN_CALLS_FOR_ERROR_RATE = 10
+
+# How long an open breaker waits before allowing a probe (seconds)
+OPEN_COOLDOWN_SECONDS = 30.0
+
+# Adaptive timeout = p95 latency × multiplier, clamped to [MIN_TIMEOUT, provider default]
+ADAPTIVE_TIMEOUT_MULTIPLIER = 2.0
+MIN_TIMEOUT_SECONDS = 1.0
+MIN_SAMPLES_FOR_ADAPTIVE_TIMEOUT = 5
+
+# Default (maximum) timeout per provider, in seconds
+PROVIDER_DEFAULT_TIMEOUTS = {
+    'nominatim': 5.0,
+    'bigdatacloud': 5.0,
+    'locationiq': 5.0,
+    'opencage': 5.0,
+    'overpass': 10.0,
+}
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def _percentile(values: List[float], percentile: float) -> Optional[float]:
+    """Nearest-rank percentile of a list (None if empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(percentile / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+class ProviderHealth:
+    """Health tracker and circuit breaker for one external provider"""
+
+    def __init__(self, name: str, default_timeout: float = 5.0):
+        self.name = name
+        self.default_timeout = default_timeout
+
+        # (latency_seconds, succeeded)
+        self._calls = deque(maxlen=HEALTH_WINDOW_SIZE)
+        self._lock = threading.Lock()
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.total_calls = 0
+        self.total_failures = 0
+        self.last_error: Optional[str] = None
+
+    # --------------------------------------------------------
+    # Breaker
+    # --------------------------------------------------------
+
+    def _cooldown_elapsed(self) -> bool:
+        return time.time() - self.opened_at >= OPEN_COOLDOWN_SECONDS
+
+    def is_available(self) -> bool:
+        """Whether a request would currently be allowed (no side effects)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                return self._cooldown_elapsed()
+            return not self.probe_in_flight
+
+    def allow_request(self) -> bool:
+        """
+        Claim permission to send a request
+
+        An open breaker moves to half-open once the cool-down has elapsed,
+        and half-open admits exactly one probe at a time.
+
+        Returns:
+            bool: True if the request may be sent
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+
+            if self.state == OPEN:
+                if not self._cooldown_elapsed():
+                    return False
+                self.state = HALF_OPEN
+                self.probe_in_flight = False
+
+            if self.probe_in_flight:
+                return False
+            self.probe_in_flight = True
+            return True
+
+    def record_success(self, latency: float):
+        """Record a successful call (closes a half-open breaker)"""
+        with self._lock:
+            self._calls.append((latency, True))
+            self.total_calls += 1
+            self.consecutive_failures = 0
+            if self.state != CLOSED:
+                print(f"Provider '{self.name}' recovered, closing circuit breaker")
+            self.state = CLOSED
+            self.probe_in_flight = False
+
+    def record_failure(self, latency: float, error: str):
+        """Record a failed call, opening the breaker when thresholds are crossed"""
+        with self._lock:
+            self._calls.append((latency, False))
+            self.total_calls += 1
+            self.total_failures += 1
+            self.consecutive_failures += 1
+            self.last_error = error
+
+            failures = sum(1 for _, ok in self._calls if not ok)
+            error_rate = failures / len(self._calls)
+
+            should_open = (
+                self.state == HALF_OPEN or
+                self.consecutive_failures >= CONSECUTIVE_FAILURES_TO_OPEN or
+                (len(self._calls) >= MIN_CALLS_FOR_ERROR_RATE and error_rate > ERROR_RATE_TO_OPEN)
+            )
+            if should_open:
+                if self.state != OPEN:
+                    print(f"Provider '{self.name}' unhealthy ({error}), opening circuit breaker")
+                self.state = OPEN
+                self.opened_at = time.time()
+            self.probe_in_flight = False
+
+    # --------------------------------------------------------
+    # Statistics
+    # --------------------------------------------------------
+
+    def get_timeout(self) -> float:
+        """
+        Get the adaptive request timeout
+
+        Derived from the p95 latency of recent successful calls, so a slow
+        provider fails fast instead of holding every listing for the full
+        default timeout.
+
+        Returns:
+            float: Timeout in seconds
+        """
+        with self._lock:
+            latencies = [latency for latency, ok in self._calls if ok]
+
+        if len(latencies) < MIN_SAMPLES_FOR_ADAPTIVE_TIMEOUT:
+            return self.default_timeout
+
+        p95 = _percentile(latencies, 95)
+        return max(MIN_TIMEOUT_SECONDS, min(self.default_timeout, p95 * ADAPTIVE_TIMEOUT_MULTIPLIER))
+
+    def get_status(self) -> Dict:
+        """Get health statistics and breaker state"""
+        with self._lock:
+            calls = list(self._calls)
+            state = self.state
+            if state == OPEN and self._cooldown_elapsed():
+                state = HALF_OPEN  # Next request will probe
+
+        latencies = [latency for latency, _ in calls]
+        failures = sum(1 for _, ok in calls if not ok)
+
+        return {
+            'state': state,
+            'window_calls': len(calls),
+            'error_rate': round(failures / len(calls), 3) if calls else 0.0,
+            'p50_latency_ms': round(_percentile(latencies, 50) * 1000, 1) if latencies else None,
+            'p95_latency_ms': round(_percentile(latencies, 95) * 1000, 1) if latencies else None,
+            'timeout_seconds': round(self.get_timeout(), 2),
+            'consecutive_failures': self.consecutive_failures,
+            'total_calls': self.total_calls,
+            'total_failures': self.total_failures,
+            'last_error': self.last_error
+        }
+
+
+# Global provider health registry
+_provider_health: Dict[str, ProviderHealth] = {}
+_registry_lock = threading.Lock()
+
+
+def get_provider_health(name: str) -> ProviderHealth:
+    """Get or create the health tracker for a provider"""
+    health = _provider_health.get(name)
+    if health is None:
+        with _registry_lock:
+            health = _provider_health.get(name)
+            if health is None:
+                health = ProviderHealth(name, PROVIDER_DEFAULT_TIMEOUTS.get(name, 5.0))
+                _provider_health[name] = health
+    return health
+
+
+def tracked_request(provider: str, method: str, url: str, **kwargs) -> Optional["requests.Response"]:
+    """
+    Send an HTTP request through the provider's circuit breaker
+
+    The timeout is chosen adaptively. Exceptions, 429 and 5xx responses
+    count as failures; any other response counts as a success.
+
+    Args:
+        provider: Provider name
+        method: HTTP method ('get' or 'post')
+        url: Request URL
+        **kwargs: Passed through to requests (timeout is overridden)
+
+    Returns:
+        requests.Response, or None if the breaker is open or the call raised
+    """
+    health = get_provider_health(provider)
+    if not health.allow_request():
+        print(f"{provider} skipped: circuit breaker open")
+        return None
+
+    kwargs['timeout'] = health.get_timeout()
+    start = time.perf_counter()
+
+    try:
+        response = requests.request(method, url, **kwargs)
+    except Exception as e:
+        latency = time.perf_counter() - start
+        health.record_failure(latency, type(e).__name__)
+        OUTBOUND_REQUEST_SECONDS.observe(latency, provider=provider, outcome="exception")
+        print(f"{provider} API exception: {e}")
+        return None
+
+    latency = time.perf_counter() - start
+    if response.status_code == 429 or response.status_code >= 500:
+        health.record_failure(latency, f"HTTP {response.status_code}")
+        OUTBOUND_REQUEST_SECONDS.observe(latency, provider=provider, outcome="failure")
+    else:
+        health.record_success(latency)
+        OUTBOUND_REQUEST_SECONDS.observe(latency, provider=provider, outcome="success")
+
+    return response
+
+
+def summarize_health(providers: List[str]) -> str:
+    """
+    Summarize breaker states into a service status
+
+    Returns:
+        str: 'operational', 'degraded' or 'unavailable'
+    """
+    states = [get_provider_health(name).get_status()['state'] for name in providers]
+    if all(state == CLOSED for state in states):
+        return "operational"
+    if all(state == OPEN for state in states):
+        return "unavailable"
+    return "degraded"
@@ -0,0 +1,236 @@
+"""
+Outbound Rate Limiter Service
+Per-provider token buckets with fair queuing and daily quota tracking
+
+Each caller reserves the next free slot in arrival order (GCRA-style token
+bucket), so waiters are served first-come first-served without polling.
+State can optionally live in a SQLite file so every worker process on the
+host shares one budget per provider.
+"""
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+# Optional shared state for multi-worker deployments (empty = per-process)
+RATE_LIMIT_STATE_DB = os.getenv("RATE_LIMIT_STATE_DB", "")
+
+# Longest a caller will queue for a slot before giving up on the provider
+DEFAULT_MAX_WAIT_SECONDS = float(os.getenv("RATE_LIMIT_MAX_WAIT_SECONDS", "10"))
+
+# Provider policies: requests per second, burst size, requests per day
+PROVIDER_LIMITS = {
+    'nominatim': {'rate_per_second': 1.0, 'burst': 1, 'daily_quota': None},     # OSM usage policy
+    'locationiq': {'rate_per_second': 2.0, 'burst': 2, 'daily_quota': 10000},  # Free tier
+    'opencage': {'rate_per_second': 1.0, 'burst': 1, 'daily_quota': 2500},     # Free tier
+}
+
+
+def _utc_day() -> str:
+    """Current UTC date, used to reset daily quotas"""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+class TokenBucket:
+    """
+    Token bucket for one provider
+
+    Instead of counting tokens, the bucket tracks the theoretical arrival
+    time (TAT) of the next request. A reservation returns how long the
+    caller must wait for its slot and advances the TAT by one interval,
+    which gives FIFO fairness between concurrent callers.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate_per_second: float,
+        burst: int = 1,
+        daily_quota: Optional[int] = None,
+        state_db: str = RATE_LIMIT_STATE_DB
+    ):
+        self.name = name
+        self.interval = 1.0 / rate_per_second
+        self.burst = max(1, burst)
+        self.daily_quota = daily_quota
+        self.state_db = state_db
+
+        self._lock = threading.Lock()
+        self._tat = 0.0
+        self._quota_day = _utc_day()
+        self._quota_used = 0
+
+        if state_db:
+            self._init_shared_state()
+
+    # --------------------------------------------------------
+    # Shared (cross-process) state
+    # --------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.state_db, timeout=10, isolation_level=None)
+
+    def _init_shared_state(self):
+        """Create the shared state table; fall back to local state on failure"""
+        try:
+            directory = os.path.dirname(self.state_db)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS rate_limit_state ("
+                    "provider TEXT PRIMARY KEY, "
+                    "tat REAL NOT NULL, "
+                    "quota_day TEXT NOT NULL, "
+                    "quota_used INTEGER NOT NULL)"
+                )
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"Rate limiter '{self.name}': shared state unavailable ({e}), using per-process state")
+            self.state_db = ""
+
+    def _reserve_shared(self, now: float, max_wait: Optional[float]) -> Optional[float]:
+        """Reserve a slot inside an exclusive SQLite transaction"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT tat, quota_day, quota_used FROM rate_limit_state WHERE provider = ?",
+                (self.name,)
+            ).fetchone()
+            tat, quota_day, quota_used = row if row else (0.0, _utc_day(), 0)
+
+            wait, new_tat, quota_day, quota_used = self._compute_reservation(
+                now, tat, quota_day, quota_used, max_wait
+            )
+            if wait is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_limit_state (provider, tat, quota_day, quota_used) "
+                    "VALUES (?, ?, ?, ?)",
+                    (self.name, new_tat, quota_day, quota_used)
+                )
+            conn.execute("COMMIT")
+
+            # Mirror for status reporting
+            self._tat, self._quota_day, self._quota_used = new_tat, quota_day, quota_used
+            return wait
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    # --------------------------------------------------------
+    # Reservation logic
+    # --------------------------------------------------------
+
+    def _compute_reservation(self, now, tat, quota_day, quota_used, max_wait):
+        """
+        Compute a reservation from bucket state
+
+        Returns:
+            tuple: (wait_seconds or None if refused, new_tat, quota_day, quota_used)
+        """
+        today = _utc_day()
+        if quota_day != today:
+            quota_day, quota_used = today, 0
+
+        if self.daily_quota is not None and quota_used >= self.daily_quota:
+            return None, tat, quota_day, quota_used
+
+        # A full bucket lets `burst` requests through back to back
+        burst_tolerance = (self.burst - 1) * self.interval
+        start = max(now, tat - burst_tolerance)
+        wait = start - now
+
+        if max_wait is not None and wait > max_wait:
+            return None, tat, quota_day, quota_used
+
+        new_tat = max(tat, now) + self.interval
+        return wait, new_tat, quota_day, quota_used + 1
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Reserve the next slot for this provider
+
+        Args:
+            max_wait: Refuse the reservation if the wait would exceed this
+
+        Returns:
+            float: Seconds to wait before sending, or None if refused
+                   (queue too long or daily quota exhausted)
+        """
+        now = time.time()
+        with self._lock:
+            if self.state_db:
+                try:
+                    return self._reserve_shared(now, max_wait)
+                except Exception as e:
+                    print(f"Rate limiter '{self.name}' shared state error: {e}")
+
+            wait, self._tat, self._quota_day, self._quota_used = self._compute_reservation(
+                now, self._tat, self._quota_day, self._quota_used, max_wait
+            )
+            return wait
+
+    def acquire(self, max_wait: Optional[float] = DEFAULT_MAX_WAIT_SECONDS) -> bool:
+        """
+        Block the calling thread until a slot is available
+
+        Returns:
+            bool: True if the request may be sent, False if refused
+        """
+        wait = self.reserve(max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    def get_status(self) -> Dict:
+        """Get current bucket status"""
+        with self._lock:
+            quota_used = self._quota_used if self._quota_day == _utc_day() else 0
+            return {
+                'rate': f"{1.0 / self.interval:g} request(s)/second",
+                'burst': self.burst,
+                'queue_delay_seconds': round(max(0.0, self._tat - time.time()), 3),
+                'daily_quota': self.daily_quota,
+                'daily_used': quota_used,
+                'daily_remaining': (
+                    max(0, self.daily_quota - quota_used) if self.daily_quota is not None else None
+                ),
+                'shared_state': bool(self.state_db)
+            }
+
+
+class RateLimiter:
+    """Registry of token buckets keyed by provider name"""
+
+    def __init__(self, limits: Dict[str, Dict] = PROVIDER_LIMITS):
+        self.buckets = {name: TokenBucket(name, **policy) for name, policy in limits.items()}
+
+    def acquire(self, provider: str, max_wait: Optional[float] = DEFAULT_MAX_WAIT_SECONDS) -> bool:
+        """Acquire a slot for a provider (providers without a policy are unlimited)"""
+        bucket = self.buckets.get(provider)
+        return bucket.acquire(max_wait) if bucket else True
+
+    def get_status(self) -> Dict:
+        """Get status for every rate-limited provider"""
+        return {name: bucket.get_status() for name, bucket in self.buckets.items()}
+
+
+# Global rate limiter instance
+_rate_limiter = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get or create the global rate limiter instance"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter()
+    return _rate_limiter
@@ -0,0 +1,252 @@
+"""
+Analysis Result Cache Service
+Caches finished fraud reports, keyed by a canonical hash of the listing fields
+
+Every key also carries the versions of the inputs a report depends on:
+- dataset: content hash of the dataset and locality reference files
+- lexicon: promotional keyword lists, category weights and the duplicate threshold
+- weights: fusion weights, thresholds, risk bands and the scheduling/verification mode
+
+When any version changes, stale entries can no longer be hit and the
+namespace is cleared from both tiers. Reports are stored as serialized
+JSON so a hit can be returned without re-validating or re-encoding it.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from app.services.analysis_pipeline import SHORT_CIRCUIT_POLICY
+from app.services.fusion import EXPLANATION_THRESHOLD, FRAUD_TYPE_THRESHOLD, FUSION_WEIGHTS, RISK_LEVELS
+from app.services.locality_profiles import LOCALITY_PROFILES_FILE
+from app.services.locality_registry import LOCALITY_COORDS_FILE, RELOAD_CHECK_INTERVAL_SECONDS
+from app.services.offline_geocoder import LOCATION_VERIFICATION_MODE
+from app.services.text_duplicate import DUPLICATE_THRESHOLD
+from app.services.text_manipulation import CATEGORY_WEIGHTS, PROMOTIONAL_KEYWORDS, categorize_keywords
+from app.utils.data_loader import INDIA_DATA_FILE, MUMBAI_DATA_FILE
+from app.utils.tiered_cache import DEFAULT_CACHE_DB, TieredCache
+
+ANALYSIS_CACHE_ENABLED = os.getenv("ANALYSIS_CACHE_ENABLED", "true").lower() == "true"
+ANALYSIS_CACHE_TTL_SECONDS = float(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", "3600"))
+# Reports where a provider was unavailable (fallback_modules) are only kept
+# this long, so the full check runs again once the provider recovers
+ANALYSIS_CACHE_FALLBACK_TTL_SECONDS = float(os.getenv("ANALYSIS_CACHE_FALLBACK_TTL_SECONDS", "60"))
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "2000"))
+ANALYSIS_CACHE_SQLITE = os.getenv("ANALYSIS_CACHE_SQLITE", "true").lower() == "true"
+
+# Files whose content defines the dataset version
+DATASET_FILES = (INDIA_DATA_FILE, MUMBAI_DATA_FILE, LOCALITY_COORDS_FILE, LOCALITY_PROFILES_FILE)
+
+# Entry holding the versions the stored reports were computed with
+VERSIONS_KEY = "__versions__"
+
+# X-Cache header values
+CACHE_HIT = "HIT"
+CACHE_MISS = "MISS"
+CACHE_BYPASS = "BYPASS"
+
+
+def fingerprint(value) -> str:
+    """
+    Short, stable hash of a JSON-serializable value
+
+    Args:
+        value: Dict/list/scalar (sets are hashed in sorted order)
+
+    Returns:
+        str: First 16 hex characters of the SHA-256 of its canonical JSON
+    """
+    canonical = json.dumps(
+        value, sort_keys=True, separators=(',', ':'), ensure_ascii=False,
+        default=lambda v: sorted(v) if isinstance(v, (set, frozenset)) else str(v)
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def canonical_listing_hash(listing: Dict) -> str:
+    """
+    Content address of a listing
+
+    Field order does not matter and numbers are compared as floats
+    (a price of 5000000 and 5000000.0 share an entry). Strings are kept
+    as-is, since whitespace and case can change the text analysis.
+
+    Args:
+        listing: ListingData fields
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    normalized = {
+        key: float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else value
+        for key, value in listing.items()
+    }
+    canonical = json.dumps(normalized, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def lexicon_version() -> str:
+    """Version of the text-analysis lexicon"""
+    return fingerprint({
+        'keywords': PROMOTIONAL_KEYWORDS,
+        'categories': categorize_keywords(),
+        'category_weights': CATEGORY_WEIGHTS,
+        'duplicate_threshold': DUPLICATE_THRESHOLD
+    })
+
+
+def weights_version() -> str:
+    """Version of the fusion weights and scoring configuration"""
+    return fingerprint({
+        'fusion_weights': FUSION_WEIGHTS,
+        'fraud_type_threshold': FRAUD_TYPE_THRESHOLD,
+        'explanation_threshold': EXPLANATION_THRESHOLD,
+        'risk_levels': RISK_LEVELS,
+        'short_circuit_policy': SHORT_CIRCUIT_POLICY,
+        'verification_mode': LOCATION_VERIFICATION_MODE
+    })
+
+
+def _file_signature(paths) -> Tuple:
+    """(path, size, mtime) of each existing file - cheap change detection"""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            continue
+    return tuple(signature)
+
+
+def dataset_version(paths=DATASET_FILES) -> str:
+    """Content hash of the dataset and locality reference files"""
+    digest = hashlib.sha256()
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        digest.update(path.encode('utf-8'))
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+class AnalysisResultCache:
+    """Content-addressed cache of serialized fraud reports"""
+
+    def __init__(
+        self,
+        ttl_seconds: float = ANALYSIS_CACHE_TTL_SECONDS,
+        max_entries: int = ANALYSIS_CACHE_MAX_ENTRIES,
+        use_sqlite: bool = ANALYSIS_CACHE_SQLITE
+    ):
+        self._cache = TieredCache(
+            namespace="analysis_results",
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+            db_path=DEFAULT_CACHE_DB if use_sqlite else None
+        )
+        # The lexicon and weights are code constants; they only change on restart
+        self._static_versions = {'lexicon': lexicon_version(), 'weights': weights_version()}
+        self._versions: Optional[Dict[str, str]] = None
+        self._version_tag = ""
+        self._file_signature: Optional[Tuple] = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self.invalidations = 0
+
+    def versions(self) -> Dict[str, str]:
+        """
+        Current dataset/lexicon/weights versions
+
+        Data files are re-checked at most every RELOAD_CHECK_INTERVAL_SECONDS
+        and only re-hashed when their size or mtime changed. A version change
+        clears the cache (including entries persisted by an earlier run).
+
+        Returns:
+            dict: {'dataset', 'lexicon', 'weights'} version strings
+        """
+        now = time.monotonic()
+        if self._versions is not None and now - self._last_check < RELOAD_CHECK_INTERVAL_SECONDS:
+            return self._versions
+
+        with self._lock:
+            self._last_check = now
+            signature = _file_signature(DATASET_FILES)
+            if self._versions is not None and signature == self._file_signature:
+                return self._versions
+
+            versions = {'dataset': dataset_version(), **self._static_versions}
+            self._file_signature = signature
+
+            stored = self._cache.get(VERSIONS_KEY)
+            if stored is not None and stored != versions:
+                print(f"Analysis cache: versions changed ({stored} -> {versions}), invalidating")
+                self._cache.clear()
+                self.invalidations += 1
+            if stored != versions:
+                self._cache.set(VERSIONS_KEY, versions, ttl_seconds=10 * 365 * 24 * 3600)
+
+            self._versions = versions
+            self._version_tag = fingerprint(versions)
+            return versions
+
+    def make_key(self, listing: Dict, explain: bool = True) -> str:
+        """Build the cache key for a listing analysis"""
+        self.versions()
+        return f"{self._version_tag}:{int(explain)}:{canonical_listing_hash(listing)}"
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached report
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            str: Serialized FraudReport JSON, or None on miss
+        """
+        return self._cache.get(key)
+
+    def set(self, key: str, report_json: str, fallback: bool = False):
+        """
+        Store a serialized FraudReport
+
+        Args:
+            key: Key from make_key
+            report_json: Serialized FraudReport
+            fallback: The report used a transient fallback (non-empty
+                      fallback_modules); it expires after
+                      ANALYSIS_CACHE_FALLBACK_TTL_SECONDS instead
+        """
+        self._cache.set(key, report_json, ttl_seconds=ANALYSIS_CACHE_FALLBACK_TTL_SECONDS if fallback else None)
+
+    def invalidate(self):
+        """Drop every cached report"""
+        with self._lock:
+            self._cache.clear()
+            self._versions = None
+            self.invalidations += 1
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics"""
+        stats = self._cache.get_stats()
+        stats['enabled'] = ANALYSIS_CACHE_ENABLED
+        stats['versions'] = self.versions()
+        stats['invalidations'] = self.invalidations
+        return stats
+
+
+# Global result cache instance
+_result_cache = None
+
+
+def get_result_cache() -> AnalysisResultCache:
+    """Get or create the global analysis result cache instance"""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = AnalysisResultCache()
+    return _result_cache
@@ -0,0 +1,71 @@
+"""
+Single-Flight Request Coalescing
+Concurrent identical lookups share one in-flight call and all receive its result
+"""
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls by key
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is in flight wait on the same future. Nothing is cached
+    once the call completes - pair with a cache for that.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) unless an identical call is already in flight
+
+        Args:
+            key: Normalized request key
+            fn: Function to call (blocking)
+
+        Returns:
+            The function result (exceptions propagate to every waiter)
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._in_flight[key] = future
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def get_stats(self) -> Dict:
+        """Get coalescing statistics"""
+        total = self.calls + self.coalesced
+        return {
+            'name': self.name,
+            'in_flight': len(self._in_flight),
+            'calls': self.calls,
+            'coalesced': self.coalesced,
+            'coalesced_rate': round(self.coalesced / total, 4) if total else 0.0
+        }
@@ -2,16 +2,19 @@
 Text Duplicate Detection Service
 Detects duplicate or highly similar listing descriptions using TF-IDF and cosine similarity
 """
+from app.utils.lazy_imports import lazy_attribute
 from app.utils.ml_imports import HAS_SKLEARN, HAS_NUMPY, np, get_unavailable_message
+from app.utils.metrics import STORE_WRITE_SECONDS
 
-# Conditional imports
+# Conditional imports (imported on first use, see app.utils.lazy_imports)
 if HAS_SKLEARN:
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
+    TfidfVectorizer = lazy_attribute("sklearn.feature_extraction.text", "TfidfVectorizer")
+    cosine_similarity = lazy_attribute("sklearn.metrics.pairwise", "cosine_similarity")
 
 import json
 import os
-from typing import Tuple, List
+import threading
+from typing import Tuple, List, Optional
 import re
 
 # Storage for text corpus
@@ -20,6 +23,14 @@ CORPUS_FILE = "app/data/text_corpus.json"
 # Similarity threshold
 DUPLICATE_THRESHOLD = 0.8  # 80% similarity = likely duplicate
 
+# Batch descriptions scored per sparse similarity product
+BATCH_CHUNK_SIZE = 256
+
+# Held across load -> score -> save when a description is saved (load ->
+# save for a batch), so two analyses running at once on the CPU pool
+# always see each other's text
+_corpus_lock = threading.Lock()
+
 
 def load_text_corpus() -> List[str]:
     """Load existing text descriptions from corpus"""
@@ -36,6 +47,17 @@ def load_text_corpus() -> List[str]:
 
 def save_to_corpus(description: str, metadata: dict = None):
     """Save description to corpus for future comparisons"""
+    save_many_to_corpus([description], metadata)
+
+
+def save_many_to_corpus(descriptions: List[str], metadata: dict = None):
+    """Save several descriptions to the corpus in one write"""
+    with _corpus_lock:
+        _append_to_corpus(descriptions, metadata)
+
+
+def _append_to_corpus(descriptions: List[str], metadata: dict = None):
+    """Append descriptions to the corpus file (caller holds _corpus_lock)"""
     corpus = []
     
     if os.path.exists(CORPUS_FILE):
@@ -45,16 +67,20 @@ def save_to_corpus(description: str, metadata: dict = None):
         except:
             corpus = []
     
-    # Add new description
-    corpus.append({
-        "description": description,
-        "metadata": metadata or {}
-    })
+    # Add new descriptions
+    for description in descriptions:
+        corpus.append({
+            "description": description,
+            "metadata": metadata or {}
+        })
     
-    # Save to file
-    os.makedirs(os.path.dirname(CORPUS_FILE), exist_ok=True)
-    with open(CORPUS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(corpus, f, indent=2, ensure_ascii=False)
+    # Save to a temporary file and swap it in, so readers never see a partial file
+    with STORE_WRITE_SECONDS.time(store="text_corpus"):
+        os.makedirs(os.path.dirname(CORPUS_FILE), exist_ok=True)
+        tmp_file = f"{CORPUS_FILE}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(corpus, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, CORPUS_FILE)
 
 
 def preprocess_text(text: str) -> str:
@@ -95,34 +121,189 @@ def detect_duplicate_text(description: str, save_to_corpus_flag: bool = True) ->
             - similar_count (int): Number of similar descriptions found
             - similar_texts (list): List of similar text snippets (first 100 chars)
     """
+    if not save_to_corpus_flag:
+        return score_duplicate_text(description, load_text_corpus())
+    
+    # Score and save as one step, so simultaneous duplicates see each other
+    with _corpus_lock:
+        result = score_duplicate_text(description, load_text_corpus())
+        _append_to_corpus([description])
+    
+    return result
+
+
+def detect_duplicate_text_batch(descriptions: List[str], save_to_corpus_flag: bool = True) -> List[Tuple[float, int, List[str]]]:
+    """
+    detect_duplicate_text over many descriptions, in order
+    
+    The corpus is read and written once, under the lock, and the batch is
+    scored afterwards without holding it. Each description is compared
+    against the corpus plus the descriptions before it (when saving), like
+    calling detect_duplicate_text one by one, except that the TF-IDF
+    weights are fitted once over the whole batch (see
+    score_duplicate_text_batch).
+    
+    Args:
+        descriptions: Listing descriptions to analyze
+        save_to_corpus_flag: Whether to save the descriptions to corpus
+        
+    Returns:
+        list: (duplicate_score, similar_count, similar_texts) per description
+    """
+    if not save_to_corpus_flag:
+        return score_duplicate_text_batch(descriptions, load_text_corpus(), compare_earlier=False)
+    
+    # Load and save as one step, so analyses running at the same time
+    # either see the whole batch or are seen by it
+    with _corpus_lock:
+        corpus = load_text_corpus()
+        if descriptions:
+            _append_to_corpus(descriptions)
+    
+    return score_duplicate_text_batch(descriptions, corpus, compare_earlier=True)
+
+
+def _make_vectorizer():
+    """TF-IDF settings shared by single and batch scoring"""
+    # Use character n-grams for better similarity detection
+    return TfidfVectorizer(
+        analyzer='word',
+        ngram_range=(1, 2),  # Unigrams and bigrams
+        max_features=1000,
+        stop_words='english'
+    )
+
+
+def _describe_similar(
+    similarities,
+    indices,
+    texts: List[str]
+) -> Tuple[float, int, List[str]]:
+    """
+    Turn similarities to earlier texts into a detection result
+    
+    Args:
+        similarities: Similarity to each text in indices
+        indices: Positions in texts, ascending
+        texts: Descriptions the indices refer to
+        
+    Returns:
+        tuple: (duplicate_score, similar_count, similar_texts)
+    """
+    similar_indices = indices[similarities >= DUPLICATE_THRESHOLD]
+    similar_values = similarities[similarities >= DUPLICATE_THRESHOLD]
+    
+    # Get highest similarity score
+    max_similarity = float(np.max(similarities)) if len(similarities) > 0 else 0.0
+    
+    # Get similar text snippets for explanation
+    similar_texts = []
+    for idx, similarity in zip(similar_indices[:3], similar_values[:3]):  # Top 3 similar texts
+        text_snippet = texts[idx][:100] + "..." if len(texts[idx]) > 100 else texts[idx]
+        similarity_percent = similarity * 100
+        similar_texts.append(f"{similarity_percent:.1f}% similar: \"{text_snippet}\"")
+    
+    return max_similarity, len(similar_indices), similar_texts
+
+
+def score_duplicate_text_batch(
+    descriptions: List[str],
+    corpus: List[str],
+    compare_earlier: bool = True
+) -> List[Tuple[float, int, List[str]]]:
+    """
+    Compare many descriptions against a corpus in one pass
+    
+    The vectorizer is fitted once over corpus + descriptions and the
+    similarities come from one sparse matrix product per chunk of rows,
+    instead of a refit per description. The IDF weights (and the 1000-term
+    vocabulary) therefore cover the whole batch, so scores can differ
+    slightly from scoring each description with score_duplicate_text.
+    
+    Args:
+        descriptions: Listing descriptions to analyze
+        corpus: Existing descriptions
+        compare_earlier: Also compare each description with the ones before it
+        
+    Returns:
+        list: (duplicate_score, similar_count, similar_texts) per description
+    """
+    if not HAS_SKLEARN or not HAS_NUMPY:
+        return [(0.2, 0, [get_unavailable_message()]) for _ in descriptions]
+    
+    texts = corpus + descriptions
+    offset = len(corpus)
+    
+    try:
+        tfidf_matrix = _make_vectorizer().fit_transform([preprocess_text(text) for text in texts])
+    except Exception as e:
+        print(f"Error in duplicate detection: {e}")
+        return [(0.0, 0, []) for _ in descriptions]
+    
+    results = []
+    for start in range(0, len(descriptions), BATCH_CHUNK_SIZE):
+        stop = min(start + BATCH_CHUNK_SIZE, len(descriptions))
+        # Rows this chunk may be compared with: the corpus, plus the batch
+        # up to the chunk's last description when comparing earlier ones
+        columns = offset + stop - 1 if compare_earlier else offset
+        if columns == 0:
+            results.extend((0.0, 0, []) for _ in range(start, stop))
+            continue
+        
+        similarities = cosine_similarity(
+            tfidf_matrix[offset + start:offset + stop],
+            tfidf_matrix[:columns],
+            dense_output=False
+        ).tocsr()
+        similarities.sort_indices()
+        
+        for row in range(stop - start):
+            limit = offset + start + row if compare_earlier else offset
+            if limit == 0:
+                # No existing data to compare against
+                results.append((0.0, 0, []))
+                continue
+            lo, hi = similarities.indptr[row], similarities.indptr[row + 1]
+            indices = similarities.indices[lo:hi]
+            values = similarities.data[lo:hi]
+            earlier = indices < limit
+            results.append(_describe_similar(values[earlier], indices[earlier], texts))
+    
+    return results
+
+
+def score_duplicate_text(
+    description: str,
+    corpus: List[str],
+    corpus_texts: Optional[List[str]] = None
+) -> Tuple[float, int, List[str]]:
+    """
+    Compare a description against a corpus (see detect_duplicate_text)
+    
+    Args:
+        description: Listing description to analyze
+        corpus: Existing descriptions
+        corpus_texts: The corpus already run through preprocess_text (optional)
+        
+    Returns:
+        tuple: (duplicate_score, similar_count, similar_texts)
+    """
     # Check if ML libraries are available
     if not HAS_SKLEARN or not HAS_NUMPY:
         # Basic keyword-based duplicate detection as fallback
-        if save_to_corpus_flag:
-            save_to_corpus(description)
         return 0.2, 0, [get_unavailable_message()]
     
-    # Load existing corpus
-    corpus = load_text_corpus()
-    
     if not corpus:
         # No existing data to compare against
-        if save_to_corpus_flag:
-            save_to_corpus(description)
         return 0.0, 0, []
     
     # Preprocess texts
     new_text = preprocess_text(description)
-    corpus_texts = [preprocess_text(text) for text in corpus]
+    if corpus_texts is None:
+        corpus_texts = [preprocess_text(text) for text in corpus]
     
     # Create TF-IDF vectorizer
-    # Use character n-grams for better similarity detection
-    vectorizer = TfidfVectorizer(
-        analyzer='word',
-        ngram_range=(1, 2),  # Unigrams and bigrams
-        max_features=1000,
-        stop_words='english'
-    )
+    vectorizer = _make_vectorizer()
     
     try:
         # Fit vectorizer on corpus + new text
@@ -152,17 +333,11 @@ def detect_duplicate_text(description: str, save_to_corpus_flag: bool = True) ->
             similarity_percent = similarities[idx] * 100
             similar_texts.append(f"{similarity_percent:.1f}% similar: \"{text_snippet}\"")
         
-        # Save to corpus if requested
-        if save_to_corpus_flag:
-            save_to_corpus(description)
-        
         return max_similarity, similar_count, similar_texts
         
     except Exception as e:
         print(f"Error in duplicate detection: {e}")
-        # On error, save to corpus and return safe values
-        if save_to_corpus_flag:
-            save_to_corpus(description)
+        # On error, return safe values
         return 0.0, 0, []
 
 
@@ -2,9 +2,10 @@
 Text Fraud Detection Service
 Combines duplicate detection and manipulation detection for comprehensive text fraud analysis
 """
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 from app.services.text_duplicate import (
     detect_duplicate_text,
+    detect_duplicate_text_batch,
     get_duplicate_explanation
 )
 from app.services.text_manipulation import (
@@ -17,7 +18,8 @@ from app.services.text_manipulation import (
 def detect_text_fraud(
     title: str,
     description: str,
-    save_to_corpus: bool = True
+    save_to_corpus: bool = True,
+    explain: bool = True
 ) -> Tuple[float, List[str]]:
     """
     Comprehensive text fraud detection
@@ -31,38 +33,102 @@ def detect_text_fraud(
         title: Listing title
         description: Listing description
         save_to_corpus: Whether to save description to corpus
+        explain: Render explanations (an empty list is returned when False)
         
     Returns:
         tuple: (text_fraud_score, explanations)
             - text_fraud_score (float): 0.0 to 1.0, combined fraud score
             - explanations (list): List of human-readable explanations
     """
-    explanations = []
-    scores = []
-    
     # Combine title and description for analysis
     full_text = f"{title}. {description}"
     
-    # ============================================================
-    # 1. DUPLICATE DETECTION (TF-IDF + Cosine Similarity)
-    # ============================================================
     try:
-        duplicate_score, similar_count, similar_texts = detect_duplicate_text(
+        duplicate = detect_duplicate_text(
             description=full_text,
             save_to_corpus_flag=save_to_corpus
         )
+    except Exception as e:
+        print(f"Error in duplicate detection: {e}")
+        duplicate = None
+    
+    return combine_text_signals(full_text, description, duplicate, explain)
+
+
+def detect_text_fraud_batch(
+    titles: List[str],
+    descriptions: List[str],
+    save_to_corpus: bool = True,
+    explain: bool = True
+) -> List[Tuple[float, List[str]]]:
+    """
+    detect_text_fraud over many listings, in order
+    
+    Duplicate detection reads and writes the corpus once for the whole
+    batch and the TF-IDF weights are fitted once (see
+    detect_duplicate_text_batch); otherwise results match calling
+    detect_text_fraud for each listing in turn.
+    
+    Args:
+        titles: Listing titles
+        descriptions: Listing descriptions
+        save_to_corpus: Whether to save descriptions to corpus
+        explain: Render explanations (empty lists when False)
         
-        duplicate_explanation = get_duplicate_explanation(
-            duplicate_score=duplicate_score,
-            similar_count=similar_count,
-            similar_texts=similar_texts
-        )
+    Returns:
+        list: (text_fraud_score, explanations) per listing
+    """
+    full_texts = [f"{title}. {description}" for title, description in zip(titles, descriptions)]
+    
+    try:
+        duplicates = detect_duplicate_text_batch(full_texts, save_to_corpus_flag=save_to_corpus)
+    except Exception as e:
+        print(f"Error in duplicate detection: {e}")
+        duplicates = [None] * len(full_texts)
+    
+    return [
+        combine_text_signals(full_text, description, duplicate, explain)
+        for full_text, description, duplicate in zip(full_texts, descriptions, duplicates)
+    ]
+
+
+def combine_text_signals(
+    full_text: str,
+    description: str,
+    duplicate: Optional[Tuple[float, int, List[str]]],
+    explain: bool = True
+) -> Tuple[float, List[str]]:
+    """
+    Combine duplicate, promotional language and length signals
+    
+    Args:
+        full_text: Title and description combined
+        description: Listing description
+        duplicate: detect_duplicate_text result, or None if it failed
+        explain: Render explanations (an empty list is returned when False)
         
-        explanations.append(f"[Duplicate Analysis] {duplicate_explanation}")
+    Returns:
+        tuple: (text_fraud_score, explanations), see detect_text_fraud
+    """
+    explanations = []
+    scores = []
+    
+    # ============================================================
+    # 1. DUPLICATE DETECTION (TF-IDF + Cosine Similarity)
+    # ============================================================
+    if duplicate is not None:
+        duplicate_score, similar_count, similar_texts = duplicate
+        
+        if explain:
+            duplicate_explanation = get_duplicate_explanation(
+                duplicate_score=duplicate_score,
+                similar_count=similar_count,
+                similar_texts=similar_texts
+            )
+            explanations.append(f"[Duplicate Analysis] {duplicate_explanation}")
         scores.append(duplicate_score)
         
-    except Exception as e:
-        print(f"Error in duplicate detection: {e}")
+    else:
         explanations.append("[Duplicate Analysis] Could not perform duplicate detection.")
         scores.append(0.0)
     
@@ -74,12 +140,12 @@ def detect_text_fraud(
             description=full_text
         )
         
-        manipulation_explanation = get_manipulation_explanation(
-            manipulation_score=manipulation_score,
-            found_keywords=found_keywords
-        )
-        
-        explanations.append(f"[Promotional Language] {manipulation_explanation}")
+        if explain:
+            manipulation_explanation = get_manipulation_explanation(
+                manipulation_score=manipulation_score,
+                found_keywords=found_keywords
+            )
+            explanations.append(f"[Promotional Language] {manipulation_explanation}")
         scores.append(manipulation_score)
         
     except Exception as e:
@@ -107,6 +173,9 @@ def detect_text_fraud(
     # If either duplicate OR manipulation is high, we flag it
     text_fraud_score = max(scores) if scores else 0.0
     
+    if not explain:
+        return text_fraud_score, []
+    
     # Add summary explanation
     if text_fraud_score > 0.7:
         summary = (
@@ -0,0 +1,212 @@
+"""
+Warmup Service
+Loads reference data and builds the shared indexes at startup, tracking per-component readiness
+
+The application lifespan runs the warmup in the background, so the
+process accepts connections (liveness) right away while /ready answers
+503 until every required component is warm. Components run in order,
+each on the analysis CPU pool, and a failing component does not stop
+the ones after it. A failing required component (a transient database
+or disk error at boot) is retried with exponential backoff before it is
+marked failed.
+"""
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app import models
+from app.database import engine
+from app.services.analysis_pipeline import get_cpu_executor, run_in_executor
+from app.services.geocode_cache import get_geocode_cache
+from app.services.locality_profiles import get_locality_profiles
+from app.services.locality_registry import get_locality_registry
+from app.services.locality_resolver import get_locality_index
+from app.services.location_fraud import detect_location_fraud, get_locality_info
+from app.services.offline_geocoder import get_offline_geocoder
+from app.services.price_fraud import detect_price_fraud
+from app.services.result_cache import ANALYSIS_CACHE_ENABLED, get_result_cache
+from app.services.text_fraud import detect_text_fraud
+from app.utils.data_loader import get_dataset
+from app.utils.lazy_imports import import_report, preload
+
+# Attempts for a required component before it is marked failed
+WARMUP_MAX_ATTEMPTS = int(os.getenv("WARMUP_MAX_ATTEMPTS", "5"))
+
+# Delay before the first retry, doubled after every failure (capped)
+WARMUP_RETRY_BACKOFF_SECONDS = float(os.getenv("WARMUP_RETRY_BACKOFF_SECONDS", "1"))
+WARMUP_RETRY_MAX_BACKOFF_SECONDS = float(os.getenv("WARMUP_RETRY_MAX_BACKOFF_SECONDS", "30"))
+
+# Component states
+COMPONENT_PENDING = "pending"
+COMPONENT_WARMING = "warming"
+COMPONENT_READY = "ready"
+COMPONENT_FAILED = "failed"
+
+
+@dataclass
+class Component:
+    """Readiness of one warmed component"""
+    name: str
+    warm: Callable[[], object]
+    required: bool = True
+    status: str = COMPONENT_PENDING
+    seconds: Optional[float] = None
+    error: Optional[str] = None
+    attempts: int = 0
+
+    def to_dict(self) -> Dict:
+        """Component status for /ready"""
+        return {
+            'status': self.status,
+            'required': self.required,
+            'seconds': round(self.seconds, 3) if self.seconds is not None else None,
+            'error': self.error,
+            'attempts': self.attempts
+        }
+
+
+# ============================================================
+# WARMUP STEPS
+# ============================================================
+
+def _open_database():
+    """Create the tables and open a pooled connection"""
+    models.Base.metadata.create_all(bind=engine)
+    with engine.connect():
+        pass
+
+
+def _warm_result_cache():
+    """Hash the dataset files so the first lookup does not"""
+    if ANALYSIS_CACHE_ENABLED:
+        get_result_cache().versions()
+
+
+def _warm_analysis():
+    """
+    Score one reference listing through the local modules
+
+    Exercises the price, text and location code paths (and their lazily
+    built lookups) without saving anything to the text corpus.
+    """
+    df = get_dataset()
+    # Column access works for a DataFrame and the shared ReferenceDataset
+    locality, city, price = str(df['Locality'][0]), str(df['City'][0]), float(df['Price'][0])
+
+    detect_price_fraud(listing_price=price, locality=locality, city=city, df=df)
+    detect_text_fraud(
+        title="Spacious apartment",
+        description="Well maintained apartment close to schools and the station",
+        save_to_corpus=False
+    )
+    info = get_locality_info(locality)
+    if info is not None:
+        detect_location_fraud(
+            locality=locality,
+            latitude=info['latitude'],
+            longitude=info['longitude'],
+            city=city,
+            price=price,
+            return_details=True
+        )
+
+
+# (name, function, required) in warmup order; later steps reuse what earlier ones loaded
+WARMUP_STEPS: List[Tuple[str, Callable[[], object], bool]] = [
+    ('libraries', preload, False),
+    ('database', _open_database, True),
+    ('dataset', get_dataset, True),
+    ('locality_registry', get_locality_registry, True),
+    ('locality_index', get_locality_index, False),
+    ('locality_profiles', get_locality_profiles, False),
+    ('offline_geocoder', get_offline_geocoder, False),
+    ('geocode_cache', get_geocode_cache, False),
+    ('result_cache', _warm_result_cache, False),
+    ('analysis', _warm_analysis, False),
+]
+
+
+class WarmupState:
+    """Runs the warmup steps and reports readiness"""
+
+    def __init__(self, steps: List[Tuple[str, Callable[[], object], bool]] = WARMUP_STEPS):
+        self.components = [Component(name, warm, required) for name, warm, required in steps]
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    async def run(self):
+        """Warm every component in order (errors are recorded, not raised)"""
+        self.started_at = time.time()
+        for component in self.components:
+            start = time.perf_counter()
+            await self._warm(component)
+            component.seconds = time.perf_counter() - start
+        self.finished_at = time.time()
+        print(f"✅ Warmup finished in {self.finished_at - self.started_at:.2f}s (ready: {self.is_ready()})")
+
+    async def _warm(self, component: Component):
+        """
+        Warm one component, retrying a required one with exponential backoff
+
+        Optional components get a single attempt. The last error stays on
+        the component while it is retried.
+        """
+        cpu = get_cpu_executor()
+        max_attempts = max(1, WARMUP_MAX_ATTEMPTS) if component.required else 1
+        backoff = WARMUP_RETRY_BACKOFF_SECONDS
+        component.status = COMPONENT_WARMING
+        while True:
+            component.attempts += 1
+            try:
+                await run_in_executor(cpu, component.warm)
+                component.status = COMPONENT_READY
+                component.error = None
+                return
+            except asyncio.CancelledError:
+                component.status = COMPONENT_PENDING
+                raise
+            except Exception as e:
+                component.error = str(e)
+                if component.attempts >= max_attempts:
+                    print(f"⚠️ Warmup: {component.name} failed: {e}")
+                    component.status = COMPONENT_FAILED
+                    return
+                print(
+                    f"⚠️ Warmup: {component.name} failed (attempt {component.attempts}/{max_attempts}), "
+                    f"retrying in {backoff:g}s: {e}"
+                )
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, WARMUP_RETRY_MAX_BACKOFF_SECONDS)
+
+    def is_ready(self) -> bool:
+        """True when every required component is warm"""
+        return all(c.status == COMPONENT_READY for c in self.components if c.required)
+
+    def report(self) -> Dict:
+        """
+        Readiness report
+
+        Returns:
+            dict: ready flag, warmup progress, per-component status and
+                  the import-time report (see app.utils.lazy_imports)
+        """
+        return {
+            'ready': self.is_ready(),
+            'warmup_complete': self.finished_at is not None,
+            'components': {c.name: c.to_dict() for c in self.components},
+            'imports': import_report()
+        }
+
+
+# Global warmup state instance
+_warmup_state = None
+
+
+def get_warmup_state() -> WarmupState:
+    """Get or create the global warmup state instance"""
+    global _warmup_state
+    if _warmup_state is None:
+        _warmup_state = WarmupState()
+    return _warmup_state
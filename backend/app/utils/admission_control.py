@@ -0,0 +1,331 @@
+"""
+Admission Control Utility
+Bounded concurrency per route class with a short queue, shedding load when saturated
+
+Without admission control a traffic spike is accepted in full: every
+request then waits on the same external APIs and CPU pool, and all of
+them time out together. Each route class (interactive analysis, bulk
+analysis, uploads) now has a concurrency limit and a FIFO queue with a
+maximum wait. A request that finds the queue full gets 429 at once; one
+that waits too long gets 503. Both carry Retry-After, estimated from the
+class's recent service times, so clients back off instead of piling on.
+
+Optionally (ADMISSION_DEGRADE_LOCAL_ONLY) a single-listing /analyze that
+would be rejected runs the local modules only (see
+analysis_pipeline.run_analysis), under its own concurrency limit.
+
+The middleware is pure ASGI (no BaseHTTPMiddleware), so streaming
+responses pass through unbuffered; a streamed request holds its slot
+until the body is complete. Routes outside the classes, WebSockets and
+health checks are never limited.
+"""
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from starlette.responses import JSONResponse
+
+from app.config import AppConstants
+from app.schemas import create_error_response
+from app.utils.metrics import ADMISSION_WAIT_SECONDS
+
+ADMISSION_CONTROL_ENABLED = os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true"
+
+# Interactive analysis (/analyze, /image-fraud): (concurrent, queued, max wait)
+ADMISSION_INTERACTIVE_CONCURRENCY = int(os.getenv("ADMISSION_INTERACTIVE_CONCURRENCY", "32"))
+ADMISSION_INTERACTIVE_QUEUE = int(os.getenv("ADMISSION_INTERACTIVE_QUEUE", "64"))
+ADMISSION_INTERACTIVE_MAX_WAIT_MS = int(os.getenv("ADMISSION_INTERACTIVE_MAX_WAIT_MS", "1000"))
+
+# Bulk analysis (/analyze/batch, /analyze/bulk, /analyze/stream)
+ADMISSION_BULK_CONCURRENCY = int(os.getenv("ADMISSION_BULK_CONCURRENCY", "4"))
+ADMISSION_BULK_QUEUE = int(os.getenv("ADMISSION_BULK_QUEUE", "8"))
+ADMISSION_BULK_MAX_WAIT_MS = int(os.getenv("ADMISSION_BULK_MAX_WAIT_MS", "5000"))
+
+# Image uploads (/upload-images)
+ADMISSION_UPLOAD_CONCURRENCY = int(os.getenv("ADMISSION_UPLOAD_CONCURRENCY", "8"))
+ADMISSION_UPLOAD_QUEUE = int(os.getenv("ADMISSION_UPLOAD_QUEUE", "16"))
+ADMISSION_UPLOAD_MAX_WAIT_MS = int(os.getenv("ADMISSION_UPLOAD_MAX_WAIT_MS", "2000"))
+
+# Run /analyze local-only instead of rejecting it, up to this many at once
+ADMISSION_DEGRADE_LOCAL_ONLY = os.getenv("ADMISSION_DEGRADE_LOCAL_ONLY", "false").lower() == "true"
+ADMISSION_LOCAL_ONLY_CONCURRENCY = int(os.getenv("ADMISSION_LOCAL_ONLY_CONCURRENCY", "64"))
+
+# (method, path) -> route class
+ROUTE_CLASSES = {
+    ('POST', f"{AppConstants.API_PREFIX}/analyze"): 'interactive',
+    ('POST', f"{AppConstants.API_PREFIX}/image-fraud"): 'interactive',
+    ('POST', f"{AppConstants.API_PREFIX}/analyze/batch"): 'bulk',
+    ('POST', f"{AppConstants.API_PREFIX}/analyze/bulk"): 'bulk',
+    ('POST', f"{AppConstants.API_PREFIX}/analyze/stream"): 'bulk',
+    ('POST', f"{AppConstants.API_PREFIX}/upload-images"): 'upload',
+}
+
+# Routes that can run local-only instead of being rejected
+DEGRADABLE_ROUTES = {('POST', f"{AppConstants.API_PREFIX}/analyze")}
+
+# Request state key telling the handler to skip the network-bound modules
+LOCAL_ONLY_STATE_KEY = "admission_local_only"
+
+# Service time assumed for Retry-After before any request has finished
+DEFAULT_SERVICE_SECONDS = 1.0
+
+# Weight of the newest sample in the service time average
+SERVICE_TIME_SMOOTHING = 0.2
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted (status_code is 429 or 503)"""
+
+    def __init__(self, status_code: int, reason: str):
+        self.status_code = status_code
+        self.reason = reason
+        super().__init__(reason)
+
+
+class AdmissionGate:
+    """
+    Concurrency limit with a bounded FIFO queue for one route class
+
+    A released slot is handed straight to the oldest waiter, so queued
+    requests are admitted in arrival order and a newcomer cannot overtake
+    them. Only used from the event loop thread.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int = 0, max_wait_seconds: float = 0.0):
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.max_wait_seconds = max(0.0, max_wait_seconds)
+
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._service_seconds: Optional[float] = None
+
+        self.admitted = 0
+        self.rejected = 0
+        self.degraded = 0
+
+    async def acquire(self) -> float:
+        """
+        Wait for a slot
+
+        Returns:
+            float: Seconds spent queued
+
+        Raises:
+            AdmissionRejected: 429 if the queue is full, 503 if the wait expired
+        """
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return 0.0
+
+        if len(self._waiters) >= self.max_queue:
+            raise AdmissionRejected(429, f"{self.name} queue is full")
+
+        start = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await asyncio.wait_for(future, self.max_wait_seconds)
+        except asyncio.TimeoutError:
+            raise AdmissionRejected(503, f"no {self.name} slot freed up within {self.max_wait_seconds:g}s")
+        except asyncio.CancelledError:
+            # Client went away; pass on a slot handed over in the meantime
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+        finally:
+            try:
+                self._waiters.remove(future)
+            except ValueError:
+                pass
+        self.admitted += 1
+        return time.perf_counter() - start
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free now (no queueing)"""
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return True
+        return False
+
+    def release(self, service_seconds: Optional[float] = None):
+        """
+        Free a slot, handing it to the oldest waiter if there is one
+
+        Args:
+            service_seconds: How long the finished request held the slot
+                             (feeds the Retry-After estimate)
+        """
+        if service_seconds is not None:
+            if self._service_seconds is None:
+                self._service_seconds = service_seconds
+            else:
+                self._service_seconds += SERVICE_TIME_SMOOTHING * (service_seconds - self._service_seconds)
+
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)  # The slot moves to the waiter; active is unchanged
+                return
+        self.active -= 1
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait: time to drain the current queue"""
+        service = self._service_seconds if self._service_seconds is not None else DEFAULT_SERVICE_SECONDS
+        backlog = len(self._waiters) + self.active
+        return max(1, math.ceil(service * backlog / self.max_concurrent))
+
+    def get_stats(self) -> Dict:
+        """Gate statistics for status endpoints"""
+        return {
+            'active': self.active,
+            'queued': len(self._waiters),
+            'max_concurrent': self.max_concurrent,
+            'max_queue': self.max_queue,
+            'max_wait_ms': int(self.max_wait_seconds * 1000),
+            'avg_service_ms': round(self._service_seconds * 1000, 1) if self._service_seconds is not None else None,
+            'admitted': self.admitted,
+            'rejected': self.rejected,
+            'degraded': self.degraded
+        }
+
+
+class AdmissionController:
+    """Route classification and the gate of each route class"""
+
+    def __init__(self, degrade_local_only: bool = ADMISSION_DEGRADE_LOCAL_ONLY):
+        self.gates: Dict[str, AdmissionGate] = {
+            'interactive': AdmissionGate(
+                'interactive', ADMISSION_INTERACTIVE_CONCURRENCY,
+                ADMISSION_INTERACTIVE_QUEUE, ADMISSION_INTERACTIVE_MAX_WAIT_MS / 1000
+            ),
+            'bulk': AdmissionGate(
+                'bulk', ADMISSION_BULK_CONCURRENCY,
+                ADMISSION_BULK_QUEUE, ADMISSION_BULK_MAX_WAIT_MS / 1000
+            ),
+            'upload': AdmissionGate(
+                'upload', ADMISSION_UPLOAD_CONCURRENCY,
+                ADMISSION_UPLOAD_QUEUE, ADMISSION_UPLOAD_MAX_WAIT_MS / 1000
+            ),
+        }
+        self.degrade_local_only = degrade_local_only
+        self.local_only_gate = AdmissionGate('local_only', ADMISSION_LOCAL_ONLY_CONCURRENCY)
+
+    def classify(self, method: str, path: str) -> Optional[str]:
+        """Route class of a request (None if it is not limited)"""
+        return ROUTE_CLASSES.get((method, path.rstrip("/") or "/"))
+
+    def can_degrade(self, method: str, path: str) -> bool:
+        """True if the request may run local-only instead of being rejected"""
+        return self.degrade_local_only and (method, path.rstrip("/") or "/") in DEGRADABLE_ROUTES
+
+    def get_stats(self) -> Dict:
+        """Per-class gate statistics"""
+        stats = {
+            'enabled': ADMISSION_CONTROL_ENABLED,
+            'degrade_local_only': self.degrade_local_only,
+            'classes': {name: gate.get_stats() for name, gate in self.gates.items()}
+        }
+        if self.degrade_local_only:
+            stats['local_only'] = self.local_only_gate.get_stats()
+        return stats
+
+
+# Global admission controller instance
+_admission_controller = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get or create the global admission controller instance"""
+    global _admission_controller
+    if _admission_controller is None:
+        _admission_controller = AdmissionController()
+    return _admission_controller
+
+
+def is_local_only(request) -> bool:
+    """True if the admission controller admitted this request local-only"""
+    return bool(request.scope.get("state", {}).get(LOCAL_ONLY_STATE_KEY, False))
+
+
+def _rejection(error: AdmissionRejected, gate: AdmissionGate) -> JSONResponse:
+    """Fast 429/503 response with a Retry-After estimate"""
+    retry_after = gate.retry_after()
+    return JSONResponse(
+        status_code=error.status_code,
+        content=create_error_response(
+            message=f"Server is busy: {error.reason}. Retry after {retry_after}s.",
+            error_code="TOO_MANY_REQUESTS" if error.status_code == 429 else "OVERLOADED",
+            details={'route_class': gate.name, 'retry_after': retry_after}
+        ),
+        headers={"Retry-After": str(retry_after)}
+    )
+
+
+class AdmissionControlMiddleware:
+    """
+    Pure ASGI admission control (see module docstring)
+
+    Register it before CORSMiddleware so CORS stays the outer layer and
+    rejections still carry the CORS headers.
+    """
+
+    def __init__(self, app, controller: Optional[AdmissionController] = None):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ADMISSION_CONTROL_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        controller = self.controller or get_admission_controller()
+        method, path = scope["method"], scope["path"]
+        route_class = controller.classify(method, path)
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        gate = controller.gates[route_class]
+        start = time.perf_counter()
+        try:
+            await gate.acquire()
+        except AdmissionRejected as error:
+            waited = time.perf_counter() - start
+            if controller.can_degrade(method, path) and controller.local_only_gate.try_acquire():
+                gate.degraded += 1
+                ADMISSION_WAIT_SECONDS.observe(waited, route_class=route_class, outcome="degraded")
+                await self._run_local_only(scope, receive, send, controller.local_only_gate)
+                return
+            gate.rejected += 1
+            ADMISSION_WAIT_SECONDS.observe(waited, route_class=route_class, outcome="rejected")
+            await _rejection(error, gate)(scope, receive, send)
+            return
+
+        ADMISSION_WAIT_SECONDS.observe(time.perf_counter() - start, route_class=route_class, outcome="admitted")
+        admitted_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release(time.perf_counter() - admitted_at)
+
+    async def _run_local_only(self, scope, receive, send, gate: AdmissionGate):
+        """Run the request with the network-bound modules skipped"""
+        scope.setdefault("state", {})[LOCAL_ONLY_STATE_KEY] = True
+
+        async def send_marked(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), (b"x-admission", b"local-only")]}
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_marked)
+        finally:
+            gate.release(time.perf_counter() - started)
@@ -2,13 +2,40 @@
 Data Loader Utility
 Loads the real estate dataset for fraud detection modules
 """
-import pandas as pd
 import os
 
+from app.utils.lazy_imports import lazy_module
+from app.utils.reference_snapshot import SHARED_DATASET_ENABLED, open_reference_dataset
+
+# Imported on first use (see app.utils.lazy_imports)
+pd = lazy_module("pandas")
+
 # Dataset paths - Try India-wide dataset first, fallback to Mumbai
 INDIA_DATA_FILE = "app/data/india_real_estate.csv"
 MUMBAI_DATA_FILE = "app/data/real_estate.csv"
 
+# Locality profiles built into each shared snapshot (see app.services.locality_profiles)
+LOCALITY_PROFILES_SNAPSHOT_FILE = "locality_profiles.json"
+
+def dataset_file() -> str:
+    """
+    Path of the dataset file to load (India-wide first, then Mumbai)
+
+    Raises:
+        FileNotFoundError: If no dataset file exists
+    """
+    if os.path.exists(INDIA_DATA_FILE):
+        return INDIA_DATA_FILE
+    if os.path.exists(MUMBAI_DATA_FILE):
+        return MUMBAI_DATA_FILE
+    raise FileNotFoundError(
+        f"Dataset not found. Tried:\n"
+        f"  1. {INDIA_DATA_FILE}\n"
+        f"  2. {MUMBAI_DATA_FILE}\n"
+        "Please generate the dataset first using generate_hyderabad_data.py"
+    )
+
+
 def load_dataset():
     """
     Load the real estate dataset
@@ -29,19 +56,11 @@ def load_dataset():
         FileNotFoundError: If no dataset file exists
     """
     # Try India-wide dataset first
-    if os.path.exists(INDIA_DATA_FILE):
-        data_file = INDIA_DATA_FILE
+    data_file = dataset_file()
+    if data_file == INDIA_DATA_FILE:
         print(f"📂 Loading India-wide dataset: {INDIA_DATA_FILE}")
-    elif os.path.exists(MUMBAI_DATA_FILE):
-        data_file = MUMBAI_DATA_FILE
-        print(f"📂 Loading Mumbai dataset: {MUMBAI_DATA_FILE}")
     else:
-        raise FileNotFoundError(
-            f"Dataset not found. Tried:\n"
-            f"  1. {INDIA_DATA_FILE}\n"
-            f"  2. {MUMBAI_DATA_FILE}\n"
-            "Please generate the dataset first using generate_hyderabad_data.py"
-        )
+        print(f"📂 Loading Mumbai dataset: {MUMBAI_DATA_FILE}")
     
     # Load dataset
     df = pd.read_csv(data_file, encoding='utf-8', on_bad_lines='skip')
@@ -60,3 +79,73 @@ def load_dataset():
     print(f"   Price range: ₹{df['Price'].min():,.0f} - ₹{df['Price'].max():,.0f}")
     
     return df
+
+
+def _build_locality_profiles(df) -> dict:
+    """Locality profiles and boundaries for a new snapshot (see app.data.build_locality_profiles)"""
+    # Imported here: the builder itself loads data through this module
+    from app.data.build_locality_profiles import build_locality_profiles
+    return build_locality_profiles(df)
+
+
+def load_shared_dataset():
+    """
+    Attach to the memory-mapped snapshot of the dataset shared by all workers
+
+    A new snapshot (i.e. a changed dataset file) also gets freshly built
+    locality profiles and boundaries (LOCALITY_PROFILES_SNAPSHOT_FILE).
+    Falls back to a private DataFrame if the snapshot cannot be built or
+    opened (e.g. a read-only data directory).
+
+    Returns:
+        ReferenceDataset or pd.DataFrame: See app.utils.reference_snapshot
+    """
+    try:
+        return open_reference_dataset(
+            dataset_file(),
+            load_dataset,
+            derived={LOCALITY_PROFILES_SNAPSHOT_FILE: _build_locality_profiles}
+        )
+    except FileNotFoundError:
+        raise
+    except Exception as e:
+        print(f"⚠️ Shared reference snapshot unavailable ({e}), loading a private copy")
+        return load_dataset()
+
+
+# Process-wide dataset instance (loaded on first use)
+_dataset = None
+
+
+def get_dataset():
+    """
+    Get the shared dataset instance, loading it on first use
+    
+    With SHARED_DATASET_ENABLED (the default) this is the memory-mapped
+    snapshot shared between worker processes, otherwise a DataFrame.
+    
+    Returns:
+        ReferenceDataset or pd.DataFrame: Real estate dataset
+    
+    Raises:
+        FileNotFoundError: If no dataset file exists
+    """
+    global _dataset
+    if _dataset is None:
+        _dataset = load_shared_dataset() if SHARED_DATASET_ENABLED else load_dataset()
+    return _dataset
+
+
+def get_loaded_dataset():
+    """
+    Get the shared dataset if it has been loaded, without loading it
+    
+    Request handlers use this so they never block on the CSV read; the
+    application lifespan loads the dataset in the background at startup
+    (see app.services.warmup).
+    
+    Returns:
+        ReferenceDataset, pd.DataFrame or None: The dataset (see get_dataset),
+            or None while it is not loaded
+    """
+    return _dataset
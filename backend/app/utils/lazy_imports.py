@@ -0,0 +1,233 @@
+"""
+Lazy Imports Utility
+Defers heavy optional dependencies until first use, and reports what importing them cost
+
+pandas, NumPy, scikit-learn, geopy, requests, Pillow/imagehash and joblib
+take seconds to import together, and every worker paid that before it
+could answer a health check. Modules now bind them through lazy_module and
+lazy_attribute: the real import happens on the first attribute access (or
+call). The startup warmup triggers it in the background with preload().
+Availability checks use importlib.util.find_spec, which does not import.
+
+Run `python -m app.utils.lazy_imports` for an import-time profile of app.main.
+"""
+import importlib
+import importlib.util
+import subprocess
+import sys
+import threading
+import time
+import types
+from typing import Dict, List, Tuple
+
+# Dependencies that must not be imported eagerly at startup (profile report)
+HEAVY_MODULES = ('pandas', 'numpy', 'sklearn', 'scipy', 'geopy', 'requests', 'PIL', 'imagehash', 'joblib')
+
+# Module name -> seconds its first import took through this layer
+_import_seconds: Dict[str, float] = {}
+_lazy_modules: Dict[str, "LazyModule"] = {}
+_lazy_attributes: List["LazyAttribute"] = []
+_lock = threading.Lock()
+
+
+def module_available(name: str) -> bool:
+    """
+    Check whether a top-level package is installed, without importing it
+
+    Args:
+        name: Top-level package name (e.g. 'sklearn')
+    """
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def _import(name: str) -> types.ModuleType:
+    """Import a module, recording how long the first import took"""
+    if name in _import_seconds:
+        return importlib.import_module(name)
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    with _lock:
+        _import_seconds.setdefault(name, time.perf_counter() - start)
+    return module
+
+
+class LazyModule(types.ModuleType):
+    """
+    Module placeholder that imports the real module on first attribute access
+
+    After loading, the real module's attributes are copied onto the
+    placeholder, so later lookups are plain attribute reads.
+    """
+
+    def __getattr__(self, attr: str):
+        module = _import(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+    def __dir__(self):
+        return dir(_import(self.__name__))
+
+
+class LazyAttribute:
+    """Callable placeholder for a function or class of a lazily imported module"""
+
+    __slots__ = ('module_name', 'name', '_target')
+
+    def __init__(self, module_name: str, name: str):
+        self.module_name = module_name
+        self.name = name
+        self._target = None
+
+    def resolve(self):
+        """Import the module and return the real attribute"""
+        target = self._target
+        if target is None:
+            target = self._target = getattr(_import(self.module_name), self.name)
+        return target
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"<lazy {self.module_name}.{self.name}>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    """
+    Get a placeholder for a module, imported on first use
+
+    Args:
+        name: Full module name (e.g. 'numpy', 'geopy.distance')
+
+    Returns:
+        LazyModule: Shared placeholder for that module
+    """
+    with _lock:
+        module = _lazy_modules.get(name)
+        if module is None:
+            module = _lazy_modules[name] = LazyModule(name)
+        return module
+
+
+def lazy_attribute(module_name: str, name: str) -> LazyAttribute:
+    """
+    Get a callable placeholder for `from module_name import name`
+
+    Args:
+        module_name: Module defining the attribute
+        name: Function or class name
+
+    Returns:
+        LazyAttribute: Calls through to the real attribute
+    """
+    attribute = LazyAttribute(module_name, name)
+    with _lock:
+        _lazy_attributes.append(attribute)
+    return attribute
+
+
+def preload() -> Dict[str, float]:
+    """
+    Import every dependency registered so far (for the startup warmup)
+
+    Missing optional packages are skipped.
+
+    Returns:
+        dict: Module name -> first import time in seconds
+    """
+    with _lock:
+        names = list(_lazy_modules)
+        attributes = list(_lazy_attributes)
+    for name in names:
+        try:
+            _import(name)
+        except ImportError as e:
+            print(f"Lazy import: {name} unavailable ({e})")
+    for attribute in attributes:
+        try:
+            attribute.resolve()
+        except (ImportError, AttributeError) as e:
+            print(f"Lazy import: {attribute.module_name}.{attribute.name} unavailable ({e})")
+    return dict(_import_seconds)
+
+
+def record_import_time(name: str, seconds: float):
+    """Record an import measured elsewhere (e.g. the application module itself)"""
+    with _lock:
+        _import_seconds.setdefault(name, seconds)
+
+
+def import_report() -> Dict:
+    """
+    Import-time report for status endpoints
+
+    Returns:
+        dict: 'imported' (module -> ms, for imports made through this layer
+              or recorded with record_import_time), 'deferred' (registered
+              modules nothing has imported yet) and 'heavy_loaded' (HEAVY_MODULES
+              present in sys.modules)
+    """
+    with _lock:
+        imported = {name: round(seconds * 1000, 1) for name, seconds in _import_seconds.items()}
+        registered = set(_lazy_modules) | {a.module_name for a in _lazy_attributes}
+    return {
+        'imported': imported,
+        'deferred': sorted(name for name in registered if name not in sys.modules),
+        'heavy_loaded': [name for name in HEAVY_MODULES if name in sys.modules]
+    }
+
+
+# ============================================================
+# IMPORT-TIME PROFILE (python -m app.utils.lazy_imports)
+# ============================================================
+
+def profile_imports(target: str = "app.main") -> List[Tuple[float, float, str]]:
+    """
+    Profile a fresh interpreter importing target (python -X importtime)
+
+    Args:
+        target: Module to import
+
+    Returns:
+        list: (cumulative seconds, self seconds, module name), slowest first
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            rows.append((int(cumulative_us) / 1e6, int(self_us) / 1e6, name.rstrip()))
+        except ValueError:
+            continue  # Header line
+    return sorted(rows, reverse=True)
+
+
+def print_profile(target: str = "app.main", top: int = 25):
+    """Print the slowest imports of target and which heavy dependencies it pulled in"""
+    rows = profile_imports(target)
+    if not rows:
+        print(f"Could not profile {target} (does it import?)")
+        return
+
+    total = next((cumulative for cumulative, _, name in rows if name.strip() == target), rows[0][0])
+    print(f"Import time of {target}: {total:.3f}s")
+    print(f"{'cumulative':>11} {'self':>9}  module")
+    for cumulative, self_time, name in rows[:top]:
+        print(f"{cumulative:>10.3f}s {self_time:>8.3f}s  {name}")
+
+    top_level = {name.strip() for _, _, name in rows}
+    eager = [name for name in HEAVY_MODULES if name in top_level]
+    print(f"\nHeavy dependencies imported eagerly: {', '.join(eager) if eager else 'none'}")
+
+
+if __name__ == "__main__":
+    print_profile(sys.argv[1] if len(sys.argv) > 1 else "app.main")
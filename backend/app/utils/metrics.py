@@ -0,0 +1,274 @@
+"""
+Metrics Utility
+Latency histograms for the analysis hot path, exposed in the Prometheus text format
+
+All timers use time.perf_counter (monotonic). Histograms are cumulative
+per process, like the Prometheus client's: with several workers, each
+worker serves its own /metrics and the scraper aggregates.
+"""
+import bisect
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# Bucket upper bounds (seconds): sub-millisecond cache hits up to slow provider calls
+DEFAULT_LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"  # Starlette appends the charset
+
+
+def _format_value(value: float) -> str:
+    """Prometheus sample value formatting"""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(labels: Sequence[Tuple[str, str]]) -> str:
+    """Render {name="value",...} with Prometheus escaping"""
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Histogram:
+    """
+    Latency histogram with a fixed set of label names
+
+    Each label combination keeps per-bucket counts, a sum and a count.
+    Observations are a binary search over the bucket bounds under a lock.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # {label values: [bucket counts..., sum, count]}
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        """
+        Record one observation
+
+        Args:
+            value: Observed value (seconds)
+            **labels: One value per label name
+        """
+        if not METRICS_ENABLED:
+            return
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            i = bisect.bisect_left(self.buckets, value)
+            if i < len(self.buckets):
+                series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Time a block and record its duration"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        """Prometheus text exposition lines for this histogram"""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram"
+        ]
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+
+        for key in sorted(series):
+            values = series[key]
+            labels = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', _format_value(bound))])} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', '+Inf')])} {values[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(values[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {values[-1]}")
+        return lines
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        Count and mean per label combination (for JSON status endpoints)
+
+        Returns:
+            dict: "label=value,..." -> {'count', 'mean_ms'}
+        """
+        with self._lock:
+            series = {key: (values[-2], values[-1]) for key, values in self._series.items()}
+        return {
+            ",".join(f"{name}={value}" for name, value in zip(self.labelnames, key)): {
+                'count': count,
+                'mean_ms': round(total / count * 1000, 3) if count else 0.0
+            }
+            for key, (total, count) in sorted(series.items())
+        }
+
+
+class MetricsRegistry:
+    """Named collection of histograms"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+    ) -> Histogram:
+        """Get or create a histogram by name"""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Histogram(name, documentation, labelnames, buckets)
+            return metric
+
+    def get(self, name: str) -> Optional[Histogram]:
+        """Get a registered histogram"""
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Prometheus text exposition of every registered metric"""
+        lines = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        return "\n".join(lines) + "\n"
+
+
+# Global registry
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the global metrics registry"""
+    return _registry
+
+
+# ============================================================
+# HOT-PATH HISTOGRAMS
+# ============================================================
+
+ANALYSIS_REQUEST_SECONDS = _registry.histogram(
+    "analysis_request_seconds",
+    "End-to-end analysis time per endpoint",
+    ("endpoint",)
+)
+
+MODULE_SECONDS = _registry.histogram(
+    "analysis_module_seconds",
+    "Time spent in each fraud detection module",
+    ("module",)
+)
+
+OUTBOUND_REQUEST_SECONDS = _registry.histogram(
+    "outbound_request_seconds",
+    "Outbound HTTP call time per provider and outcome",
+    ("provider", "outcome")
+)
+
+CACHE_LOOKUP_SECONDS = _registry.histogram(
+    "cache_lookup_seconds",
+    "Cache lookup time per cache namespace and result",
+    ("cache", "result")
+)
+
+STORE_WRITE_SECONDS = _registry.histogram(
+    "store_write_seconds",
+    "Persistent write time per store (database tables, cache tiers, text corpus)",
+    ("store",)
+)
+
+ADMISSION_WAIT_SECONDS = _registry.histogram(
+    "admission_wait_seconds",
+    "Time requests waited for an admission slot per route class and outcome",
+    ("route_class", "outcome")
+)
+
+
+class Timings:
+    """
+    Per-request stopwatch that also feeds a histogram
+
+    Collects named durations (milliseconds) for the optional timings block
+    of a fraud report. Safe to use from worker threads.
+    """
+
+    def __init__(self, histogram: Histogram = MODULE_SECONDS, label: str = "module"):
+        self.histogram = histogram
+        self.label = label
+        self.started = time.perf_counter()
+        self._durations: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, observe: bool = True):
+        """
+        Record a duration for a step
+
+        Args:
+            name: Step name
+            seconds: Duration
+            observe: Also feed the histogram (False for steps another histogram already covers)
+        """
+        if observe:
+            self.histogram.observe(seconds, **{self.label: name})
+        with self._lock:
+            self._durations[name] = self._durations.get(name, 0.0) + seconds
+
+    @contextmanager
+    def measure(self, name: str, observe: bool = True):
+        """Time a block as the named step (see record)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, observe)
+
+    def call(self, name: str, func, *args, **kwargs):
+        """Call func(*args, **kwargs), timing it as the named step"""
+        with self.measure(name):
+            return func(*args, **kwargs)
+
+    def as_dict(self) -> Dict[str, float]:
+        """
+        Durations in milliseconds, plus the elapsed total
+
+        Returns:
+            dict: Step name -> ms, and 'total' since the stopwatch started
+        """
+        with self._lock:
+            durations = {name: round(seconds * 1000, 3) for name, seconds in self._durations.items()}
+        durations['total'] = round((time.perf_counter() - self.started) * 1000, 3)
+        return durations
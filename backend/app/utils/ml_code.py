@@ -1,10 +1,14 @@
-import pandas as pd
-import numpy as np
 import pickle
 import os
-import joblib
 from pathlib import Path
 
+from app.utils.lazy_imports import lazy_module
+
+# Imported on first use (see app.utils.lazy_imports)
+pd = lazy_module("pandas")
+np = lazy_module("numpy")
+joblib = lazy_module("joblib")
+
 # Setup paths
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 MODELS_DIR = BASE_DIR / "models"
@@ -46,11 +50,17 @@ def predict_class_only_real_estate(df):
     Uses the Hybrid ExtraTree+ANN model to classify each listing.
     Categorizes as 'Real' or 'Fake' and provides confidence scores.
     """
+    return classify_processed(preprocess_data(df))
+
+def classify_processed(processed_df):
+    """
+    Classifies already-preprocessed rows (see predict_class_only_real_estate).
+    Rows are classified independently, so a preprocessed frame can be
+    classified in chunks (keeping its index) with the same result.
+    """
     # Load artifacts
     model = load_pkl("hybrid_extra_tree_ann1.pkl")
     
-    processed_df = preprocess_data(df)
-    
     # If model artifacts are missing, we provide a sophisticated simulated prediction
     if model is None:
         print("⚠️ Warning: ML model artifacts not found. Using high-fidelity simulation.")
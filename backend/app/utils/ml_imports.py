@@ -1,31 +1,23 @@
 """
 Conditional imports for optional ML dependencies
 Makes the app work without pandas, numpy, sklearn, etc.
+
+The libraries are bound lazily (see app.utils.lazy_imports): availability
+is checked without importing, and each library is imported on first use
+or by the startup warmup.
 """
+from app.utils.lazy_imports import lazy_module, module_available
+
+# pandas placeholder, or None if not installed
+HAS_PANDAS = module_available("pandas")
+pd = lazy_module("pandas") if HAS_PANDAS else None
+
+# numpy placeholder, or None if not installed
+HAS_NUMPY = module_available("numpy")
+np = lazy_module("numpy") if HAS_NUMPY else None
 
-# Try to import pandas, fallback to None
-try:
-    import pandas as pd
-    HAS_PANDAS = True
-except ImportError:
-    pd = None
-    HAS_PANDAS = False
-
-# Try to import numpy, fallback to None
-try:
-    import numpy as np
-    HAS_NUMPY = True
-except ImportError:
-    np = None
-    HAS_NUMPY = False
-
-# Try to import sklearn, fallback to None
-try:
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
-    HAS_SKLEARN = True
-except ImportError:
-    HAS_SKLEARN = False
+# sklearn is imported by the modules that use it (lazy_attribute)
+HAS_SKLEARN = module_available("sklearn")
 
 
 def check_ml_available():
@@ -0,0 +1,70 @@
+"""
+NDJSON Streaming Utility
+Incremental newline-delimited JSON reading and a full-duplex streaming response
+"""
+from typing import AsyncIterator, Optional
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def iter_ndjson_lines(chunks: AsyncIterator[bytes], max_line_bytes: int) -> AsyncIterator[Optional[bytes]]:
+    """
+    Split a byte stream into lines without buffering more than one line
+
+    Blank lines are skipped. A line longer than max_line_bytes is discarded
+    up to its newline and reported as None, so one bad record cannot grow
+    memory without bound or end the stream.
+
+    Args:
+        chunks: Async iterator of body chunks (e.g. Request.stream())
+        max_line_bytes: Longest accepted line
+
+    Yields:
+        bytes: One line (without the newline), or None for an oversized line
+    """
+    buffer = b""
+    skipping = False
+
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        lines = (buffer + chunk).split(b"\n")
+        buffer = lines.pop()  # Incomplete last line (or b"")
+
+        for line in lines:
+            if skipping:
+                skipping = False
+                continue
+            if len(line) > max_line_bytes:
+                yield None
+            elif line.strip():
+                yield line
+
+        if len(buffer) > max_line_bytes:
+            if not skipping:
+                yield None
+                skipping = True
+            buffer = b""
+
+    if buffer.strip() and not skipping:
+        yield buffer
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for endpoints that keep reading the request body while responding
+
+    Starlette's StreamingResponse watches for disconnects by calling
+    receive() in parallel, which would swallow request body messages. Here
+    receive() is left to the body reader, which sees the disconnect itself
+    (Request.stream() raises ClientDisconnect).
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,350 @@
+"""
+Reference Snapshot Utility
+Read-only, memory-mapped copy of the reference dataset shared by every worker process
+
+Each uvicorn/gunicorn worker used to parse the CSV into its own pandas
+DataFrame. The snapshot stores the dataset once on disk as one .npy file
+per column (string columns as int32 codes plus their categories), with
+the per-locality price statistics precomputed. Workers attach to it with
+numpy memory maps, so the pages are shared through the OS page cache
+instead of being copied into every worker's heap, and attaching does not
+need pandas.
+
+The snapshot directory is named after the source file's size and
+modification time, so an updated CSV produces a new snapshot. The first
+worker to start builds it (atomically, via a rename); the others attach.
+Files derived from the same data (e.g. the locality profiles) can be
+built into the snapshot alongside it, so they follow the dataset too.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Callable, Dict, List, Optional, Sequence
+
+from app.utils.lazy_imports import lazy_module
+
+# Imported on first use (see app.utils.lazy_imports)
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+
+# Share the reference dataset between workers through a memory-mapped snapshot
+SHARED_DATASET_ENABLED = os.getenv("SHARED_DATASET_ENABLED", "true").lower() == "true"
+
+# Directory holding the snapshots (one subdirectory per source version)
+REFERENCE_SNAPSHOT_DIR = os.getenv("REFERENCE_SNAPSHOT_DIR", "app/data/snapshots")
+
+# Bump when the on-disk layout changes so old snapshots are rebuilt
+SNAPSHOT_FORMAT_VERSION = 2
+
+# Fewer comparables than this and price analysis reports insufficient data
+MIN_COMPARABLES = 5
+
+# Precomputed price statistics, one array each (see ReferenceDataset.price_stats)
+PRICE_STATS = ('count', 'mean', 'median', 'std', 'q1', 'q3')
+
+META_FILE = "meta.json"
+
+
+def source_signature(source_path: str) -> str:
+    """
+    Short hash identifying a version of the source file
+
+    Args:
+        source_path: Dataset CSV path
+
+    Returns:
+        str: Hex digest of the format version, path, size and mtime
+    """
+    stat = os.stat(source_path)
+    key = f"{SNAPSHOT_FORMAT_VERSION}|{os.path.abspath(source_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+# ============================================================
+# BUILD (needs pandas; runs once per source version)
+# ============================================================
+
+def _price_location_column(df) -> str:
+    """Locality column price analysis filters on (see locality_price_stats)"""
+    if 'Location' in df.columns:
+        return 'Location'
+    if 'Locality' in df.columns:
+        return 'Locality'
+    return df.columns[2]
+
+
+def _write_columns(df, directory: str) -> List[Dict]:
+    """Save every column as .npy; returns the column descriptions for meta.json"""
+    columns = []
+    for index, name in enumerate(df.columns):
+        series = df[name]
+        entry = {'name': str(name), 'file': f"col{index}.npy"}
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            array = series.to_numpy()
+            entry['kind'] = 'numeric'
+        else:
+            codes, uniques = pd.factorize(series)
+            array = codes.astype(np.int32)
+            entry['kind'] = 'categorical'
+            # Non-string values read back as missing, like NaN
+            entry['categories'] = [value if isinstance(value, str) else None for value in uniques]
+        np.save(os.path.join(directory, entry['file']), array)
+        columns.append(entry)
+    return columns
+
+
+def _write_price_stats(df, directory: str) -> List[List[str]]:
+    """
+    Precompute the comparable-price statistics of every (city, locality)
+
+    Uses the same pandas operations, on the rows in the same order, as
+    app.services.price_fraud.locality_price_stats, so the results match it
+    exactly. Returns the group keys, aligned with the saved arrays.
+    """
+    loc_col = _price_location_column(df)
+    city_lower = df['City'].str.lower()
+    locality_lower = df[loc_col].str.lower()
+
+    keys = []
+    values = {name: [] for name in PRICE_STATS}
+    for (city, locality), positions in df.groupby([city_lower, locality_lower], sort=True).indices.items():
+        prices = df['Price'].iloc[positions]
+        keys.append([city, locality])
+        values['count'].append(len(prices))
+        values['mean'].append(prices.mean())
+        values['median'].append(prices.median())
+        values['std'].append(prices.std())
+        values['q1'].append(prices.quantile(0.25))
+        values['q3'].append(prices.quantile(0.75))
+
+    for name in PRICE_STATS:
+        dtype = np.int64 if name == 'count' else np.float64
+        np.save(os.path.join(directory, f"stats_{name}.npy"), np.asarray(values[name], dtype=dtype))
+    return keys
+
+
+def _write_derived(df, directory: str, derived: Dict[str, Callable[[object], object]]) -> List[str]:
+    """
+    Write the JSON files derived from df; returns the names written
+
+    A builder that fails is reported and left out, so the snapshot itself
+    is still usable (readers fall back to their packaged copy).
+    """
+    written = []
+    for filename, build in derived.items():
+        try:
+            table = build(df)
+        except Exception as e:
+            print(f"⚠️ Could not build {filename} for the snapshot: {e}")
+            continue
+        with open(os.path.join(directory, filename), "w", encoding="utf-8") as f:
+            json.dump(table, f, separators=(',', ':'))
+        written.append(filename)
+    return written
+
+
+def build_snapshot(
+    df,
+    directory: str,
+    signature: str,
+    derived: Optional[Dict[str, Callable[[object], object]]] = None
+) -> str:
+    """
+    Write a snapshot of df to directory (atomically)
+
+    The snapshot is written to a temporary sibling directory and renamed
+    into place. If another worker finished first, its snapshot is kept.
+
+    Args:
+        df: Reference dataset (pandas DataFrame with City and Price columns)
+        directory: Final snapshot directory
+        signature: Source signature stored in meta.json
+        derived: File name -> builder(df) returning a JSON-serializable
+                 value, written into the snapshot (see derived_file)
+
+    Returns:
+        str: directory
+    """
+    if 'City' not in df.columns or 'Price' not in df.columns:
+        raise ValueError("dataset needs City and Price columns to be shared")
+
+    parent = os.path.dirname(directory) or "."
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".build-", dir=parent)
+    try:
+        meta = {
+            'format': SNAPSHOT_FORMAT_VERSION,
+            'signature': signature,
+            'rows': len(df),
+            'columns': _write_columns(df, staging),
+            'cities': sorted(set(df['City'].str.lower().dropna())),
+            'groups': _write_price_stats(df, staging),
+            'derived': _write_derived(df, staging, derived or {})
+        }
+        with open(os.path.join(staging, META_FILE), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        try:
+            os.rename(staging, directory)
+        except OSError:
+            if not os.path.isdir(directory):
+                raise
+            # Another worker renamed its copy into place first
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return directory
+
+
+def _remove_stale_snapshots(keep: str):
+    """Best-effort removal of snapshots for older source versions"""
+    parent = os.path.dirname(keep) or "."
+    for name in os.listdir(parent):
+        path = os.path.join(parent, name)
+        if name.startswith("dataset-") and os.path.abspath(path) != os.path.abspath(keep):
+            # Workers still mapping old files keep them alive until they exit
+            shutil.rmtree(path, ignore_errors=True)
+
+
+# ============================================================
+# ATTACH (numpy only)
+# ============================================================
+
+class ReferenceDataset:
+    """
+    Read-only view of a snapshot, backed by memory-mapped arrays
+
+    Supports the parts of the DataFrame interface the services read:
+    len(), .columns and df[column] (a numeric array, or a list of strings
+    with None for missing values), plus the precomputed price_stats.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get('format') != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"snapshot format {meta.get('format')} is not {SNAPSHOT_FORMAT_VERSION}")
+
+        self.signature = meta['signature']
+        self._rows = meta['rows']
+        self._columns = {column['name']: column for column in meta['columns']}
+        self.columns = tuple(self._columns)
+        self._cities = frozenset(meta['cities'])
+        self._groups = {(city, locality): i for i, (city, locality) in enumerate(meta['groups'])}
+        self._derived = frozenset(meta.get('derived', ()))
+        self._arrays: Dict[str, object] = {}
+        self._stats = {name: self._map(f"stats_{name}.npy") for name in PRICE_STATS}
+
+    def _map(self, filename: str):
+        """Memory-map one array read-only"""
+        return np.load(os.path.join(self.directory, filename), mmap_mode='r', allow_pickle=False)
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._columns
+
+    def __getitem__(self, column: str) -> Sequence:
+        """
+        Column values in row order
+
+        Numeric columns are returned as the shared (read-only) array;
+        string columns are decoded into a new list.
+        """
+        entry = self._columns[column]
+        array = self._arrays.get(column)
+        if array is None:
+            array = self._arrays[column] = self._map(entry['file'])
+        if entry['kind'] == 'numeric':
+            return array
+        categories = entry['categories']
+        return [categories[code] if code >= 0 else None for code in array.tolist()]
+
+    def has_city(self, city: str) -> bool:
+        """True if any listing is in city (case-insensitive)"""
+        return city.lower() in self._cities
+
+    def price_stats(self, city: str, locality_key: str) -> dict:
+        """
+        Precomputed comparable-price statistics
+
+        Args:
+            city: City name
+            locality_key: Lowercased canonical locality name
+
+        Returns:
+            dict: Same as app.services.price_fraud.locality_price_stats
+        """
+        if not self.has_city(city):
+            return {'case': 'no_city_data'}
+
+        i = self._groups.get((city.lower(), locality_key))
+        count = int(self._stats['count'][i]) if i is not None else 0
+        if count < MIN_COMPARABLES:
+            return {'case': 'insufficient_comparables', 'comparables': count}
+
+        return {
+            'case': 'stats',
+            'comparables': count,
+            'mean_price': float(self._stats['mean'][i]),
+            'median_price': float(self._stats['median'][i]),
+            'std_price': float(self._stats['std'][i]),
+            'q1': float(self._stats['q1'][i]),
+            'q3': float(self._stats['q3'][i])
+        }
+
+    def derived_file(self, filename: str) -> Optional[str]:
+        """
+        Path of a file built into the snapshot (see build_snapshot)
+
+        Args:
+            filename: Name given in build_snapshot's derived
+
+        Returns:
+            str: Path, or None if the snapshot does not have it
+        """
+        if filename not in self._derived:
+            return None
+        return os.path.join(self.directory, filename)
+
+    def get_stats(self) -> Dict:
+        """Snapshot statistics for status endpoints"""
+        return {
+            'directory': self.directory,
+            'signature': self.signature,
+            'rows': self._rows,
+            'columns': len(self.columns),
+            'localities': len(self._groups),
+            'derived': sorted(self._derived)
+        }
+
+
+def open_reference_dataset(
+    source_path: str,
+    load_frame: Callable[[], object],
+    derived: Optional[Dict[str, Callable[[object], object]]] = None
+) -> ReferenceDataset:
+    """
+    Attach to the snapshot of source_path, building it first if needed
+
+    Args:
+        source_path: Dataset CSV the snapshot is derived from
+        load_frame: Loads the dataset as a DataFrame (only called to build)
+        derived: Files to build into a new snapshot (see build_snapshot)
+
+    Returns:
+        ReferenceDataset: Memory-mapped view of the dataset
+    """
+    signature = source_signature(source_path)
+    directory = os.path.join(REFERENCE_SNAPSHOT_DIR, f"dataset-{signature}")
+
+    if not os.path.isfile(os.path.join(directory, META_FILE)):
+        print(f"📦 Building shared reference snapshot: {directory}")
+        build_snapshot(load_frame(), directory, signature, derived)
+        _remove_stale_snapshots(directory)
+
+    dataset = ReferenceDataset(directory)
+    print(f"✅ Attached shared reference snapshot: {len(dataset)} properties ({directory})")
+    return dataset
@@ -0,0 +1,123 @@
+"""
+Spatial Index Utility
+Nearest-neighbour queries over latitude/longitude points using great-circle distance
+
+Uses a scikit-learn BallTree with the haversine metric when available,
+and falls back to a vectorized NumPy scan (or plain Python) otherwise.
+"""
+import math
+from typing import List, Sequence, Tuple
+
+from app.utils.lazy_imports import lazy_attribute
+from app.utils.ml_imports import HAS_NUMPY, HAS_SKLEARN, np
+
+# Conditional imports (imported on first use, see app.utils.lazy_imports)
+if HAS_SKLEARN:
+    BallTree = lazy_attribute("sklearn.neighbors", "BallTree")
+
+EARTH_RADIUS_KM = 6371.0
+
+
+class SpatialIndex:
+    """
+    Static nearest-neighbour index over (latitude, longitude) points
+
+    Points are stored in radians. Query results are (distance_km, position)
+    pairs, where position indexes into the sequences given at build time.
+    """
+
+    def __init__(self, latitudes: Sequence[float], longitudes: Sequence[float]):
+        self.size = len(latitudes)
+        self._tree = None
+
+        if HAS_NUMPY:
+            self._points = np.radians(np.column_stack([
+                np.asarray(latitudes, dtype=float),
+                np.asarray(longitudes, dtype=float)
+            ])) if self.size else np.empty((0, 2))
+            if HAS_SKLEARN and self.size:
+                self._tree = BallTree(self._points, metric='haversine')
+        else:
+            self._points = [
+                (math.radians(lat), math.radians(lon))
+                for lat, lon in zip(latitudes, longitudes)
+            ]
+
+    @property
+    def backend(self) -> str:
+        """Name of the query backend in use"""
+        if self._tree is not None:
+            return "balltree"
+        return "numpy" if HAS_NUMPY else "python"
+
+    def _scan_distances(self, lat_rad: float, lon_rad: float):
+        """Haversine distance (km) from one point to every indexed point"""
+        if HAS_NUMPY:
+            dlat = self._points[:, 0] - lat_rad
+            dlon = self._points[:, 1] - lon_rad
+            a = np.sin(dlat / 2) ** 2 + math.cos(lat_rad) * np.cos(self._points[:, 0]) * np.sin(dlon / 2) ** 2
+            return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+        distances = []
+        for p_lat, p_lon in self._points:
+            a = (
+                math.sin((p_lat - lat_rad) / 2) ** 2 +
+                math.cos(lat_rad) * math.cos(p_lat) * math.sin((p_lon - lon_rad) / 2) ** 2
+            )
+            distances.append(2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0))))
+        return distances
+
+    def query(self, latitude: float, longitude: float, k: int = 1) -> List[Tuple[float, int]]:
+        """
+        Find the k nearest indexed points
+
+        Args:
+            latitude: Query latitude (degrees)
+            longitude: Query longitude (degrees)
+            k: Number of neighbours
+
+        Returns:
+            list: (distance_km, position) pairs sorted by distance
+        """
+        k = min(k, self.size)
+        if k <= 0:
+            return []
+
+        lat_rad, lon_rad = math.radians(latitude), math.radians(longitude)
+
+        if self._tree is not None:
+            dist, idx = self._tree.query([[lat_rad, lon_rad]], k=k)
+            return [(float(d) * EARTH_RADIUS_KM, int(i)) for d, i in zip(dist[0], idx[0])]
+
+        distances = self._scan_distances(lat_rad, lon_rad)
+        if HAS_NUMPY:
+            nearest = np.argsort(distances)[:k]
+            return [(float(distances[i]), int(i)) for i in nearest]
+        return sorted((d, i) for i, d in enumerate(distances))[:k]
+
+    def query_radius(self, latitude: float, longitude: float, radius_km: float) -> List[Tuple[float, int]]:
+        """
+        Find every indexed point within a radius
+
+        Args:
+            latitude: Query latitude (degrees)
+            longitude: Query longitude (degrees)
+            radius_km: Search radius in kilometers
+
+        Returns:
+            list: (distance_km, position) pairs sorted by distance
+        """
+        if self.size == 0:
+            return []
+
+        lat_rad, lon_rad = math.radians(latitude), math.radians(longitude)
+
+        if self._tree is not None:
+            idx, dist = self._tree.query_radius(
+                [[lat_rad, lon_rad]], r=radius_km / EARTH_RADIUS_KM,
+                return_distance=True, sort_results=True
+            )
+            return [(float(d) * EARTH_RADIUS_KM, int(i)) for d, i in zip(dist[0], idx[0])]
+
+        distances = self._scan_distances(lat_rad, lon_rad)
+        return sorted((float(d), i) for i, d in enumerate(distances) if d <= radius_km)
@@ -0,0 +1,231 @@
+"""
+Tiered Cache Utility
+In-process LRU front tier backed by an optional SQLite tier that survives restarts
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.utils.metrics import CACHE_LOOKUP_SECONDS, STORE_WRITE_SECONDS
+
+# Shared on-disk cache file (all namespaces live in one table)
+DEFAULT_CACHE_DB = os.getenv("CACHE_DB_PATH", "app/data/cache.db")
+
+
+class TieredCache:
+    """
+    Two-tier key/value cache with per-entry TTLs
+
+    - Front tier: bounded LRU dict held in process memory
+    - Back tier: SQLite table shared by every worker on the host
+
+    Values must be JSON-serializable. Expired entries are dropped lazily on read.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        max_entries: int = 1000,
+        ttl_seconds: float = 3600,
+        db_path: Optional[str] = DEFAULT_CACHE_DB
+    ):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+
+        # {key: (expires_at, value)}
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        self.hits = 0
+        self.sqlite_hits = 0
+        self.misses = 0
+
+        if db_path:
+            self._open_db()
+
+    def _open_db(self):
+        """Open (or create) the SQLite back tier; disable it on failure"""
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "namespace TEXT NOT NULL, "
+                "key TEXT NOT NULL, "
+                "value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            self._db.commit()
+        except Exception as e:
+            print(f"Cache '{self.namespace}': SQLite tier unavailable ({e}), using memory only")
+            self._db = None
+
+    def _remember(self, key: str, expires_at: float, value: Any):
+        """Insert into the LRU tier, evicting the least recently used entry"""
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a key in the memory tier, then the SQLite tier
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on miss/expiry
+        """
+        start = time.perf_counter()
+        value, result = self._lookup(key)
+        CACHE_LOOKUP_SECONDS.observe(time.perf_counter() - start, cache=self.namespace, result=result)
+        return value
+
+    def _lookup(self, key: str) -> Tuple[Optional[Any], str]:
+        """get() implementation, also returning 'memory_hit', 'sqlite_hit' or 'miss'"""
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value, "memory_hit"
+                del self._memory[key]
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                        (self.namespace, key)
+                    ).fetchone()
+                except Exception as e:
+                    print(f"Cache '{self.namespace}' read error: {e}")
+                    row = None
+
+                if row is not None:
+                    raw_value, expires_at = row
+                    if expires_at > now:
+                        value = json.loads(raw_value)
+                        self._remember(key, expires_at, value)
+                        self.sqlite_hits += 1
+                        return value, "sqlite_hit"
+                    self._delete_row(key)
+
+            self.misses += 1
+            return None, "miss"
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        """
+        Store a value in both tiers
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            ttl_seconds: Override the default TTL for this entry
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = time.time() + ttl
+
+        with self._lock:
+            self._remember(key, expires_at, value)
+
+            if self._db is not None:
+                try:
+                    with STORE_WRITE_SECONDS.time(store=f"cache:{self.namespace}"):
+                        self._db.execute(
+                            "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at) "
+                            "VALUES (?, ?, ?, ?)",
+                            (self.namespace, key, json.dumps(value), expires_at)
+                        )
+                        self._db.commit()
+                except Exception as e:
+                    print(f"Cache '{self.namespace}' write error: {e}")
+
+    def _delete_row(self, key: str):
+        """Delete a single SQLite row (caller holds the lock)"""
+        try:
+            self._db.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            )
+            self._db.commit()
+        except Exception as e:
+            print(f"Cache '{self.namespace}' delete error: {e}")
+
+    def delete(self, key: str):
+        """Remove a key from both tiers"""
+        with self._lock:
+            self._memory.pop(key, None)
+            if self._db is not None:
+                self._delete_row(key)
+
+    def clear(self):
+        """Remove every entry in this namespace from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "DELETE FROM cache_entries WHERE namespace = ?",
+                        (self.namespace,)
+                    )
+                    self._db.commit()
+                except Exception as e:
+                    print(f"Cache '{self.namespace}' clear error: {e}")
+
+    def purge_expired(self) -> int:
+        """
+        Drop expired entries from both tiers
+
+        Returns:
+            int: Number of SQLite rows removed
+        """
+        now = time.time()
+        removed = 0
+
+        with self._lock:
+            for key in [k for k, (exp, _) in self._memory.items() if exp <= now]:
+                del self._memory[key]
+
+            if self._db is not None:
+                try:
+                    cursor = self._db.execute(
+                        "DELETE FROM cache_entries WHERE namespace = ? AND expires_at <= ?",
+                        (self.namespace, now)
+                    )
+                    self._db.commit()
+                    removed = cursor.rowcount
+                except Exception as e:
+                    print(f"Cache '{self.namespace}' purge error: {e}")
+
+        return removed
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics"""
+        lookups = self.hits + self.sqlite_hits + self.misses
+        return {
+            'namespace': self.namespace,
+            'memory_entries': len(self._memory),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'sqlite_enabled': self._db is not None,
+            'memory_hits': self.hits,
+            'sqlite_hits': self.sqlite_hits,
+            'misses': self.misses,
+            'hit_rate': round((self.hits + self.sqlite_hits) / lookups, 4) if lookups else 0.0
+        }